@@ -6,5 +6,8 @@ app_name = "accounts_admin"
 
 urlpatterns = [
     path("stats/", admin_views.admin_stats),
+    path("analytics/", admin_views.admin_analytics),
     path("users/", admin_views.admin_users),
+    path("users/count/", admin_views.admin_users_count),
+    path("patients/import/", admin_views.admin_import_patients),
 ]
@@ -1,40 +1,75 @@
 """
-Admin-only API: stats dashboard.
+Admin-only API: stats dashboard, analytics, the user list and bulk patient import.
 """
-from django.db.models import Count
-from django.db.models.functions import TruncDate
+import io
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import Lower, TruncDate, TruncWeek
+from django.db.models.lookups import StartsWith
+from django.utils import timezone
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from . import stats_version
 from .models import User
-from apps.predictions.models import Prediction
+from apps.patients.importer import import_csv
+from apps.predictions.models import Prediction, PredictionDailyRollup
+from config.conditional import conditional, set_validators
+from config.routers import replica_reads
+
+MAX_USER_PAGE = 200
+
+
+def _stats_validators(request, version=None):
+    """(ETag, Last-Modified) of the stats: the stats version and today's date (the daily window moves)."""
+    if getattr(request.user, "role", None) != "admin":
+        return None
+    version = version or stats_version.current()
+    return f'W/"stats-{version}-{datetime.now().date().isoformat()}"', stats_version.changed_at(version)
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@replica_reads
+@conditional(_stats_validators)
 def admin_stats(request):
     """
     GET /api/admin/stats/
     Returns aggregate stats for the admin dashboard.
     Only users with role='admin' may access; others get 403.
+    Carries ETag / Last-Modified from stats_version; a matching conditional GET gets 304.
     """
     if getattr(request.user, "role", None) != "admin":
         return Response(
             {"detail": "Admin access required."},
             status=status.HTTP_403_FORBIDDEN,
         )
+    # Read before the queries: a change committed meanwhile gets a newer version
+    version = stats_version.current()
 
-    total_patients = User.objects.filter(role="patient").count()
-    total_providers = User.objects.filter(role="provider").count()
-    total_predictions = Prediction.objects.count()
+    user_counts = User.objects.aggregate(
+        patients=Count("id", filter=Q(role="patient")),
+        providers=Count("id", filter=Q(role="provider")),
+    )
+    total_patients = user_counts["patients"]
+    total_providers = user_counts["providers"]
 
     predictions_by_disease = dict(
         Prediction.objects.values("disease_type")
         .annotate(count=Count("id"))
         .values_list("disease_type", "count")
     )
+    # Every prediction falls in exactly one disease group
+    total_predictions = sum(predictions_by_disease.values())
     # Ensure all four keys exist
     for key in ("heart", "diabetes", "stroke", "hypertension"):
         predictions_by_disease.setdefault(key, 0)
@@ -55,31 +90,33 @@ def admin_stats(request):
 
     recent_registrations = [
         {
-            "username": u.username,
-            "role": u.role,
-            "date_joined": u.date_joined.isoformat() if u.date_joined else None,
+            "username": username,
+            "role": role,
+            "date_joined": date_joined.isoformat() if date_joined else None,
         }
-        for u in User.objects.order_by("-date_joined")[:10]
+        for username, role, date_joined in User.objects.order_by("-date_joined").values_list(
+            "username", "role", "date_joined"
+        )[:10]
     ]
 
+    # Last 14 days: build a map date -> count
+    end = datetime.now().date()
+    start = end - timedelta(days=13)
+    # A plain created_at range (not __date) can use the index and prune partitions
     daily = (
-        Prediction.objects.annotate(date=TruncDate("created_at"))
+        Prediction.objects.filter(created_at__gte=timezone.make_aware(datetime.combine(start, time.min)))
+        .annotate(date=TruncDate("created_at"))
         .values("date")
         .annotate(count=Count("id"))
         .order_by("date")
     )
-    # Last 14 days: build a map date -> count
-    from datetime import datetime, timedelta
-
-    end = datetime.now().date()
-    start = end - timedelta(days=13)
     daily_map = {d["date"]: d["count"] for d in daily if start <= d["date"] <= end}
     daily_predictions = [
         {"date": (start + timedelta(days=i)).isoformat(), "count": daily_map.get(start + timedelta(days=i), 0)}
         for i in range(14)
     ]
 
-    return Response(
+    response = Response(
         {
             "total_patients": total_patients,
             "total_providers": total_providers,
@@ -90,31 +127,230 @@ def admin_stats(request):
             "daily_predictions": daily_predictions,
         }
     )
+    return set_validators(response, *_stats_validators(request, version))
+
+
+def _rollup_summary(row):
+    n = row["n"] or 0
+    return {
+        "count": n,
+        "positive": row["positive"] or 0,
+        "avg_probability": round(row["probability"] / n, 4) if n else None,
+    }
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-def admin_users(request):
+@replica_reads
+def admin_analytics(request):
     """
-    GET /api/admin/users/
-    Returns all registered users (patients, providers, admins) for admin dashboard.
-    Only role='admin' may access; 403 otherwise.
+    GET /api/admin/analytics/?days=30&granularity=day|week&disease=<type>&provider_id=<user id>
+    Prediction analytics read only from PredictionDailyRollup, so cost grows with
+    the number of days, not predictions: totals, a gap-free day/week series and
+    breakdowns by disease, risk level and provider. Admin only.
     """
     if getattr(request.user, "role", None) != "admin":
         return Response(
             {"detail": "Admin access required."},
             status=status.HTTP_403_FORBIDDEN,
         )
-    users = User.objects.all().order_by("-date_joined")
-    data = [
+    params = request.query_params
+    try:
+        days = int(params.get("days", 30))
+        provider_id = int(params["provider_id"]) if params.get("provider_id") else None
+    except ValueError:
+        return Response({"detail": "days and provider_id must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+    granularity = params.get("granularity", "day")
+    if not 1 <= days <= 366 or granularity not in ("day", "week"):
+        return Response(
+            {"detail": "days must be 1-366 and granularity 'day' or 'week'."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    end = timezone.localdate()
+    start = end - timedelta(days=days - 1)
+    rollups = PredictionDailyRollup.objects.filter(date__gte=start, date__lte=end)
+    if params.get("disease"):
+        rollups = rollups.filter(disease_type=params["disease"])
+    if provider_id is not None:
+        rollups = rollups.filter(provider_id=provider_id)
+    sums = {"n": Sum("count"), "positive": Sum("positive_count"), "probability": Sum("sum_probability")}
+
+    period = TruncWeek("date") if granularity == "week" else F("date")
+    by_period = {
+        r["period"]: r
+        for r in rollups.annotate(period=period).values("period").annotate(**sums).order_by("period")
+    }
+    step = timedelta(days=7 if granularity == "week" else 1)
+    cursor = start - timedelta(days=start.weekday()) if granularity == "week" else start
+    series = []
+    while cursor <= end:
+        row = by_period.get(cursor, {"n": 0, "positive": 0, "probability": 0.0})
+        series.append({"period": cursor.isoformat(), **_rollup_summary(row)})
+        cursor += step
+
+    by_provider_rows = list(
+        rollups.exclude(provider_id=0).values("provider_id").annotate(**sums).order_by("-n")[:50]
+    )
+    usernames = dict(
+        User.objects.filter(pk__in=[r["provider_id"] for r in by_provider_rows]).values_list("id", "username")
+    )
+
+    return Response(
         {
-            "id": u.id,
-            "username": u.username,
-            "email": u.email or "",
-            "full_name": u.full_name or "",
-            "role": u.role,
-            "date_joined": u.date_joined.isoformat() if u.date_joined else None,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "granularity": granularity,
+            "totals": _rollup_summary(rollups.aggregate(**sums)),
+            "series": series,
+            "by_disease": {
+                r["disease_type"]: _rollup_summary(r)
+                for r in rollups.values("disease_type").annotate(**sums).order_by("disease_type")
+            },
+            "by_risk_level": {
+                r["risk_level"]: _rollup_summary(r)
+                for r in rollups.values("risk_level").annotate(**sums).order_by("risk_level")
+            },
+            "by_provider": [
+                {"provider_id": r["provider_id"], "username": usernames.get(r["provider_id"]), **_rollup_summary(r)}
+                for r in by_provider_rows
+            ],
         }
-        for u in users
-    ]
-    return Response(data)
+    )
+
+
+def _user_list_filter(params):
+    """Role / search filters shared by admin_users and admin_users_count."""
+    users = User.objects.all()
+    role = params.get("role")
+    if role:
+        users = users.filter(role=role)
+    q = params.get("q", "").strip().lower()
+    if q:
+        # Case-insensitive prefix match, served by the LOWER(...) pattern indexes on Postgres
+        users = users.filter(
+            StartsWith(Lower("username"), q) | StartsWith(Lower("email"), q) | StartsWith(Lower("full_name"), q)
+        )
+    return users
+
+
+def _encode_cursor(date_joined, pk):
+    return urlsafe_b64encode(f"{date_joined.isoformat()}|{pk}".encode()).decode()
+
+
+def _decode_cursor(cursor):
+    try:
+        joined, pk = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(joined), int(pk)
+    except (ValueError, UnicodeError):
+        return None
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def admin_users(request):
+    """
+    GET /api/admin/users/?role=<role>&q=<prefix>&limit=50&cursor=<next_cursor>
+    One page of registered users, newest first: {"results": [...], "next_cursor"}.
+    Keyset pagination on (date_joined, id), so deep pages cost the same as the
+    first; q matches the start of username, email or full name. Admin only.
+    """
+    if getattr(request.user, "role", None) != "admin":
+        return Response(
+            {"detail": "Admin access required."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    params = request.query_params
+    try:
+        limit = int(params.get("limit", 50))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= MAX_USER_PAGE:
+        return Response(
+            {"detail": f"limit must be an integer from 1 to {MAX_USER_PAGE}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    users = _user_list_filter(params)
+    if params.get("cursor"):
+        position = _decode_cursor(params["cursor"])
+        if position is None:
+            return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        joined, pk = position
+        users = users.filter(Q(date_joined__lt=joined) | Q(date_joined=joined, id__lt=pk))
+    rows = list(
+        users.order_by("-date_joined", "-id").values(
+            "id", "username", "email", "full_name", "role", "date_joined"
+        )[: limit + 1]
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_cursor(rows[-1]["date_joined"], rows[-1]["id"])
+    for row in rows:
+        row["date_joined"] = row["date_joined"].isoformat() if row["date_joined"] else None
+    return Response({"results": rows, "next_cursor": next_cursor})
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@replica_reads
+def admin_users_count(request):
+    """
+    GET /api/admin/users/count/?role=<role>&q=<prefix>
+    {"count": n, "estimated": bool}. On Postgres, result sets the planner puts
+    above ADMIN_EXACT_COUNT_LIMIT rows report its estimate instead of running
+    COUNT(*); either way the answer is cached for ADMIN_COUNT_CACHE_SECONDS.
+    """
+    if getattr(request.user, "role", None) != "admin":
+        return Response(
+            {"detail": "Admin access required."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    role = request.query_params.get("role", "")
+    q = request.query_params.get("q", "").strip().lower()
+    key = "admin-user-count:" + urlsafe_b64encode(f"{role}|{q}".encode()).decode()
+    result = cache.get(key)
+    if result is None:
+        users = _user_list_filter(request.query_params)
+        estimate = None
+        if connections[users.db].vendor == "postgresql":
+            plan = json.loads(users.explain(format="json"))
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate is not None and estimate > settings.ADMIN_EXACT_COUNT_LIMIT:
+            result = {"count": estimate, "estimated": True}
+        else:
+            result = {"count": users.count(), "estimated": False}
+        cache.set(key, result, timeout=settings.ADMIN_COUNT_CACHE_SECONDS)
+    return Response(result)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@parser_classes([MultiPartParser])
+def admin_import_patients(request):
+    """
+    POST /api/admin/patients/import/ (multipart: file=<csv>, invite=true|false)
+    Bulk-create patients from an uploaded CSV (apps/patients/importer.py) and
+    return the import summary: counts, throughput, rejected rows and, for
+    invites, the uid/token pairs to send out. Passwords are hashed inline: a
+    process pool per request would spawn an interpreter per CPU inside the web
+    worker. Large password files go through `manage.py import_patients`, or
+    use invite=true, which hashes nothing. Admin only.
+    """
+    if getattr(request.user, "role", None) != "admin":
+        return Response(
+            {"detail": "Admin access required."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    upload = request.FILES.get("file")
+    if upload is None:
+        return Response({"detail": "Upload the CSV as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+    invite = str(request.data.get("invite", "")).lower() in ("1", "true", "yes")
+    try:
+        result = import_csv(
+            io.TextIOWrapper(upload.file, encoding="utf-8-sig", newline=""), invite=invite, workers=1
+        )
+    except ValueError as e:  # also UnicodeDecodeError
+        return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(result.as_dict(), status=status.HTTP_201_CREATED if result.created else status.HTTP_200_OK)
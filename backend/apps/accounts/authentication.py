@@ -0,0 +1,113 @@
+"""
+Stateless JWT authentication: build request.user from access-token claims
+instead of loading the User row on every request.
+
+login() issues tokens through issue_tokens(), which adds role, username and
+patient_id claims. ClaimsJWTAuthentication checks revocation in O(1) and, with
+JWT_STATELESS=True, returns a ClaimsUser built from those claims:
+- revoke_token(token): deny one access token by jti until it expires (logout),
+- revoke_user(user_id): deny every token issued to the user up to now (role,
+  is_active or password change, patient profile deleted; see signals.py).
+Revocations live in the cache named by settings.JWT_REVOCATION_CACHE. The
+default local-memory cache is per process, so run more than one worker with a
+shared cache (REDIS_URL); the accounts.E002 system check refuses
+JWT_STATELESS=True with a local-memory revocation cache. With JWT_STATELESS off, or for tokens without the
+role claim, the User is loaded from the DB as simplejwt does.
+"""
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+ROLE_CLAIM = "role"
+USERNAME_CLAIM = "username"
+PATIENT_CLAIM = "patient_id"
+
+_JTI_KEY = "jwt:revoked:jti:{}"
+_USER_KEY = "jwt:revoked:user:{}"
+
+
+def _cache():
+    return caches[getattr(settings, "JWT_REVOCATION_CACHE", "default")]
+
+
+def issue_tokens(user):
+    """
+    Refresh token for `user` carrying the claims ClaimsJWTAuthentication needs;
+    its .access_token copies them. patient_id comes from user.patient_profile,
+    so select_related("patient_profile") avoids a query (CredentialBackend does).
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh[ROLE_CLAIM] = user.role
+    refresh[USERNAME_CLAIM] = user.get_username()
+    patient = getattr(user, "patient_profile", None)
+    refresh[PATIENT_CLAIM] = patient.pk if patient is not None else None
+    return refresh
+
+
+def revoke_token(token):
+    """Deny one validated token (by jti) for the rest of its lifetime."""
+    jti = token.get(api_settings.JTI_CLAIM)
+    if not jti:
+        return
+    ttl = int(token.get("exp", 0) - time.time()) + 1
+    if ttl > 0:
+        _cache().set(_JTI_KEY.format(jti), 1, timeout=ttl)
+
+
+def revoke_user(user_id):
+    """Deny every token issued to `user_id` up to now (new logins are unaffected)."""
+    lifetime = api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    _cache().set(_USER_KEY.format(user_id), time.time(), timeout=int(lifetime) + 1)
+
+
+def is_revoked(token):
+    """True if the token's jti was revoked or it was issued before a revoke_user()."""
+    user_id = token.get(api_settings.USER_ID_CLAIM)
+    jti_key = _JTI_KEY.format(token.get(api_settings.JTI_CLAIM))
+    user_key = _USER_KEY.format(user_id)
+    found = _cache().get_many([jti_key, user_key])
+    if jti_key in found:
+        return True
+    revoked_at = found.get(user_key)
+    # iat has one-second resolution: a token issued in the revoking second is denied too
+    return revoked_at is not None and token.get("iat", 0) <= int(revoked_at)
+
+
+class ClaimsUser(TokenUser):
+    """
+    request.user for stateless requests. id, username, role and patient_id come
+    from the token; other attributes read token claims (None when absent). Use
+    model_user() where the full User row is needed.
+    """
+
+    @property
+    def is_active(self):
+        # Deactivation revokes the user's tokens, so a valid token implies active
+        return True
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication honouring revocations; trusts token claims when JWT_STATELESS is on."""
+
+    def get_user(self, validated_token):
+        if is_revoked(validated_token):
+            raise AuthenticationFailed("Token has been revoked.", code="token_revoked")
+        if not getattr(settings, "JWT_STATELESS", False) or ROLE_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+        return ClaimsUser(validated_token)
+
+
+def model_user(user):
+    """The User model instance for request.user (one query if it is a ClaimsUser)."""
+    if isinstance(user, TokenUser):
+        return get_user_model()._default_manager.get(pk=user.id)
+    return user
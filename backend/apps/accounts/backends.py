@@ -0,0 +1,65 @@
+"""
+Authentication backend resolving username, email or provider medical license
+in one indexed query (see the Lower() indexes on accounts_user).
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+UserModel = get_user_model()
+
+
+class CredentialBackend(ModelBackend):
+    """
+    Log in with any of: email (case-insensitive), provider medical license
+    (case-insensitive) or exact username. When several users match, the
+    precedence is email, then license, then username.
+    """
+
+    def resolve_user(self, identifier):
+        """Return the user the identifier refers to, or None. Exactly one query."""
+        lowered = identifier.lower()
+        candidates = (
+            UserModel._default_manager.alias(
+                email_lower=Lower("email"),
+                license_lower=Lower("medical_license"),
+            )
+            .filter(
+                Q(email_lower=lowered)
+                | Q(license_lower=lowered, role=UserModel.Role.PROVIDER)
+                | Q(username=identifier)
+            )
+            # patient_profile feeds the patient_id claim in issue_tokens()
+            .select_related("patient_profile")
+            .order_by("pk")
+        )
+        by_email = by_license = by_username = None
+        for user in candidates:
+            if by_email is None and user.email and user.email.lower() == lowered:
+                by_email = user
+            if (
+                by_license is None
+                and user.role == UserModel.Role.PROVIDER
+                and user.medical_license
+                and user.medical_license.lower() == lowered
+            ):
+                by_license = user
+            if user.username == identifier:
+                by_username = user
+        return by_email or by_license or by_username
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD) or kwargs.get("email")
+        if not username or password is None:
+            return None
+        user = self.resolve_user(username)
+        if user is None:
+            # Run the default password hasher once to reduce the timing
+            # difference between an existing and a nonexistent user.
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
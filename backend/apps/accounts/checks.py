@@ -0,0 +1,62 @@
+"""
+System checks for the accounts app.
+
+Stateless JWT authentication trusts token claims until a revocation says
+otherwise, so revocations have to reach every worker: a local-memory
+JWT_REVOCATION_CACHE keeps a deactivated user (or one whose password changed)
+authenticated on all workers but the one that handled the change. The same
+goes for the read-your-writes pin of config/routers.py: kept in a local-memory
+default cache it only keeps the writing worker off the replicas.
+"""
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils.module_loading import import_string
+
+
+def _is_locmem(config):
+    return issubclass(import_string(config["BACKEND"]), LocMemCache)
+
+
+@register(Tags.security, Tags.caches)
+def check_revocation_cache(app_configs, **kwargs):
+    if not getattr(settings, "JWT_STATELESS", False):
+        return []
+    alias = getattr(settings, "JWT_REVOCATION_CACHE", "default")
+    config = settings.CACHES.get(alias)
+    if config is None:
+        return [
+            Error(
+                f"JWT_REVOCATION_CACHE names the cache {alias!r}, which is not in CACHES.",
+                id="accounts.E001",
+            )
+        ]
+    if _is_locmem(config):
+        return [
+            Error(
+                f"JWT_STATELESS is on but the revocation cache {alias!r} is a local-memory cache.",
+                hint=(
+                    "Revocations would only reach the worker that made them. Point JWT_REVOCATION_CACHE "
+                    "at a shared cache (set REDIS_URL) or set JWT_STATELESS=False."
+                ),
+                id="accounts.E002",
+            )
+        ]
+    return []
+
+
+@register(Tags.database, Tags.caches)
+def check_replica_pin_cache(app_configs, **kwargs):
+    if not getattr(settings, "DATABASE_REPLICAS", []) or not _is_locmem(settings.CACHES["default"]):
+        return []
+    return [
+        Warning(
+            "DATABASE_REPLICAS is set but the default cache, which holds the read-your-writes pin, "
+            "is a local-memory cache.",
+            hint=(
+                "Only the worker that handled a write would keep that user off the replicas; the others "
+                "may serve reads older than the user's own write. Set REDIS_URL to share the cache."
+            ),
+            id="accounts.W001",
+        )
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:35
+
+from django.db import migrations, models
+
+# Case-insensitive prefix search of the admin user list (LOWER(col) LIKE 'abc%').
+# Postgres only uses a btree for LIKE with the pattern operator class, which the
+# model's Meta.indexes cannot express portably; other databases skip these.
+PREFIX_INDEXES = {
+    "acc_user_username_prefix_idx": "username",
+    "acc_user_email_prefix_idx": "email",
+    "acc_user_full_name_prefix_idx": "full_name",
+}
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    qn = schema_editor.quote_name
+    for name, column in PREFIX_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {qn(name)} ON accounts_user (LOWER({qn(column)}) text_pattern_ops)"
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in PREFIX_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_user_login_lookup_indexes'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['-date_joined', '-id'], name='acc_user_joined_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['role', '-date_joined', '-id'], name='acc_user_role_joined_idx'),
+        ),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -3,6 +3,8 @@ Custom User model for MbereMed: patient and provider roles.
 """
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Lower
 
 
 class User(AbstractUser):
@@ -41,6 +43,18 @@ class User(AbstractUser):
         db_table = "accounts_user"
         verbose_name = "User"
         verbose_name_plural = "Users"
+        # Login lookups (apps.accounts.backends.CredentialBackend) are case-insensitive
+        indexes = [
+            models.Index(Lower("email"), name="acc_user_email_lower_idx"),
+            models.Index(
+                Lower("medical_license"),
+                name="acc_user_license_lower_idx",
+                condition=Q(role="provider"),
+            ),
+            # Keyset pages of the admin user list, optionally per role (admin_views.admin_users)
+            models.Index(fields=["-date_joined", "-id"], name="acc_user_joined_idx"),
+            models.Index(fields=["role", "-date_joined", "-id"], name="acc_user_role_joined_idx"),
+        ]
 
     def __str__(self):
         return self.username or self.email or str(self.pk)
@@ -0,0 +1,57 @@
+"""
+Revoke a user's issued JWTs when the claims they carry (role, patient_id) or
+their validity (is_active, password) change, or the user is deleted. Also
+moves the admin stats version (stats_version.py) when users come, go or
+change role.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from . import stats_version
+from .authentication import revoke_user
+from .models import User
+
+_TOKEN_FIELDS = ("role", "is_active", "password")
+# User fields the admin stats show (counts per role, recent registrations)
+_STATS_FIELDS = {"role", "username", "date_joined"}
+
+
+@receiver(pre_save, sender=User)
+def _note_token_field_changes(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and not set(update_fields) & set(_TOKEN_FIELDS):
+        return
+    old = sender._default_manager.filter(pk=instance.pk).values_list(*_TOKEN_FIELDS).first()
+    instance._revoke_tokens = old is not None and old != tuple(getattr(instance, f) for f in _TOKEN_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def _revoke_on_change(sender, instance, created=False, **kwargs):
+    if not created and getattr(instance, "_revoke_tokens", False):
+        instance._revoke_tokens = False
+        transaction.on_commit(lambda: revoke_user(instance.pk))
+
+
+@receiver(post_delete, sender=User)
+def _revoke_on_user_delete(sender, instance, **kwargs):
+    revoke_user(instance.pk)
+
+
+@receiver(post_delete, sender="patients.Patient")
+def _revoke_on_patient_delete(sender, instance, **kwargs):
+    # The patient_id claim no longer resolves
+    revoke_user(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def _bump_stats_on_save(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    # Logins save last_login only
+    if not raw and (created or update_fields is None or _STATS_FIELDS & set(update_fields)):
+        stats_version.bump()
+
+
+@receiver(post_delete, sender=User)
+def _bump_stats_on_delete(sender, instance, **kwargs):
+    stats_version.bump()
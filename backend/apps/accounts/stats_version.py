@@ -0,0 +1,56 @@
+"""
+Version marker of the admin stats (GET /api/admin/stats/), for its ETag.
+
+A number in the default cache (microseconds since the epoch of the last
+change) that code changing users or predictions bumps once its transaction
+commits: the receivers in accounts/signals.py and predictions/signals.py,
+CSV ingestion and the bulk patient import. The key expires after
+ADMIN_STATS_VERSION_SECONDS so that, when workers do not share a cache
+(locmem), a worker that missed a bump serves a fresh body soon after.
+"""
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+_KEY = "admin-stats-version"
+# Attribute on the DB connection: a bump is waiting for this transaction to commit
+_PENDING = "_stats_version_pending"
+
+
+def _timeout():
+    return getattr(settings, "ADMIN_STATS_VERSION_SECONDS", 300)
+
+
+def current():
+    """The current version, starting a new one if the key is missing."""
+    version = cache.get(_KEY)
+    if version is None:
+        version = time.time_ns() // 1000
+        # add(): a concurrent bump wins over this fresh start
+        if not cache.add(_KEY, version, timeout=_timeout()):
+            version = cache.get(_KEY, version)
+    return version
+
+
+def changed_at(version):
+    """Aware datetime of a version (for Last-Modified)."""
+    return datetime.fromtimestamp(version / 1_000_000, tz=dt_timezone.utc)
+
+
+def _bump(connection):
+    # Run once per commit: the first callback clears the flag, the rest of the
+    # batch (a cascade delete queues one per row) find it cleared
+    if getattr(connection, _PENDING, False):
+        setattr(connection, _PENDING, False)
+        cache.set(_KEY, time.time_ns() // 1000, timeout=_timeout())
+
+
+def bump():
+    """Start a new version once the current transaction (if any) commits."""
+    connection = transaction.get_connection()
+    setattr(connection, _PENDING, True)
+    transaction.on_commit(partial(_bump, connection))
@@ -9,4 +9,5 @@ urlpatterns = [
     path("logout/", views.logout),
     path("me/", views.current_user),
     path("register/", views.register),
+    path("invite/accept/", views.accept_invite),
 ]
@@ -8,6 +8,7 @@ from rest_framework.response import Response
 import logging
 import traceback
 
+from .authentication import issue_tokens, model_user, revoke_token
 from .models import User
 from .serializers import UserSerializer, UserCreateSerializer
 
@@ -19,8 +20,6 @@ logger = logging.getLogger(__name__)
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def login(request):
-    from rest_framework_simplejwt.tokens import RefreshToken
-
     username = request.data.get("username") or request.data.get("email")
     password = request.data.get("password")
 
@@ -30,16 +29,7 @@ def login(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    # Allow login by email first
-    user = User.objects.filter(email=username).first()
-    if user:
-        username = user.username
-    else:
-        # Then allow login by medical license for providers
-        user = User.objects.filter(medical_license=username, role="provider").first()
-        if user:
-            username = user.username
-
+    # CredentialBackend resolves email, provider medical license or username in one query
     user = authenticate(request, username=username, password=password)
     if user is None:
         return Response(
@@ -47,7 +37,8 @@ def login(request):
             status=status.HTTP_401_UNAUTHORIZED,
         )
 
-    refresh = RefreshToken.for_user(user)
+    # Tokens carry role / patient_id claims for ClaimsJWTAuthentication
+    refresh = issue_tokens(user)
     return Response(
         {
             "access": str(refresh.access_token),
@@ -60,8 +51,12 @@ def login(request):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def logout(request):
-    """Session logout."""
+    """Session logout; also revokes the JWT the request was made with."""
     from django.contrib.auth import logout as auth_logout
+    from rest_framework_simplejwt.tokens import Token
+
+    if isinstance(request.auth, Token):
+        revoke_token(request.auth)
     auth_logout(request)
     return Response(status=status.HTTP_204_NO_CONTENT)
 
@@ -70,7 +65,7 @@ def logout(request):
 @permission_classes([IsAuthenticated])
 def current_user(request):
     """Return the currently authenticated user."""
-    serializer = UserSerializer(request.user)
+    serializer = UserSerializer(model_user(request.user))
     return Response(serializer.data)
 
 
@@ -108,3 +103,41 @@ def register(request):
             {"error": str(e), "detail": traceback.format_exc()},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
+
+
+@csrf_exempt
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def accept_invite(request):
+    """
+    Set the password of a user created by the bulk patient import with an
+    invite (apps/patients/importer.py). Body: uid, token, password. The token
+    stops working once the password is set.
+    """
+    from django.contrib.auth.tokens import default_token_generator
+    from django.utils.http import urlsafe_base64_decode
+
+    uid = request.data.get("uid") or ""
+    token = request.data.get("token") or ""
+    password = request.data.get("password") or ""
+    try:
+        user = User.objects.get(pk=int(urlsafe_base64_decode(uid)))
+    except (ValueError, User.DoesNotExist):
+        user = None
+    if user is None or not default_token_generator.check_token(user, token):
+        return Response({"detail": "Invalid or expired invite."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(password) < 8:
+        return Response(
+            {"password": ["Ensure this field has at least 8 characters."]},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    user.set_password(password)
+    user.save(update_fields=["password"])
+    refresh = issue_tokens(user)
+    return Response(
+        {
+            "access": str(refresh.access_token),
+            "refresh": str(refresh),
+            "user": UserSerializer(user).data,
+        }
+    )
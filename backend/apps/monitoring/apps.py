@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class MonitoringConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.monitoring"
+    verbose_name = "Monitoring"
+
+    def ready(self):
+        """Register system checks."""
+        from . import checks  # noqa: F401
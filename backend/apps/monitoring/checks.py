@@ -0,0 +1,23 @@
+"""
+System checks for the monitoring app.
+
+/metrics exposes per-endpoint latency, cache hit rates and worker details, so
+outside DEBUG it needs METRICS_AUTH_TOKEN; without one (and without an explicit
+METRICS_PUBLIC=True) the endpoint refuses every scrape.
+"""
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+
+@register(Tags.security)
+def check_metrics_auth(app_configs, **kwargs):
+    if getattr(settings, "METRICS_AUTH_TOKEN", "") or getattr(settings, "METRICS_PUBLIC", settings.DEBUG):
+        return []
+    return [
+        Warning(
+            "METRICS_AUTH_TOKEN is not set, so /metrics answers 401 to every request.",
+            hint="Set METRICS_AUTH_TOKEN and configure the scraper's bearer token, or METRICS_PUBLIC=True "
+            "when /metrics is only reachable from a private network.",
+            id="monitoring.W001",
+        )
+    ]
@@ -0,0 +1,318 @@
+"""
+In-process Prometheus-style metrics (counters, gauges, histograms) rendered in
+the Prometheus text exposition format by /metrics.
+
+Multiprocess (gunicorn): when settings.METRICS_MULTIPROC_DIR is set, every
+process periodically writes its own values to <dir>/metrics-<pid>.json
+(atomic rename) and /metrics merges all files. Counters and histograms are
+summed across processes, including exited ones, so totals never go backwards
+while the directory lives; clear it when the server starts (see start.sh).
+Gauges are per process and only reported for processes that are still alive.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+REGISTRY = {}
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        if name in REGISTRY:
+            raise ValueError(f"Metric {name} already registered")
+        REGISTRY[name] = self
+
+    def _key(self, labels):
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Per-process value; in multiprocess mode each process is reported with a pid label."""
+
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            state = self.values.get(key)
+            if state is None:
+                # [per-bucket counts..., +Inf count, sum]
+                state = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+
+# -----------------------------------------------------------------------------
+# Metric definitions
+# -----------------------------------------------------------------------------
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route, method and status.", ("route", "method", "status")
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route and method.", ("route", "method")
+)
+HTTP_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per HTTP request.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21, 34, 55, 100),
+)
+PREDICT_REQUESTS = Counter(
+    "predict_requests_total", "Predict API requests by disease and status.", ("disease", "status")
+)
+PREDICT_LATENCY = Histogram(
+    "predict_request_duration_seconds", "Predict API latency by disease and status.", ("disease", "status")
+)
+PREDICT_STAGE_LATENCY = Histogram(
+    "predict_stage_duration_seconds",
+    "Per-stage latency of the predict path (only when PREDICT_TIMING is on).",
+    ("stage",),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+MODEL_LOADS = Counter("model_loads_total", "Model files unpickled from disk.", ("disease",))
+MODEL_LOAD_LATENCY = Histogram(
+    "model_load_duration_seconds", "Time to load a model file from disk.", ("disease",)
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "In-process cache lookups by cache and result (hit/miss).", ("cache", "result")
+)
+COMPRESSION_BYTES = Counter(
+    "http_response_compression_bytes_total",
+    "Response body bytes before (direction=in) and after (direction=out) compression.",
+    ("encoding", "direction"),
+)
+COMPRESSION_RATIO = Histogram(
+    "http_response_compression_ratio",
+    "Compressed / original body size per compressed response.",
+    ("encoding",),
+    buckets=(0.05, 0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.7, 0.9, 1.0),
+)
+COMPRESSION_CPU = Histogram(
+    "http_response_compression_cpu_seconds",
+    "CPU time spent compressing one response body.",
+    ("encoding",),
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+COMPRESSION_SKIPPED = Counter(
+    "http_response_compression_skipped_total",
+    "Compressible responses sent uncompressed, by reason (small, not_accepted, no_gain).",
+    ("reason",),
+)
+PROCESS_RSS = Gauge("process_resident_memory_bytes", "Resident set size of the worker process.")
+
+
+def record_cache(cache, hit):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        import resource
+
+        # ru_maxrss is the peak RSS (KiB on Linux); best available fallback.
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _collect_process_gauges():
+    PROCESS_RSS.set(_rss_bytes())
+
+
+# -----------------------------------------------------------------------------
+# Multiprocess file aggregation
+# -----------------------------------------------------------------------------
+_last_flush = 0.0
+_flush_lock = threading.Lock()
+
+
+def _multiproc_dir():
+    path = getattr(settings, "METRICS_MULTIPROC_DIR", None)
+    return Path(path) if path else None
+
+
+def _dump_state():
+    with _lock:
+        return {
+            name: [[list(key), value] for key, value in metric.values.items()]
+            for name, metric in REGISTRY.items()
+        }
+
+
+def flush(force=False):
+    """Write this process's metrics to the multiprocess directory (throttled)."""
+    global _last_flush
+    directory = _multiproc_dir()
+    if directory is None:
+        return
+    now = time.monotonic()
+    if not force and now - _last_flush < getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0):
+        return
+    # Another thread of this process is already writing the same file.
+    if not _flush_lock.acquire(blocking=force):
+        return
+    try:
+        _last_flush = now
+        _collect_process_gauges()
+        directory.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        path = directory / f"metrics-{pid}.json"
+        tmp = directory / f".metrics-{pid}.json.tmp"
+        tmp.write_text(json.dumps({"pid": pid, "metrics": _dump_state()}))
+        os.replace(tmp, path)
+    finally:
+        _flush_lock.release()
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merged_state():
+    """Metric name -> { label_key: value } merged over every process file."""
+    directory = _multiproc_dir()
+    if directory is None:
+        _collect_process_gauges()
+        with _lock:
+            return {
+                name: {key: (list(v) if isinstance(v, list) else v) for key, v in m.values.items()}
+                for name, m in REGISTRY.items()
+            }
+
+    flush(force=True)
+    merged = {name: {} for name in REGISTRY}
+    for path in directory.glob("metrics-*.json"):
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        pid = payload.get("pid")
+        alive = _pid_alive(pid)
+        for name, entries in payload.get("metrics", {}).items():
+            metric = REGISTRY.get(name)
+            if metric is None:
+                continue
+            target = merged[name]
+            for key, value in entries:
+                key = tuple(key)
+                if metric.kind == "gauge":
+                    if alive:
+                        target[key + (str(pid),)] = value
+                elif metric.kind == "counter":
+                    target[key] = target.get(key, 0) + value
+                else:
+                    current = target.get(key)
+                    target[key] = value if current is None else [a + b for a, b in zip(current, value)]
+    return merged
+
+
+# -----------------------------------------------------------------------------
+# Text exposition
+# -----------------------------------------------------------------------------
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _fmt(value):
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(value)
+
+
+def render():
+    """All registered metrics in Prometheus text format (version 0.0.4)."""
+    state = _merged_state()
+    multiproc = _multiproc_dir() is not None
+    lines = []
+    for name, metric in REGISTRY.items():
+        lines.append(f"# HELP {name} {metric.documentation}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        labelnames = metric.labelnames
+        if metric.kind == "gauge" and multiproc:
+            labelnames = labelnames + ("pid",)
+        for key, value in sorted(state.get(name, {}).items()):
+            if metric.kind != "histogram":
+                lines.append(f"{name}{_labels(labelnames, key)} {_fmt(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets + (float("inf"),), value[:-1]):
+                cumulative += count
+                le = 'le="' + _fmt(float(bound)) + '"'
+                lines.append(f"{name}_bucket{_labels(labelnames, key, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labelnames, key)} {_fmt(float(value[-1]))}")
+            lines.append(f"{name}_count{_labels(labelnames, key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Clear all in-process values (tests)."""
+    with _lock:
+        for metric in REGISTRY.values():
+            metric.values.clear()
+
+
+def _flush_at_exit():
+    try:
+        flush(force=True)
+    except Exception:
+        pass
+
+
+atexit.register(_flush_at_exit)
@@ -0,0 +1,75 @@
+"""
+Request-level monitoring middleware.
+"""
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from ml_models.model_loader import DISEASE_MODEL_FILENAMES
+
+from . import metrics, timing
+
+
+class TimingMiddleware:
+    """
+    Trace per-stage timings (see timing.py) and add a Server-Timing header.
+    Removed from the stack entirely unless settings.PREDICT_TIMING is True.
+    Keep it last in MIDDLEWARE so the "auth" stage covers only DRF dispatch.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PREDICT_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = timing.begin()
+        try:
+            response = self.get_response(request)
+        finally:
+            trace = timing.finish(token)
+        if trace.spans:
+            response["Server-Timing"] = timing.server_timing_header(trace)
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Count requests, latency and SQL statements per route into metrics.py.
+    Keep it first in MIDDLEWARE so its numbers cover the whole stack.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(count_query))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        route = match.route if match is not None else "<unmatched>"
+        status_code = str(response.status_code)
+        metrics.HTTP_REQUESTS.inc(route=route, method=request.method, status=status_code)
+        metrics.HTTP_LATENCY.observe(elapsed, route=route, method=request.method)
+        metrics.HTTP_DB_QUERIES.observe(queries[0], route=route)
+        if match is not None and match.url_name == "predict":
+            disease = match.kwargs.get("disease", "").lower().strip()
+            if disease not in DISEASE_MODEL_FILENAMES:
+                disease = "unsupported"
+            metrics.PREDICT_REQUESTS.inc(disease=disease, status=status_code)
+            metrics.PREDICT_LATENCY.observe(elapsed, disease=disease, status=status_code)
+        metrics.flush()
+        return response
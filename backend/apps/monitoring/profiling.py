@@ -0,0 +1,160 @@
+"""
+Opt-in cProfile capture for production predict traffic.
+
+A request is profiled when settings.PROFILING_ENABLED is on and one of:
+- it carries "X-Profile: <PROFILING_HEADER_SECRET>",
+- an admin switched profiling on via /api/monitoring/profiles/toggle/ (shared by
+  all workers through a marker file in PROFILING_DIR),
+- it is picked by PROFILING_SAMPLE_RATE (0.0-1.0).
+Profiles are marshalled pstats, gzip-compressed into PROFILING_DIR and rotated
+to PROFILING_MAX_FILES. With PROFILING_ENABLED off the wrapper is a single
+settings lookup.
+
+Read one locally: gunzip 2026...-predict.pstats.gz && python -m pstats 2026...-predict.pstats
+"""
+import cProfile
+import functools
+import gzip
+import logging
+import marshal
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = ".pstats.gz"
+PROFILE_NAME_RE = re.compile(r"^[0-9T]+-\d+-[a-z_]+\.pstats\.gz$")
+FORCE_MARKER = ".force-until"
+
+# cProfile cannot run two profilers at once in one process (3.12+ raises);
+# concurrent requests simply skip profiling while one capture is in flight.
+_capture_lock = threading.Lock()
+_force_cache = {"checked": 0.0, "until": 0.0}
+
+
+def profile_dir() -> Path:
+    return Path(getattr(settings, "PROFILING_DIR", Path(settings.BASE_DIR) / "profiles"))
+
+
+def forced_until() -> float:
+    """Epoch seconds until which the admin toggle forces profiling (re-read at most once per second)."""
+    now = time.monotonic()
+    if now - _force_cache["checked"] >= 1.0:
+        _force_cache["checked"] = now
+        try:
+            _force_cache["until"] = float((profile_dir() / FORCE_MARKER).read_text())
+        except (OSError, ValueError):
+            _force_cache["until"] = 0.0
+    return _force_cache["until"]
+
+
+def set_forced(seconds):
+    """Force profiling of every request for `seconds` (0 turns it off) in all workers."""
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    until = time.time() + seconds if seconds > 0 else 0.0
+    (directory / FORCE_MARKER).write_text(str(until))
+    _force_cache["checked"] = 0.0
+    return until
+
+
+def _should_profile(request) -> bool:
+    secret = getattr(settings, "PROFILING_HEADER_SECRET", "")
+    header = request.headers.get("X-Profile")
+    if secret and header and constant_time_compare(header, secret):
+        return True
+    if forced_until() > time.time():
+        return True
+    rate = getattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+    return rate > 0 and random.random() < rate
+
+
+def _write_profile(profiler, label) -> str:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    name = f"{stamp}-{os.getpid()}-{label}{PROFILE_SUFFIX}"
+    profiler.create_stats()
+    with gzip.open(directory / name, "wb", compresslevel=6) as f:
+        f.write(marshal.dumps(profiler.stats))
+    _rotate(directory)
+    return name
+
+
+def _rotate(directory):
+    keep = getattr(settings, "PROFILING_MAX_FILES", 50)
+    files = sorted(directory.glob(f"*{PROFILE_SUFFIX}"))
+    for old in files[: max(0, len(files) - keep)]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
+
+
+def list_profiles():
+    """Newest first: [{ name, size, created_at }]."""
+    directory = profile_dir()
+    if not directory.exists():
+        return []
+    out = []
+    for path in sorted(directory.glob(f"*{PROFILE_SUFFIX}"), reverse=True):
+        st = path.stat()
+        out.append({
+            "name": path.name,
+            "size": st.st_size,
+            "created_at": datetime.fromtimestamp(st.st_mtime, timezone.utc).isoformat(),
+        })
+    return out
+
+
+def profile_path(name):
+    """Path of a stored profile, or None if the name is invalid or missing."""
+    if not PROFILE_NAME_RE.match(name):
+        return None
+    path = profile_dir() / name
+    return path if path.is_file() else None
+
+
+def profiled(label):
+    """
+    Decorator for DRF function views (apply under @api_view): profile the call
+    when selected and add an X-Profile-Id response header naming the file.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not getattr(settings, "PROFILING_ENABLED", False) or not _should_profile(request):
+                return view(request, *args, **kwargs)
+            if not _capture_lock.acquire(blocking=False):
+                return view(request, *args, **kwargs)
+            try:
+                profiler = cProfile.Profile()
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Another profiler (e.g. a debugger) owns the hook.
+                    return view(request, *args, **kwargs)
+                try:
+                    response = view(request, *args, **kwargs)
+                finally:
+                    profiler.disable()
+                try:
+                    response["X-Profile-Id"] = _write_profile(profiler, label)
+                except OSError as e:
+                    logger.warning("Could not write profile for %s: %s", label, e)
+                return response
+            finally:
+                _capture_lock.release()
+
+        return wrapper
+
+    return decorator
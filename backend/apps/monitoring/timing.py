@@ -0,0 +1,156 @@
+"""
+Per-stage timing for the prediction request path.
+
+TimingMiddleware starts a trace per request when settings.PREDICT_TIMING is on;
+code on the hot path wraps stages in span("name"). Finished traces are folded
+into in-process histograms and echoed in a Server-Timing response header.
+With no active trace, span() returns a shared no-op, so disabled cost is one
+ContextVar lookup.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from .metrics import PREDICT_STAGE_LATENCY
+
+_trace = ContextVar("timing_trace", default=None)
+
+# Histogram bucket upper bounds in milliseconds (plus an implicit +Inf bucket).
+BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+_BUCKETS_NS = tuple(int(b * 1_000_000) for b in BUCKETS_MS)
+
+
+class Trace:
+    """Spans recorded during one request: list of (stage, duration_ns)."""
+
+    __slots__ = ("start_ns", "spans")
+
+    def __init__(self):
+        self.start_ns = time.perf_counter_ns()
+        self.spans = []
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start_ns")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.trace.spans.append((self.name, time.perf_counter_ns() - self.start_ns))
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name):
+    """Context manager timing one stage of the current request (no-op without a trace)."""
+    trace = _trace.get()
+    if trace is None:
+        return _NULL_SPAN
+    return _Span(trace, name)
+
+
+def mark(name):
+    """Record a stage covering everything from the start of the trace until now."""
+    trace = _trace.get()
+    if trace is not None:
+        trace.spans.append((name, time.perf_counter_ns() - trace.start_ns))
+
+
+def begin():
+    """Start a trace for the current context. Returns a token for finish()."""
+    return _trace.set(Trace())
+
+
+def finish(token):
+    """End the trace started by begin(), aggregate its spans and return it."""
+    trace = _trace.get()
+    _trace.reset(token)
+    if trace is not None and trace.spans:
+        total_ns = time.perf_counter_ns() - trace.start_ns
+        with _lock:
+            for name, ns in trace.spans:
+                _histogram(name).observe(ns)
+            _histogram("total").observe(total_ns)
+        trace.spans.append(("total", total_ns))
+        for name, ns in trace.spans:
+            PREDICT_STAGE_LATENCY.observe(ns / 1e9, stage=name)
+    return trace
+
+
+def server_timing_header(trace):
+    """Format spans as a Server-Timing header value (durations in ms)."""
+    return ", ".join(f"{name};dur={ns / 1_000_000:.3f}" for name, ns in trace.spans)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe; callers hold _lock)."""
+
+    __slots__ = ("counts", "count", "sum_ns")
+
+    def __init__(self):
+        self.counts = [0] * (len(_BUCKETS_NS) + 1)
+        self.count = 0
+        self.sum_ns = 0
+
+    def observe(self, ns):
+        for i, bound in enumerate(_BUCKETS_NS):
+            if ns <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum_ns += ns
+
+    def as_dict(self):
+        cumulative = 0
+        buckets = []
+        for bound, c in zip(BUCKETS_MS + ("+Inf",), self.counts):
+            cumulative += c
+            buckets.append({"le": bound, "count": cumulative})
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ns / 1_000_000,
+            "mean_ms": self.sum_ns / 1_000_000 / self.count if self.count else 0.0,
+            "buckets": buckets,
+        }
+
+
+_lock = threading.Lock()
+_histograms = {}
+
+
+def _histogram(name):
+    hist = _histograms.get(name)
+    if hist is None:
+        hist = _histograms[name] = Histogram()
+    return hist
+
+
+def snapshot():
+    """Per-stage histograms aggregated in this process since start (or reset())."""
+    with _lock:
+        return {name: hist.as_dict() for name, hist in sorted(_histograms.items())}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
@@ -0,0 +1,12 @@
+from django.urls import path
+
+from . import views
+
+app_name = "monitoring"
+
+urlpatterns = [
+    path("timing/", views.timing_stats),
+    path("profiles/", views.profile_list),
+    path("profiles/toggle/", views.profile_toggle),
+    path("profiles/<str:name>/", views.profile_download),
+]
@@ -0,0 +1,157 @@
+"""
+Monitoring API: Prometheus /metrics, health checks (/healthz, /readyz), in-process
+timing histograms and stored profiles.
+"""
+import time
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import FileResponse, HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from ml_models import warmup
+
+from . import metrics, profiling, timing
+
+
+def _admin_required(request):
+    """Return a 403 Response unless the user has role='admin'."""
+    if getattr(request.user, "role", None) != "admin":
+        return Response(
+            {"detail": "Admin access required."},
+            status=status.HTTP_403_FORBIDDEN,
+        )
+    return None
+
+
+def prometheus_metrics(request):
+    """
+    GET /metrics
+    All workers' metrics in the Prometheus text format. Plain Django view (no DRF
+    auth): requires "Authorization: Bearer <METRICS_AUTH_TOKEN>"; without a token
+    configured it answers 401 unless METRICS_PUBLIC (default: DEBUG) is on.
+    """
+    token = getattr(settings, "METRICS_AUTH_TOKEN", "")
+    if token:
+        auth = request.headers.get("Authorization", "")
+        if not constant_time_compare(auth, f"Bearer {token}"):
+            return HttpResponse("Unauthorized\n", status=401, content_type="text/plain")
+    elif not getattr(settings, "METRICS_PUBLIC", settings.DEBUG):
+        return HttpResponse("Unauthorized: set METRICS_AUTH_TOKEN\n", status=401, content_type="text/plain")
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def healthz(request):
+    """
+    GET /healthz
+    Liveness: the process is up and serving requests. Touches neither the
+    database nor the models, so a slow dependency does not get workers restarted.
+    """
+    return JsonResponse({"status": "ok"})
+
+
+def _check_database():
+    start = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError as e:
+        return {"ok": False, "error": type(e).__name__}
+    return {"ok": True, "ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+def readyz(request):
+    """
+    GET /readyz
+    Readiness: 200 when the default database answers and every supported model
+    is loaded and has run its warm-up inference (ml_models.warmup), else 503.
+    The body reports the database round trip and each model's load / warm-up
+    time. Plain Django view without auth, for platform health checks; a worker
+    that has not warmed up yet starts doing so in the background.
+    """
+    database = _check_database()
+    models = warmup.status()
+    if not models["ready"]:
+        warmup.start_background()
+    ready = database["ok"] and models["ready"]
+    return JsonResponse(
+        {"status": "ready" if ready else "not_ready", "database": database, "models": models["models"]},
+        status=200 if ready else 503,
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def timing_stats(request):
+    """
+    GET /api/monitoring/timing/
+    Per-stage latency histograms of the predict path for this worker process.
+    Only role='admin' may access; 403 otherwise.
+    """
+    denied = _admin_required(request)
+    if denied:
+        return denied
+    return Response(
+        {
+            "enabled": getattr(settings, "PREDICT_TIMING", False),
+            "stages": timing.snapshot(),
+        }
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def profile_list(request):
+    """
+    GET /api/monitoring/profiles/
+    Profiling settings and the stored profiles (newest first). Admin only.
+    """
+    denied = _admin_required(request)
+    if denied:
+        return denied
+    until = profiling.forced_until()
+    return Response(
+        {
+            "enabled": getattr(settings, "PROFILING_ENABLED", False),
+            "sample_rate": getattr(settings, "PROFILING_SAMPLE_RATE", 0.0),
+            "forced_until": until if until > 0 else None,
+            "profiles": profiling.list_profiles(),
+        }
+    )
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def profile_download(request, name):
+    """GET /api/monitoring/profiles/<name>/ — download one gzip-compressed pstats file. Admin only."""
+    denied = _admin_required(request)
+    if denied:
+        return denied
+    path = profiling.profile_path(name)
+    if path is None:
+        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(open(path, "rb"), as_attachment=True, filename=name, content_type="application/gzip")
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def profile_toggle(request):
+    """
+    POST /api/monitoring/profiles/toggle/
+    Body: { "enabled": bool, "seconds": int (default 300) }. Profiles every predict
+    request in all workers for that long (requires PROFILING_ENABLED). Admin only.
+    """
+    denied = _admin_required(request)
+    if denied:
+        return denied
+    enabled = str(request.data.get("enabled", True)).lower() in ("1", "true", "yes")
+    try:
+        seconds = int(request.data.get("seconds", 300)) if enabled else 0
+    except (TypeError, ValueError):
+        return Response({"detail": "'seconds' must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+    until = profiling.set_forced(max(0, seconds))
+    return Response({"forced_until": until if until > 0 else None})
@@ -5,3 +5,7 @@ class PatientsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.patients"
     verbose_name = "Patients"
+
+    def ready(self):
+        """Connect the user -> patient cache invalidation signals."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,94 @@
+"""
+user_id -> patient_id resolution shared by the patient-scoped views.
+
+The mapping is fixed once register() creates the profile, so it is kept in a
+bounded per-process LRU (PATIENT_CACHE_SIZE entries), optionally backed by the
+Django cache named by PATIENT_CACHE_ALIAS so workers share warm entries. A
+patient_id claim on a stateless JWT user is used directly. Entries are dropped
+when a Patient is created or deleted (see signals.py); misses are not cached.
+"""
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.monitoring.metrics import record_cache
+
+_KEY = "patient-of-user:{}"
+
+_lock = threading.Lock()
+_entries = OrderedDict()
+
+
+def _shared():
+    alias = getattr(settings, "PATIENT_CACHE_ALIAS", "")
+    return caches[alias] if alias else None
+
+
+def lookup(user_id):
+    """Cached patient_id for user_id, or None. Never queries the database."""
+    with _lock:
+        patient_id = _entries.get(user_id)
+        if patient_id is not None:
+            _entries.move_to_end(user_id)
+    if patient_id is None:
+        shared = _shared()
+        if shared is not None:
+            patient_id = shared.get(_KEY.format(user_id))
+            if patient_id is not None:
+                _remember_local(user_id, patient_id)
+    record_cache("patient", patient_id is not None)
+    return patient_id
+
+
+def _remember_local(user_id, patient_id):
+    with _lock:
+        _entries[user_id] = patient_id
+        _entries.move_to_end(user_id)
+        while len(_entries) > getattr(settings, "PATIENT_CACHE_SIZE", 10000):
+            _entries.popitem(last=False)
+
+
+def remember(user_id, patient_id):
+    _remember_local(user_id, patient_id)
+    shared = _shared()
+    if shared is not None:
+        shared.set(_KEY.format(user_id), patient_id, timeout=None)
+
+
+def invalidate(user_id):
+    with _lock:
+        _entries.pop(user_id, None)
+    shared = _shared()
+    if shared is not None:
+        shared.delete(_KEY.format(user_id))
+
+
+def clear():
+    """Drop the local entries (the shared cache is left alone)."""
+    with _lock:
+        _entries.clear()
+
+
+def cached_patient_id(user):
+    """patient_id from the user's token claim or the cache, or None. Never queries."""
+    claimed = getattr(user, "patient_id", None)
+    if claimed is not None:
+        return claimed
+    return lookup(user.id)
+
+
+def patient_id_for_user(user):
+    """
+    patient_id of the user's profile, or None if it has none. Uses the token
+    claim or the cache; on a miss runs one indexed query and caches the result.
+    """
+    patient_id = cached_patient_id(user)
+    if patient_id is None:
+        from .models import Patient
+
+        patient_id = Patient.objects.filter(user_id=user.id).values_list("pk", flat=True).first()
+        if patient_id is not None:
+            remember(user.id, patient_id)
+    return patient_id
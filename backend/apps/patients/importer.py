@@ -0,0 +1,253 @@
+"""
+Bulk patient import for onboarding clinics (CSV -> User + Patient rows).
+
+Used by `manage.py import_patients` and POST /api/admin/patients/import/. Rows
+are streamed from the CSV and handled a chunk at a time: validated together
+(one query finds usernames / emails already taken), passwords hashed (across a
+process pool for the management command, inline for the admin upload), then the chunk's users and patient profiles are bulk-created in
+one transaction. A row that fails validation is reported and skipped; it does
+not stop the import.
+
+Columns: username (required), email, full_name, phone, date_of_birth
+(YYYY-MM-DD), password. Without a password column, or with invite=True, users
+get an unusable password and an invite token (POST /api/auth/invite/accept/
+sets the password) instead, which skips hashing altogether.
+"""
+import csv
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import islice
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.tokens import default_token_generator
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+
+from apps.accounts import stats_version
+
+from .models import Patient
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+COLUMNS = ("username", "email", "full_name", "phone", "date_of_birth", "password")
+MIN_PASSWORD_LENGTH = 8  # same as UserCreateSerializer
+# Row errors kept in the result; later ones are only counted
+MAX_REPORTED_ERRORS = 1000
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    failed: int = 0
+    seconds: float = 0.0
+    errors: list = field(default_factory=list)  # [{"line": n, "errors": {field: message}}]
+    invites: list = field(default_factory=list)  # [{"username", "email", "uid", "token"}]
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "failed": self.failed,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+            "errors": self.errors,
+            "invites": self.invites,
+        }
+
+
+def invite_token(user):
+    """(uid, token) that lets `user` set a password once; the token dies when the password changes."""
+    return urlsafe_base64_encode(force_bytes(user.pk)), default_token_generator.make_token(user)
+
+
+def _hash_pool(workers):
+    """Process pool for make_password, or None to hash inline."""
+    if workers <= 1:
+        return None
+    # spawn, not fork: the importing process may be a threaded web worker holding DB
+    # connections. The fresh interpreters set Django up from the inherited
+    # DJANGO_SETTINGS_MODULE; make_password is importable without the app registry.
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup)
+
+
+def _clean_row(row, invite):
+    """(values, errors) for one CSV row; values are User field values plus 'password'."""
+    values = {name: (row.get(name) or "").strip() for name in COLUMNS}
+    errors = {}
+    if not values["username"]:
+        errors["username"] = "Required."
+    elif len(values["username"]) > User._meta.get_field("username").max_length:
+        errors["username"] = "Too long."
+    if values["email"]:
+        try:
+            validate_email(values["email"])
+        except ValidationError:
+            errors["email"] = "Enter a valid email address."
+    try:
+        values["date_of_birth"] = date.fromisoformat(values["date_of_birth"]) if values["date_of_birth"] else None
+    except ValueError:
+        errors["date_of_birth"] = "Use YYYY-MM-DD."
+    if invite:
+        values["password"] = None
+    elif len(values["password"]) < MIN_PASSWORD_LENGTH:
+        errors["password"] = f"At least {MIN_PASSWORD_LENGTH} characters (or import with invites)."
+    return values, errors
+
+
+def _validate_chunk(chunk, invite, seen_usernames, seen_emails):
+    """
+    Split [(line, row)] into ([(line, values)], [(line, errors)]). Usernames and
+    emails (case-insensitive) must be new to both the database and the file.
+    """
+    cleaned = [(line, *_clean_row(row, invite)) for line, row in chunk]
+    usernames = {v["username"] for _, v, e in cleaned if not e}
+    emails = {v["email"].lower() for _, v, e in cleaned if not e and v["email"]}
+    taken_usernames, taken_emails = set(), set()
+    if usernames:
+        for username, email in (
+            User.objects.annotate(email_lower=Lower("email"))
+            .filter(Q(username__in=usernames) | Q(email_lower__in=emails))
+            .values_list("username", "email_lower")
+        ):
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+    valid, failed = [], []
+    for line, values, errors in cleaned:
+        email = values["email"].lower()
+        if not errors:
+            if values["username"] in taken_usernames or values["username"] in seen_usernames:
+                errors["username"] = "Already exists."
+            if email and (email in taken_emails or email in seen_emails):
+                errors["email"] = "Already exists."
+        if errors:
+            failed.append((line, errors))
+            continue
+        seen_usernames.add(values["username"])
+        if email:
+            seen_emails.add(email)
+        valid.append((line, values))
+    return valid, failed
+
+
+def _new_user(values, password_hash):
+    return User(
+        username=values["username"],
+        email=values["email"],
+        full_name=values["full_name"],
+        phone=values["phone"],
+        date_of_birth=values["date_of_birth"],
+        role=User.Role.PATIENT,
+        password=password_hash,
+    )
+
+
+def _insert_chunk(valid, hashes):
+    """Create users and patient profiles; returns ([(line, user)], [(line, errors)])."""
+    users = [(line, _new_user(values, h)) for (line, values), h in zip(valid, hashes)]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([u for _, u in users])
+            Patient.objects.bulk_create([Patient(user=u) for _, u in users])
+            # bulk_create sends no post_save
+            stats_version.bump()
+        return users, []
+    except IntegrityError:
+        pass
+    # A username was taken since validation (concurrent signup): insert row by row
+    created, failed = [], []
+    for line, user in users:
+        user.pk = None
+        try:
+            with transaction.atomic():
+                user.save()
+                Patient.objects.create(user=user)
+            created.append((line, user))
+        except IntegrityError:
+            failed.append((line, {"username": "Already exists."}))
+    return created, failed
+
+
+def import_patients(rows, chunk_size=None, invite=False, workers=None, progress=None):
+    """
+    Import patients from an iterable of dicts (e.g. csv.DictReader; line numbers
+    in errors assume a header on line 1). `workers` processes hash passwords
+    (default PATIENT_IMPORT_HASH_WORKERS, 0 = one per CPU); `progress(result)` is
+    called after every chunk. Returns an ImportResult.
+    """
+    chunk_size = chunk_size or settings.PATIENT_IMPORT_CHUNK_SIZE
+    if workers is None:
+        workers = settings.PATIENT_IMPORT_HASH_WORKERS
+    workers = workers or os.cpu_count() or 1
+    result = ImportResult()
+    seen_usernames, seen_emails = set(), set()
+    started = time.perf_counter()
+    numbered = enumerate(rows, start=2)
+    pool = None if invite else _hash_pool(workers)
+    try:
+        while chunk := list(islice(numbered, chunk_size)):
+            valid, failed = _validate_chunk(chunk, invite, seen_usernames, seen_emails)
+            if invite:
+                hashes = [make_password(None) for _ in valid]
+            elif pool is None:
+                hashes = [make_password(values["password"]) for _, values in valid]
+            else:
+                passwords = [values["password"] for _, values in valid]
+                hashes = list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+            created, conflicts = _insert_chunk(valid, hashes) if valid else ([], [])
+            failed.extend(conflicts)
+
+            if invite:
+                for _, user in created:
+                    uid, token = invite_token(user)
+                    result.invites.append({"username": user.username, "email": user.email, "uid": uid, "token": token})
+            result.rows += len(chunk)
+            result.created += len(created)
+            result.failed += len(failed)
+            for line, errors in sorted(failed)[: MAX_REPORTED_ERRORS - len(result.errors)]:
+                result.errors.append({"line": line, "errors": errors})
+            result.seconds = time.perf_counter() - started
+            logger.info(
+                "import_patients: %d rows, %d created, %d failed (%.0f rows/s)",
+                result.rows, result.created, result.failed, result.rows_per_second,
+            )
+            if progress:
+                progress(result)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def import_csv(stream, invite=False, **kwargs):
+    """
+    import_patients() over a text stream of CSV. A file without a password
+    column is imported with invites. Raises ValueError when there is no
+    username column.
+    """
+    reader = csv.DictReader(stream)
+    fields = {(name or "").strip() for name in reader.fieldnames or ()}
+    if "username" not in fields:
+        raise ValueError(f"CSV needs a header row with a username column (known columns: {', '.join(COLUMNS)}).")
+    reader.fieldnames = [(name or "").strip() for name in reader.fieldnames]
+    return import_patients(reader, invite=invite or "password" not in fields, **kwargs)
@@ -0,0 +1,82 @@
+"""
+Bulk-create patients (User + Patient) from a CSV file; see apps/patients/importer.py.
+
+  python manage.py import_patients clinic.csv
+  python manage.py import_patients clinic.csv --workers 8 --chunk-size 1000
+  python manage.py import_patients clinic.csv --invite --invites-out invites.csv
+
+Columns: username, email, full_name, phone, date_of_birth, password. Files
+without a password column are imported with invites; hand the written
+uid/token pairs to the patients (POST /api/auth/invite/accept/).
+"""
+import csv
+import json
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.patients.importer import import_csv
+
+
+class Command(BaseCommand):
+    help = "Import patients from a CSV file in validated, bulk-inserted chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", help="CSV file with a header row ('-' for stdin).")
+        parser.add_argument("--chunk-size", type=int, help="Rows per transaction (default PATIENT_IMPORT_CHUNK_SIZE).")
+        parser.add_argument(
+            "--workers", type=int, help="Password hashing processes (default PATIENT_IMPORT_HASH_WORKERS; 0 = per CPU)."
+        )
+        parser.add_argument("--invite", action="store_true", help="Ignore passwords and issue invite tokens.")
+        parser.add_argument("--invites-out", help="Write username,email,uid,token of invited users to this CSV.")
+        parser.add_argument("--errors-out", help="Write rejected rows (line and errors, JSON lines) to this file.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] is not None and options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be >= 1.")
+
+        def progress(result):
+            self.stdout.write(
+                f"  {result.rows} rows: {result.created} created, {result.failed} failed "
+                f"({result.rows_per_second:.0f} rows/s)"
+            )
+
+        try:
+            if options["csv_path"] == "-":
+                result = self._import(sys.stdin, options, progress)
+            else:
+                with open(options["csv_path"], newline="", encoding="utf-8-sig") as stream:
+                    result = self._import(stream, options, progress)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if result.invites:
+            if options["invites_out"]:
+                with open(options["invites_out"], "w", newline="") as out:
+                    writer = csv.DictWriter(out, fieldnames=["username", "email", "uid", "token"])
+                    writer.writeheader()
+                    writer.writerows(result.invites)
+                self.stdout.write(f"Wrote {len(result.invites)} invites to {options['invites_out']}.")
+            else:
+                self.stdout.write(self.style.WARNING("Invites were issued; pass --invites-out to save their tokens."))
+        if result.errors and options["errors_out"]:
+            with open(options["errors_out"], "w") as out:
+                out.writelines(json.dumps(error) + "\n" for error in result.errors)
+        elif result.errors:
+            for error in result.errors[:20]:
+                self.stdout.write(f"  line {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {result.created} of {result.rows} patients in {result.seconds:.1f}s "
+                f"({result.rows_per_second:.0f} rows/s); {result.failed} rejected."
+            )
+        )
+
+    def _import(self, stream, options, progress):
+        return import_csv(
+            stream,
+            invite=options["invite"],
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+            progress=progress,
+        )
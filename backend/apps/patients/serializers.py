@@ -10,3 +10,20 @@ class PatientSerializer(serializers.ModelSerializer):
     class Meta:
         model = Patient
         fields = ("id", "user", "created_at")
+
+
+# Read-only fast path for GET /api/patients/me/ and /api/patients/<id>/: a
+# values_list(*PATIENT_COLUMNS) row rendered exactly as PatientSerializer renders
+# a Patient with its user, without building serializer fields per request.
+PATIENT_COLUMNS = ("id", "created_at", *(f"user__{name}" for name in UserSerializer.Meta.fields))
+_created_at = serializers.DateTimeField()
+_date_of_birth = serializers.DateField()
+
+
+def patient_row(row):
+    """PatientSerializer(patient).data for a PATIENT_COLUMNS row."""
+    id_, created_at, *user_values = row
+    user = dict(zip(UserSerializer.Meta.fields, user_values))
+    if user["date_of_birth"] is not None:
+        user["date_of_birth"] = _date_of_birth.to_representation(user["date_of_birth"])
+    return {"id": id_, "user": user, "created_at": _created_at.to_representation(created_at)}
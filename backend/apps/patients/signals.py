@@ -0,0 +1,20 @@
+"""
+Keep the user -> patient cache (cache.py) consistent with Patient rows.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import cache as patient_cache
+from .models import Patient
+
+
+@receiver(post_save, sender=Patient)
+def _drop_on_create(sender, instance, created=False, **kwargs):
+    # A new profile replaces whatever a reused user id may have cached
+    if created:
+        patient_cache.invalidate(instance.user_id)
+
+
+@receiver(post_delete, sender=Patient)
+def _drop_on_delete(sender, instance, **kwargs):
+    patient_cache.invalidate(instance.user_id)
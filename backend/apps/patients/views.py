@@ -1,10 +1,13 @@
+from django.db.models import Count
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from config.conditional import conditional, set_validators
+
 from .models import Patient
-from .serializers import PatientSerializer
+from .serializers import PATIENT_COLUMNS, patient_row
 
 
 @api_view(["GET"])
@@ -19,12 +22,17 @@ def patient_by_id(request):
             {"detail": "Query param patient_id is required."},
             status=status.HTTP_400_BAD_REQUEST,
         )
+    # One query: patient + user joined, prediction count aggregated in SQL
     try:
-        patient = Patient.objects.get(pk=patient_id)
+        patient = (
+            Patient.objects.select_related("user")
+            .annotate(total_predictions=Count("predictions"))
+            .get(pk=patient_id)
+        )
     except (Patient.DoesNotExist, ValueError):
         return Response({"detail": "Patient not found."}, status=status.HTTP_404_NOT_FOUND)
     user = patient.user
-    total_predictions = patient.predictions.count()
+    total_predictions = patient.total_predictions
     return Response({
         "id": patient.id,
         "full_name": user.full_name or getattr(user, "username", "") or "",
@@ -34,21 +42,47 @@ def patient_by_id(request):
     })
 
 
+def _profile_validators(patient_id, patient_updated_at, user_updated_at):
+    """(ETag, Last-Modified) of a patient profile from its and its user's updated_at."""
+    etag = f'W/"patient-{patient_id}-{patient_updated_at.timestamp():.6f}-{user_updated_at.timestamp():.6f}"'
+    return etag, max(patient_updated_at, user_updated_at)
+
+
+def _me_validators(request):
+    if request.user.role != "patient":
+        return None
+    marker = (
+        Patient.objects.filter(user_id=request.user.id)
+        .values_list("id", "updated_at", "user__updated_at")
+        .first()
+    )
+    return _profile_validators(*marker) if marker else None
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@conditional(_me_validators)
 def me(request):
-    """Current user's patient profile (404 if not a patient)."""
+    """
+    Current user's patient profile (404 if not a patient). Carries ETag /
+    Last-Modified; a matching conditional GET gets 304 (config/conditional.py).
+    """
     if request.user.role != "patient":
         return Response(
             {"detail": "User is not a patient."},
             status=status.HTTP_404_NOT_FOUND,
         )
-    try:
-        patient = Patient.objects.get(user=request.user)
-    except Patient.DoesNotExist:
+    row = (
+        Patient.objects.filter(user_id=request.user.id)
+        .values_list(*PATIENT_COLUMNS, "updated_at", "user__updated_at")
+        .first()
+    )
+    if row is None:
         return Response({"detail": "Patient profile not found."}, status=status.HTTP_404_NOT_FOUND)
-    serializer = PatientSerializer(patient)
-    return Response(serializer.data)
+    *columns, patient_updated_at, user_updated_at = row
+    return set_validators(
+        Response(patient_row(columns)), *_profile_validators(columns[0], patient_updated_at, user_updated_at)
+    )
 
 
 @api_view(["GET"])
@@ -57,9 +91,7 @@ def lookup(request, pk):
     """Provider-only: get patient by id (for verify flow). Returns 404 if not provider or patient not found."""
     if request.user.role != "provider":
         return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-    try:
-        patient = Patient.objects.get(pk=pk)
-    except (Patient.DoesNotExist, ValueError):
+    row = Patient.objects.filter(pk=pk).values_list(*PATIENT_COLUMNS).first()
+    if row is None:
         return Response({"detail": "Patient not found."}, status=status.HTTP_404_NOT_FOUND)
-    serializer = PatientSerializer(patient)
-    return Response(serializer.data)
+    return Response(patient_row(row))
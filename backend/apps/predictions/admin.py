@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Prediction
+from .models import Prediction, PredictionDailyRollup
 
 
 @admin.register(Prediction)
@@ -7,3 +7,10 @@ class PredictionAdmin(admin.ModelAdmin):
     list_display = ("id", "patient", "disease_type", "prediction", "probability", "risk_level", "created_at")
     list_filter = ("disease_type", "risk_level")
     search_fields = ("patient__user__username", "patient__user__email")
+
+
+@admin.register(PredictionDailyRollup)
+class PredictionDailyRollupAdmin(admin.ModelAdmin):
+    list_display = ("date", "disease_type", "risk_level", "provider_id", "count", "positive_count", "sum_probability")
+    list_filter = ("disease_type", "risk_level")
+    date_hierarchy = "date"
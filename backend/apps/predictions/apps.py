@@ -5,3 +5,7 @@ class PredictionsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.predictions"
     verbose_name = "Predictions"
+
+    def ready(self):
+        """Connect the rollup receiver to predictions_created."""
+        from . import signals  # noqa: F401
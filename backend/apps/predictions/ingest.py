@@ -0,0 +1,221 @@
+"""
+Bulk ingestion of historical predictions from a CSV of past vitals.
+
+`manage.py ingest_predictions <disease> file.csv` streams the file with pandas
+in chunks. Each chunk's headers are normalized like the training scripts'
+(ml_models.columns), its rows are scored with one predict_proba call
+(ml_models.predictor.predict_frame) and inserted in one transaction together
+with their daily rollups. Rows go in straight from the DataFrame (COPY on
+PostgreSQL, multi-row INSERTs elsewhere) rather than through bulk_create:
+compiling model instances into SQL cost more than scoring, so
+predictions_created is not sent; the rollups (and the admin stats version)
+are updated from the same frame instead.
+
+Each row names its patient by `patient_id` (Patient id) or `username` (the
+patient's login) and may carry `created_at` (ISO date/time; naive values are in
+TIME_ZONE, default now). Rows with an unknown patient, a feature the schema
+rejects (missing, non-numeric or out of range; ml_models.schema) or an
+unparsable date are counted as rejected and skipped.
+"""
+import io
+import re
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.accounts import stats_version
+from apps.patients.models import Patient
+from ml_models.columns import normalize_columns
+from ml_models.predictor import FEATURE_ORDER, SCHEMAS, SUPPORTED_DISEASES, predict_frame
+
+from .models import Prediction
+from .rollups import record_frame
+
+DEFAULT_CHUNK_SIZE = 50_000
+_OFFSET_RE = re.compile(r"(?:Z|[+-]\d{2}:?\d{2})$")
+INSERT_COLUMNS = (
+    "patient_id", "disease_type", "prediction", "probability", "risk_level", "created_at", "requested_by_id",
+)
+# Rows per multi-row INSERT on backends without COPY (fewer if the backend caps parameters)
+MAX_INSERT_BATCH = 1000
+# Rejected line numbers kept in the result; later ones are only counted
+MAX_REPORTED_REJECTS = 1000
+
+
+@dataclass
+class IngestResult:
+    rows: int = 0
+    created: int = 0
+    rejected: int = 0
+    seconds: float = 0.0
+    rejected_lines: list = field(default_factory=list)
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def _patient_ids(chunk):
+    """
+    Series of Patient ids aligned with chunk (NaN where unknown): patient_id
+    where given, else the patient with that username. One query per column.
+    """
+    ids = pd.Series(np.nan, index=chunk.index)
+    if "patient_id" in chunk.columns:
+        given = pd.to_numeric(chunk["patient_id"], errors="coerce")
+        known = Patient.objects.filter(id__in=given.dropna().astype(int).unique().tolist()).values_list("id", flat=True)
+        ids = given.where(given.isin(list(known)))
+    if "username" in chunk.columns:
+        usernames = chunk["username"].where(ids.isna() & chunk["username"].notna()).dropna().astype(str).str.strip()
+        if not usernames.empty:
+            by_username = dict(
+                Patient.objects.filter(user__username__in=usernames.unique().tolist()).values_list("user__username", "id")
+            )
+            ids = ids.fillna(usernames.map(by_username))
+    return ids
+
+
+def _created_at(chunk, now):
+    """
+    UTC timestamps aligned with chunk (NaT where unparsable); `now` where the
+    column is absent or blank. Values with an offset keep it, naive ones are in TIME_ZONE.
+    """
+    if "created_at" not in chunk.columns:
+        return pd.Series(pd.Timestamp(now), index=chunk.index)
+    text = np.char.strip(chunk["created_at"].fillna("").to_numpy(dtype=str))
+    raw = pd.Series(text, index=chunk.index, dtype=object)
+    has_offset = raw.str.contains(_OFFSET_RE).to_numpy(dtype=bool)
+    blank = text == ""
+    parsed = pd.Series(pd.NaT, index=chunk.index, dtype="datetime64[ns, UTC]")
+    if has_offset.any():
+        parsed[has_offset] = pd.to_datetime(raw[has_offset], errors="coerce", utc=True, format="ISO8601")
+    naive = ~has_offset & ~blank
+    if naive.any():
+        parsed[naive] = (
+            pd.to_datetime(raw[naive], errors="coerce", format="ISO8601")
+            .dt.tz_localize(timezone.get_current_timezone(), ambiguous="NaT", nonexistent="NaT")
+            .dt.tz_convert("UTC")
+        )
+    parsed[blank] = pd.Timestamp(now)
+    return parsed
+
+
+def _utc_text(created_at, sep):
+    """ISO text of an aware datetime Series in UTC, e.g. '2026-01-05 10:00:00.000000' for sep=' '."""
+    text = np.datetime_as_string(created_at.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy(), unit="us")
+    return np.char.replace(text, "T", sep)
+
+
+def _insert_rows(rows):
+    """
+    Insert a DataFrame with INSERT_COLUMNS into the predictions table without
+    building model instances: COPY on PostgreSQL, elsewhere multi-row INSERTs
+    of as many rows as the backend takes parameters for (bulk_batch_size).
+    Rows go in sorted by (patient, created_at), the order of the history
+    index, so index pages are filled in sequence instead of at random.
+    """
+    qn = connection.ops.quote_name
+    table = qn(Prediction._meta.db_table)
+    columns = ", ".join(qn(c) for c in INSERT_COLUMNS)
+    rows = rows.sort_values(["patient_id", "created_at"], kind="stable")
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            buffer = io.StringIO()
+            rows.assign(created_at=np.char.add(_utc_text(rows["created_at"], " "), "+00:00")).to_csv(
+                buffer, index=False, header=False, columns=list(INSERT_COLUMNS)
+            )
+            sql = f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)"
+            raw = cursor.cursor
+            if hasattr(raw, "copy_expert"):  # psycopg2
+                buffer.seek(0)
+                raw.copy_expert(sql, buffer)
+            else:  # psycopg 3
+                with raw.copy(sql) as copy:
+                    copy.write(buffer.getvalue())
+        else:
+            # Django stores aware datetimes on SQLite as naive UTC text
+            values = [
+                rows[c].tolist() if c != "created_at" else _utc_text(rows[c], " ").tolist()
+                for c in INSERT_COLUMNS
+            ]
+            params = [value for row in zip(*values) for value in row]
+            fields = [Prediction._meta.get_field(c) for c in INSERT_COLUMNS]
+            batch = max(1, min(connection.ops.bulk_batch_size(fields, rows.index), MAX_INSERT_BATCH))
+            placeholder = f"({', '.join(['%s'] * len(INSERT_COLUMNS))})"
+            width = len(INSERT_COLUMNS)
+            sql = None
+            for start in range(0, len(rows), batch):
+                count = min(batch, len(rows) - start)
+                if sql is None or count != batch:
+                    sql = f"INSERT INTO {table} ({columns}) VALUES {', '.join([placeholder] * count)}"
+                cursor.execute(sql, params[start * width:(start + count) * width])
+
+
+def ingest_chunk(disease, chunk, requested_by=None, first_line=2):
+    """
+    Score and save one DataFrame chunk (headers already normalized). Returns
+    (created, [rejected line numbers]); line numbers count from `first_line`.
+    """
+    order = FEATURE_ORDER[disease]
+    check = SCHEMAS[disease].validate_columns(chunk)
+    patient_ids = _patient_ids(chunk)
+    created_at = _created_at(chunk, timezone.now())
+    valid = check.valid & (patient_ids.notna() & created_at.notna()).to_numpy()
+    lines = pd.RangeIndex(first_line, first_line + len(chunk))
+    rejected = lines[~valid].tolist()
+    if not valid.any():
+        return 0, rejected
+
+    scores = predict_frame(disease, pd.DataFrame(check.values[valid], columns=order))
+    rows = pd.DataFrame({
+        "patient_id": patient_ids[valid].astype(int).to_numpy(),
+        "disease_type": disease,
+        "prediction": scores["prediction"],
+        "probability": scores["probability"],
+        "risk_level": scores["risk_level"],
+        "created_at": created_at[valid].array,
+        "requested_by_id": requested_by.pk if requested_by is not None else None,
+    })
+    provider_id = requested_by.pk if requested_by is not None and requested_by.role == "provider" else 0
+    with transaction.atomic():
+        _insert_rows(rows)
+        record_frame(rows, provider_id)
+        stats_version.bump()
+    return len(rows), rejected
+
+
+def ingest_csv(disease, source, chunk_size=DEFAULT_CHUNK_SIZE, requested_by=None, progress=None):
+    """
+    Ingest a CSV (path or text stream) of `disease` feature rows. `requested_by`
+    (a User) is recorded on every prediction; `progress(result)` is called after
+    each chunk. Raises ValueError for an unknown disease or missing columns.
+    """
+    disease = disease.lower().strip()
+    if disease not in SUPPORTED_DISEASES:
+        raise ValueError(f"Unsupported disease: {disease}. Supported: {SUPPORTED_DISEASES}")
+    result = IngestResult()
+    started = time.perf_counter()
+    line = 2  # line 1 is the header
+    for chunk in pd.read_csv(source, chunksize=chunk_size):
+        normalize_columns(chunk)
+        if result.rows == 0:
+            missing = [name for name in FEATURE_ORDER[disease] if name not in chunk.columns]
+            if "patient_id" not in chunk.columns and "username" not in chunk.columns:
+                missing.append("patient_id or username")
+            if missing:
+                raise ValueError(f"Missing columns for {disease}: {missing}. Found: {list(chunk.columns)}")
+        created, rejected = ingest_chunk(disease, chunk, requested_by=requested_by, first_line=line)
+        line += len(chunk)
+        result.rows += len(chunk)
+        result.created += created
+        result.rejected += len(rejected)
+        result.rejected_lines.extend(rejected[: MAX_REPORTED_REJECTS - len(result.rejected_lines)])
+        result.seconds = time.perf_counter() - started
+        if progress:
+            progress(result)
+    result.seconds = time.perf_counter() - started
+    return result
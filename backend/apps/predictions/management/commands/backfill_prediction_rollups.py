@@ -0,0 +1,47 @@
+"""
+Rebuild PredictionDailyRollup from the raw predictions table, a chunk of days at a time.
+
+  python manage.py backfill_prediction_rollups                  # every day with predictions
+  python manage.py backfill_prediction_rollups --since 2026-01-01 --chunk-days 7
+
+Each chunk is recomputed in its own transaction, replacing existing rollup rows
+for those days. Predictions saved while a chunk is being rebuilt may be counted
+twice or not at all for that day; re-run for recent days when traffic is quiet.
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.predictions.models import Prediction
+from apps.predictions.rollups import rebuild_days
+
+
+class Command(BaseCommand):
+    help = "Recompute daily prediction rollups from raw predictions in chunks of days."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=date.fromisoformat, help="First day (YYYY-MM-DD); default: first prediction.")
+        parser.add_argument("--until", type=date.fromisoformat, help="Last day (YYYY-MM-DD); default: today.")
+        parser.add_argument("--chunk-days", type=int, default=7)
+
+    def handle(self, *args, **options):
+        if options["chunk_days"] < 1:
+            raise CommandError("--chunk-days must be >= 1.")
+        bounds = Prediction.objects.aggregate(first=Min("created_at"), last=Max("created_at"))
+        if bounds["first"] is None and options["since"] is None:
+            self.stdout.write("No predictions; nothing to backfill.")
+            return
+        first = options["since"] or timezone.localdate(bounds["first"])
+        last = options["until"] or max(timezone.localdate(), timezone.localdate(bounds["last"]) if bounds["last"] else first)
+        if first > last:
+            raise CommandError("--since is after --until.")
+
+        day, written = first, 0
+        while day <= last:
+            chunk_end = min(last, day + timedelta(days=options["chunk_days"] - 1))
+            written += rebuild_days(day, chunk_end)
+            self.stdout.write(f"  {day} .. {chunk_end}")
+            day = chunk_end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups for {first} .. {last} ({written} rows)."))
@@ -0,0 +1,84 @@
+"""
+Compute permutation importances and partial-dependence grids for the models and
+store them next to each .pkl (ml_models/<disease>_insights.json), where
+GET /api/predict/<disease>/insights/ serves them from.
+
+  python manage.py compute_model_insights heart --data heart.csv --target target
+  python manage.py compute_model_insights --synthetic          # every disease, not served by the API
+
+The train_* scripts compute them on their held-out split. With --synthetic the
+reference rows are drawn from ml_models.samples' clinical ranges and importance
+is measured against the model's own predictions; the file records
+reference.source "synthetic" and the endpoint answers 404 for it, since such
+numbers describe the model, not the disease.
+"""
+import random
+
+import pandas as pd
+from django.core.management.base import BaseCommand, CommandError
+
+from ml_models.columns import normalize_column, normalize_columns
+from ml_models.insights import DEFAULT_GRID_SIZE, DEFAULT_MAX_ROWS, DEFAULT_REPEATS, save_insights, summary
+from ml_models.model_loader import get_model
+from ml_models.predictor import FEATURE_ORDER, SCHEMAS, SUPPORTED_DISEASES
+from ml_models.samples import random_features
+
+
+class Command(BaseCommand):
+    help = "Precompute feature importances and partial dependence for the prediction models."
+
+    def add_arguments(self, parser):
+        parser.add_argument("diseases", nargs="*", help=f"Default: all of {', '.join(SUPPORTED_DISEASES)}.")
+        parser.add_argument("--data", help="Labelled CSV of reference rows (one disease only).")
+        parser.add_argument("--target", default="target", help="Label column of --data (default: target).")
+        parser.add_argument(
+            "--synthetic", action="store_true", help="Unlabelled rows from the clinical ranges instead of --data."
+        )
+        parser.add_argument("--rows", type=int, default=DEFAULT_MAX_ROWS, help="Reference rows used at most.")
+        parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Shuffles per feature.")
+        parser.add_argument("--grid", type=int, default=DEFAULT_GRID_SIZE, help="Partial-dependence points per feature.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        diseases = options["diseases"] or SUPPORTED_DISEASES
+        unsupported = [d for d in diseases if d not in SUPPORTED_DISEASES]
+        if unsupported:
+            raise CommandError(f"Unsupported diseases: {unsupported}. Supported: {SUPPORTED_DISEASES}")
+        if bool(options["data"]) == options["synthetic"]:
+            raise CommandError("Give a labelled CSV with --data, or --synthetic for unlabelled reference rows.")
+        if options["data"] and len(diseases) != 1:
+            raise CommandError("--data needs exactly one disease.")
+        if min(options["rows"], options["repeats"], options["grid"]) < 1:
+            raise CommandError("--rows, --repeats and --grid must be >= 1.")
+
+        for disease in diseases:
+            if options["data"]:
+                X, y = self._load_csv(disease, options["data"], options["target"])
+                source = options["data"]
+            else:
+                rng = random.Random(options["seed"])
+                X = pd.DataFrame([random_features(disease, rng) for _ in range(options["rows"])])[FEATURE_ORDER[disease]]
+                y, source = None, "synthetic"
+            path, insights = save_insights(
+                disease, get_model(disease), X, y, grid_size=options["grid"], repeats=options["repeats"],
+                max_rows=options["rows"], seed=options["seed"], source=source,
+            )
+            self.stdout.write(summary(path, insights))
+
+    def _load_csv(self, disease, path, target):
+        try:
+            df = normalize_columns(pd.read_csv(path))
+        except OSError as e:
+            raise CommandError(str(e))
+        target = normalize_column(target)
+        missing = [c for c in [*FEATURE_ORDER[disease], target] if c not in df.columns]
+        if missing:
+            raise CommandError(f"Missing columns in {path}: {missing}")
+        check = SCHEMAS[disease].validate_columns(df)
+        labels = pd.to_numeric(df[target], errors="coerce")
+        keep = check.valid & labels.notna().to_numpy()
+        if not keep.any():
+            raise CommandError(f"No valid rows in {path}.")
+        self.stdout.write(f"{disease}: {int(keep.sum()):,} of {len(df):,} rows usable")
+        X = pd.DataFrame(check.values[keep], columns=FEATURE_ORDER[disease])
+        return X, labels[keep].astype(int).to_numpy()
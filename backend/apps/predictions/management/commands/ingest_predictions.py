@@ -0,0 +1,62 @@
+"""
+Score and store historical predictions from a CSV of past vitals.
+
+  python manage.py ingest_predictions heart vitals.csv
+  python manage.py ingest_predictions diabetes vitals.csv --chunk-size 100000 --requested-by dr_amina
+
+The CSV needs the disease's feature columns (headers are normalized like the
+training scripts: "Blood Pressure" -> blood_pressure), patient_id or username,
+and optionally created_at. See apps/predictions/ingest.py.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.predictions.ingest import DEFAULT_CHUNK_SIZE, ingest_csv
+from ml_models.predictor import SUPPORTED_DISEASES
+
+
+class Command(BaseCommand):
+    help = "Bulk-score a CSV of past vitals and save the predictions, chunk by chunk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("disease", choices=SUPPORTED_DISEASES)
+        parser.add_argument("csv_path")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows scored and inserted at once.")
+        parser.add_argument("--requested-by", help="Username to record as the submitter (e.g. the migrating provider).")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be >= 1.")
+        requested_by = None
+        if options["requested_by"]:
+            User = get_user_model()
+            try:
+                requested_by = User.objects.get(username=options["requested_by"])
+            except User.DoesNotExist:
+                raise CommandError(f"No user named {options['requested_by']!r}.")
+
+        def progress(result):
+            self.stdout.write(
+                f"  {result.rows:,} rows: {result.created:,} saved, {result.rejected:,} rejected "
+                f"({result.rows_per_second:,.0f} rows/s)"
+            )
+
+        try:
+            result = ingest_csv(
+                options["disease"],
+                options["csv_path"],
+                chunk_size=options["chunk_size"],
+                requested_by=requested_by,
+                progress=progress,
+            )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        if result.rejected_lines:
+            shown = ", ".join(str(n) for n in result.rejected_lines[:20])
+            self.stdout.write(f"Rejected lines (first {min(20, len(result.rejected_lines))}): {shown}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Saved {result.created:,} of {result.rows:,} {options['disease']} predictions in "
+                f"{result.seconds:.1f}s ({result.rows_per_second:,.0f} rows/s)."
+            )
+        )
@@ -0,0 +1,100 @@
+"""
+Maintain the monthly partitions of predictions_prediction (PostgreSQL only).
+
+  python manage.py manage_prediction_partitions                      # create upcoming months
+  python manage.py manage_prediction_partitions --retention-months 24 # + detach older months
+  python manage.py manage_prediction_partitions --retention-months 24 --drop
+  python manage.py manage_prediction_partitions --convert            # partition an existing table
+  python manage.py manage_prediction_partitions --unpartition        # back to one plain table
+
+Run it from cron (e.g. daily); it is idempotent. --convert and --unpartition
+rewrite the whole table and lock it while they copy; run them in a maintenance
+window.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from apps.predictions import partitioning
+
+
+class Command(BaseCommand):
+    help = "Pre-create future prediction partitions and detach or drop expired ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=getattr(settings, "PREDICTION_PARTITION_MONTHS_AHEAD", 3),
+            help="Months after the current one to create partitions for.",
+        )
+        parser.add_argument(
+            "--retention-months",
+            type=int,
+            default=getattr(settings, "PREDICTION_RETENTION_MONTHS", 0),
+            help="Keep this many months (current included); 0 keeps everything.",
+        )
+        parser.add_argument("--drop", action="store_true", help="Drop expired partitions instead of detaching them.")
+        parser.add_argument("--convert", action="store_true", help="Convert a plain table to partitions first.")
+        parser.add_argument(
+            "--unpartition", action="store_true", help="Convert a partitioned table back to a plain one and stop."
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would change.")
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        connection = connections[options["database"]]
+        if options["months_ahead"] < 0 or options["retention_months"] < 0:
+            raise CommandError("--months-ahead and --retention-months must be >= 0.")
+        if options["convert"] and options["unpartition"]:
+            raise CommandError("--convert and --unpartition are mutually exclusive.")
+        if not partitioning.supported(connection):
+            self.stdout.write(f"Prediction partitioning needs PostgreSQL (database is {connection.vendor}); nothing to do.")
+            return
+        if options["unpartition"]:
+            self._unpartition(connection, options["dry_run"])
+            return
+
+        if not partitioning.is_partitioned(connection):
+            if not options["convert"]:
+                self.stdout.write(
+                    f"{partitioning.TABLE} is not partitioned; run with --convert to partition it."
+                )
+                return
+            if options["dry_run"]:
+                self.stdout.write(f"Would convert {partitioning.TABLE} to monthly partitions.")
+                return
+            self.stdout.write(f"Converting {partitioning.TABLE} to monthly partitions (copies every row)...")
+            partitioning.convert_to_partitioned(connection)
+
+        existing = {month for _, month in partitioning.list_partitions(connection)}
+        if options["dry_run"]:
+            current = partitioning.month_start(timezone.now())
+            for i in range(options["months_ahead"] + 1):
+                month = partitioning.add_months(current, i)
+                if month not in existing:
+                    self.stdout.write(f"Would create {partitioning.partition_name(month)}")
+        else:
+            for name in partitioning.ensure_partitions(connection, options["months_ahead"]):
+                self.stdout.write(f"Created {name}")
+
+        if options["retention_months"]:
+            action, done = ("drop", "Dropped") if options["drop"] else ("detach", "Detached")
+            for name, _ in partitioning.expired_partitions(connection, options["retention_months"]):
+                if options["dry_run"]:
+                    self.stdout.write(f"Would {action} {name}")
+                else:
+                    partitioning.detach_partition(connection, name, drop=options["drop"])
+                    self.stdout.write(f"{done} {name}")
+        self.stdout.write(self.style.SUCCESS("Prediction partitions up to date."))
+
+    def _unpartition(self, connection, dry_run):
+        if not partitioning.is_partitioned(connection):
+            self.stdout.write(f"{partitioning.TABLE} is not partitioned; nothing to do.")
+        elif dry_run:
+            self.stdout.write(f"Would convert {partitioning.TABLE} back to a plain table.")
+        else:
+            self.stdout.write(f"Converting {partitioning.TABLE} back to a plain table (copies every row)...")
+            partitioning.convert_to_plain(connection)
+            self.stdout.write(self.style.SUCCESS(f"{partitioning.TABLE} is a plain table again."))
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('predictions', '0002_prediction_patient_created_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='prediction',
+            name='requested_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.CreateModel(
+            name='PredictionDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('disease_type', models.CharField(choices=[('heart', 'Heart Disease'), ('hypertension', 'Hypertension'), ('stroke', 'Stroke'), ('diabetes', 'Diabetes')], max_length=50)),
+                ('risk_level', models.CharField(max_length=20)),
+                ('provider_id', models.BigIntegerField(default=0)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('positive_count', models.PositiveIntegerField(default=0)),
+                ('sum_probability', models.FloatField(default=0.0)),
+            ],
+            options={
+                'db_table': 'predictions_daily_rollup',
+                'constraints': [models.UniqueConstraint(fields=('date', 'disease_type', 'risk_level', 'provider_id'), name='pred_rollup_key_uniq')],
+            },
+        ),
+    ]
@@ -1,7 +1,9 @@
 """
 Stores disease risk predictions per patient.
 """
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 from apps.patients.models import Patient
 
@@ -26,11 +28,51 @@ class Prediction(models.Model):
     prediction = models.IntegerField(help_text="0 = negative, 1 = positive")
     probability = models.FloatField()
     risk_level = models.CharField(max_length=20)  # Low, Medium, High
-    created_at = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add so ingested historical predictions keep their dates
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    # Who submitted it (the patient themselves or a provider); feeds the per-provider rollups
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
 
     class Meta:
         db_table = "predictions_prediction"
         ordering = ["-created_at"]
+        # History: WHERE patient_id = ? ORDER BY created_at DESC (also serves the FK lookups)
+        indexes = [models.Index(fields=["patient", "-created_at"], name="pred_patient_created_idx")]
 
     def __str__(self):
         return f"{self.disease_type} – patient {self.patient_id} ({self.risk_level})"
+
+
+class PredictionDailyRollup(models.Model):
+    """
+    Pre-aggregated predictions per day x disease x risk level x provider
+    (see rollups.py). Analytics read these instead of scanning predictions.
+    """
+
+    date = models.DateField()
+    disease_type = models.CharField(max_length=50, choices=Prediction.DiseaseType.choices)
+    risk_level = models.CharField(max_length=20)
+    # User id of the provider who submitted the predictions; 0 = submitted by patients.
+    # Not a foreign key, so deleting a provider keeps historical counts.
+    provider_id = models.BigIntegerField(default=0)
+    count = models.PositiveIntegerField(default=0)
+    positive_count = models.PositiveIntegerField(default=0)
+    sum_probability = models.FloatField(default=0.0)
+
+    class Meta:
+        db_table = "predictions_daily_rollup"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "disease_type", "risk_level", "provider_id"],
+                name="pred_rollup_key_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.disease_type}/{self.risk_level}: {self.count}"
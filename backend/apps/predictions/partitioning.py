@@ -0,0 +1,188 @@
+"""
+Monthly range partitioning of predictions_prediction on created_at (PostgreSQL only).
+
+Migrations never change the layout: `manage.py manage_prediction_partitions
+--convert` converts the table (copying existing rows, under a lock), and the
+same command pre-creates upcoming months, detaches or drops months past the
+retention window and, with --unpartition, converts back to a plain table.
+Partitions are named predictions_prediction_pYYYYMM with UTC month bounds; a
+DEFAULT partition catches anything outside them so inserts never fail. Postgres
+requires the partition key in the primary key, so it becomes (id, created_at);
+the ORM still addresses rows by id. Foreign keys and indexes of the table are
+carried over by definition. Other databases are left alone.
+"""
+import re
+from datetime import date
+
+from django.db import transaction
+from django.utils import timezone
+
+TABLE = "predictions_prediction"
+DEFAULT_PARTITION = f"{TABLE}_default"
+_STAGING = f"{TABLE}_staging"
+_MONTH_RE = re.compile(rf"^{TABLE}_p(\d{{4}})(\d{{2}})$")
+
+
+def supported(connection):
+    return connection.vendor == "postgresql"
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def month_start(value):
+    return date(value.year, value.month, 1)
+
+
+def add_months(month, n):
+    years, index = divmod(month.month - 1 + n, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_name(month):
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def _bound(month):
+    return f"{month.isoformat()} 00:00:00+00"
+
+
+def list_partitions(connection):
+    """Monthly partitions attached to the table: [(name, month)] oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = %s",
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = _MONTH_RE.match(name)
+        if match:
+            months.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+    return sorted(months, key=lambda item: item[1])
+
+
+def create_partition(connection, month):
+    """Create and attach the partition for `month`, moving its rows out of DEFAULT first."""
+    qn = connection.ops.quote_name
+    name = partition_name(month)
+    low, high = _bound(month), _bound(add_months(month, 1))
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"CREATE TABLE {qn(name)} (LIKE {qn(TABLE)} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} "
+            f"WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved",
+            [low, high],
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(TABLE)} ATTACH PARTITION {qn(name)} FOR VALUES FROM (%s) TO (%s)",
+            [low, high],
+        )
+    return name
+
+
+def ensure_partitions(connection, months_ahead, first_month=None, today=None):
+    """Create missing partitions from first_month (default: this month) to months_ahead; return their names."""
+    current = month_start(today or timezone.now())
+    month = first_month or current
+    existing = {m for _, m in list_partitions(connection)}
+    created = []
+    while month <= add_months(current, months_ahead):
+        if month not in existing:
+            created.append(create_partition(connection, month))
+        month = add_months(month, 1)
+    return created
+
+
+def expired_partitions(connection, retention_months, today=None):
+    """Partitions older than the last `retention_months` months, current included: [(name, month)]."""
+    cutoff = add_months(month_start(today or timezone.now()), -(retention_months - 1))
+    return [(name, month) for name, month in list_partitions(connection) if month < cutoff]
+
+
+def detach_partition(connection, name, drop=False):
+    """Detach a partition (it stays as a standalone table for archiving) or drop it."""
+    qn = connection.ops.quote_name
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} DETACH PARTITION {qn(name)}")
+        if drop:
+            cursor.execute(f"DROP TABLE {qn(name)}")
+
+
+def _rebuild(connection, partitioned):
+    """Recreate TABLE as a partitioned (or plain) table with the same columns, keys, indexes and rows."""
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT MIN(created_at), MAX(id) FROM {qn(TABLE)}")
+        first_created, max_id = cursor.fetchone()
+        cursor.execute(f"ALTER TABLE {qn(TABLE)} RENAME TO {qn(_STAGING)}")
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+            [_STAGING],
+        )
+        for (pk_name,) in cursor.fetchall():
+            # Keep the new table's primary key named <table>_pkey
+            cursor.execute(f"ALTER TABLE {qn(_STAGING)} RENAME CONSTRAINT {qn(pk_name)} TO {qn(_STAGING + '_pkey')}")
+        cursor.execute(
+            "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype = 'f'",
+            [_STAGING],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x "
+            "JOIN pg_class i ON i.oid = x.indexrelid "
+            "WHERE x.indrelid = %s::regclass AND NOT x.indisprimary",
+            [_STAGING],
+        )
+        indexes = cursor.fetchall()
+        for index_name, _ in indexes:
+            # Free the names for the new table; the data is dropped below anyway
+            cursor.execute(f"DROP INDEX {qn(index_name)}")
+
+        if partitioned:
+            cursor.execute(
+                f"CREATE TABLE {qn(TABLE)} (LIKE {qn(_STAGING)} INCLUDING DEFAULTS, "
+                f"PRIMARY KEY (id, created_at)) PARTITION BY RANGE (created_at)"
+            )
+        else:
+            cursor.execute(f"CREATE TABLE {qn(TABLE)} (LIKE {qn(_STAGING)} INCLUDING DEFAULTS, PRIMARY KEY (id))")
+        cursor.execute(
+            f"ALTER TABLE {qn(TABLE)} ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY "
+            f"(START WITH {int(max_id or 0) + 1})"
+        )
+        for constraint_name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {qn(TABLE)} ADD CONSTRAINT {qn(constraint_name)} {definition}")
+        for _, definition in indexes:
+            # Partitioned indexes are reported as "ON ONLY <table>"; recreate them recursively
+            cursor.execute(definition.replace(" ON ONLY ", " ON ").replace(_STAGING, TABLE))
+        if partitioned:
+            cursor.execute(f"CREATE TABLE {qn(DEFAULT_PARTITION)} PARTITION OF {qn(TABLE)} DEFAULT")
+    if partitioned:
+        ensure_partitions(connection, months_ahead=3, first_month=month_start(first_created) if first_created else None)
+    with connection.cursor() as cursor:
+        cursor.execute(f"INSERT INTO {qn(TABLE)} SELECT * FROM {qn(_STAGING)}")
+        cursor.execute(f"DROP TABLE {qn(_STAGING)} CASCADE")
+
+
+def convert_to_partitioned(connection):
+    """Turn the plain table into a monthly-partitioned one (rows copied; locks the table)."""
+    with transaction.atomic(using=connection.alias):
+        _rebuild(connection, partitioned=True)
+
+
+def convert_to_plain(connection):
+    """Undo convert_to_partitioned(): one plain table holding every row."""
+    with transaction.atomic(using=connection.alias):
+        _rebuild(connection, partitioned=False)
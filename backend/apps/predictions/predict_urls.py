@@ -1,8 +1,11 @@
-"""URLs for POST /api/predict/<disease>/"""
+"""URLs for POST /api/predict/<disease>/, POST /api/predict/panel/ and GET /api/predict/<disease>/insights/"""
 from django.urls import path
 
 from . import views
 
 urlpatterns = [
-    path("<str:disease>/", views.predict),
+    # Before <disease>/, which would otherwise match "panel"
+    path("panel/", views.predict_panel, name="predict-panel"),
+    path("<str:disease>/", views.predict, name="predict"),
+    path("<str:disease>/insights/", views.model_insights, name="predict-insights"),
 ]
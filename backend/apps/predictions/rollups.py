@@ -0,0 +1,135 @@
+"""
+Incremental daily rollups of predictions (PredictionDailyRollup).
+
+Code that creates predictions sends signals.predictions_created; its receiver
+adds them to their (date, disease, risk level, provider) rows with a single
+upsert once the insert has committed. CSV ingestion (ingest.py) adds its rows with record_frame(). Predictions
+created elsewhere (admin, shell, scripts) are picked up by
+`manage.py backfill_prediction_rollups`, which rebuilds days from the raw table
+in chunks. Dates are local dates in settings.TIME_ZONE.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import connection, transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Prediction, PredictionDailyRollup
+
+# Rollup rows per upsert statement (7 parameters each; stays under SQLite's limit)
+_UPSERT_BATCH = 100
+
+
+def _provider_id(prediction, provider_ids):
+    requested_by = prediction.requested_by_id
+    return requested_by if requested_by is not None and requested_by in provider_ids else 0
+
+
+def _upsert(totals):
+    """Add {(date, disease, risk, provider): [count, positive, sum_probability]} to the rollup rows."""
+    if not totals:
+        return
+    table = connection.ops.quote_name(PredictionDailyRollup._meta.db_table)
+    items = list(totals.items())
+    with connection.cursor() as cursor:
+        for i in range(0, len(items), _UPSERT_BATCH):
+            batch = items[i:i + _UPSERT_BATCH]
+            params = []
+            for (day, disease, risk, provider), (count, positive, probability) in batch:
+                params.extend([day, disease, risk, provider, count, positive, probability])
+            # Same ON CONFLICT syntax on PostgreSQL and SQLite (3.24+)
+            cursor.execute(
+                f"INSERT INTO {table} (date, disease_type, risk_level, provider_id, count, positive_count, sum_probability) "
+                f"VALUES {', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(batch))} "
+                f"ON CONFLICT (date, disease_type, risk_level, provider_id) DO UPDATE SET "
+                f"count = {table}.count + excluded.count, "
+                f"positive_count = {table}.positive_count + excluded.positive_count, "
+                f"sum_probability = {table}.sum_probability + excluded.sum_probability",
+                params,
+            )
+
+
+def record_predictions(predictions, provider_ids=()):
+    """
+    Add saved predictions to their rollup rows (one upsert per 100 touched rows).
+    `provider_ids`: user ids among requested_by that are providers; other
+    requesters count as patient-submitted (provider_id 0).
+    """
+    provider_ids = set(provider_ids)
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    for p in predictions:
+        key = (timezone.localdate(p.created_at), p.disease_type, p.risk_level, _provider_id(p, provider_ids))
+        row = totals[key]
+        row[0] += 1
+        row[1] += 1 if p.prediction == 1 else 0
+        row[2] += p.probability
+    _upsert(totals)
+
+
+def record_frame(frame, provider_id=0):
+    """
+    record_predictions() for rows inserted without Prediction objects (see
+    ingest.py): a DataFrame with created_at (aware), disease_type, risk_level,
+    prediction and probability columns, all submitted by `provider_id`.
+    """
+    if frame.empty:
+        return
+    days = frame["created_at"].dt.tz_convert(timezone.get_current_timezone()).dt.date
+    grouped = (
+        frame.assign(date=days, positive=frame["prediction"].eq(1))
+        .groupby(["date", "disease_type", "risk_level"])
+        .agg(count=("prediction", "size"), positive=("positive", "sum"), probability=("probability", "sum"))
+    )
+    _upsert({
+        (day, disease, risk, provider_id): [int(count), int(positive), float(probability)]
+        for (day, disease, risk), count, positive, probability in zip(
+            grouped.index, grouped["count"], grouped["positive"], grouped["probability"]
+        )
+    })
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def rebuild_days(first_day, last_day):
+    """Recompute rollups for first_day..last_day (inclusive) from raw predictions. Returns rows written."""
+    start, _ = _day_bounds(first_day)
+    _, end = _day_bounds(last_day)
+    with transaction.atomic():
+        rows = (
+            Prediction.objects.filter(created_at__gte=start, created_at__lt=end)
+            .annotate(
+                date=TruncDate("created_at"),
+                provider=Case(
+                    When(requested_by__role="provider", then=F("requested_by_id")),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                ),
+            )
+            .values("date", "disease_type", "risk_level", "provider")
+            .annotate(
+                n=Count("id"),
+                positive=Count("id", filter=Q(prediction=1)),
+                probability=Sum("probability"),
+            )
+            .order_by()
+        )
+        rollups = [
+            PredictionDailyRollup(
+                date=r["date"],
+                disease_type=r["disease_type"],
+                risk_level=r["risk_level"],
+                provider_id=r["provider"],
+                count=r["n"],
+                positive_count=r["positive"],
+                sum_probability=r["probability"] or 0.0,
+            )
+            for r in rows
+        ]
+        PredictionDailyRollup.objects.filter(date__gte=first_day, date__lte=last_day).delete()
+        PredictionDailyRollup.objects.bulk_create(rollups, batch_size=1000)
+    return len(rollups)
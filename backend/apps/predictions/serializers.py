@@ -1,4 +1,7 @@
-from rest_framework import serializers
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
 from .models import Prediction
 
@@ -16,3 +19,43 @@ class PredictionSerializer(serializers.ModelSerializer):
             "created_at",
         )
         read_only_fields = ("id", "created_at")
+
+
+# Read-only fast path for the list and detail endpoints: rows of a
+# values_list(*PREDICTION_COLUMNS) query rendered exactly as PredictionSerializer
+# renders model instances, without building instances or serializer fields per request.
+PREDICTION_COLUMNS = ("id", "patient_id", "disease_type", "prediction", "probability", "risk_level", "created_at")
+
+
+def datetime_formatter():
+    """
+    serializers.DateTimeField().to_representation for aware datetimes with the
+    current time zone looked up once instead of per value (that lookup was most
+    of the per-row cost).
+    """
+    if not settings.USE_TZ or (api_settings.DATETIME_FORMAT or "").lower() != ISO_8601:
+        return serializers.DateTimeField().to_representation
+    tz = timezone.get_current_timezone()
+
+    def to_representation(value):
+        text = value.astimezone(tz).isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+    return to_representation
+
+
+def prediction_rows(rows):
+    """PredictionSerializer(many=True).data for PREDICTION_COLUMNS rows."""
+    to_datetime = datetime_formatter()
+    return [
+        {
+            "id": id_,
+            "patient": patient_id,
+            "disease_type": disease_type,
+            "prediction": prediction,
+            "probability": probability,
+            "risk_level": risk_level,
+            "created_at": to_datetime(created_at),
+        }
+        for id_, patient_id, disease_type, prediction, probability, risk_level, created_at in rows
+    ]
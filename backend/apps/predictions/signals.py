@@ -0,0 +1,40 @@
+"""
+Signals for code that creates predictions.
+
+predictions_created is sent after predictions are saved, including after
+bulk_create (which skips post_save), with:
+  predictions   list of saved Prediction objects
+  provider_ids  user ids among their requested_by that are providers
+
+Its rollup receiver upserts once the surrounding transaction commits: every
+prediction of a day and disease adds to the same rollup row, so upserting
+inside the insert transaction would hold that row's lock until commit and
+serialize concurrent predictions. If the process dies in between, the rollups
+miss those rows until `manage.py backfill_prediction_rollups` rebuilds the day.
+
+Creating or deleting predictions also moves the admin stats version.
+"""
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from apps.accounts import stats_version
+
+predictions_created = Signal()
+
+
+@receiver(predictions_created)
+def _update_rollups(sender, predictions, provider_ids=(), **kwargs):
+    from .rollups import record_predictions
+
+    transaction.on_commit(partial(record_predictions, predictions, provider_ids))
+
+
+@receiver(predictions_created)
+@receiver(post_save, sender="predictions.Prediction")
+@receiver(post_delete, sender="predictions.Prediction")
+def _bump_stats(sender, **kwargs):
+    # post_save covers saves outside the API (admin, shell, seeders); bulk_create only sends predictions_created
+    stats_version.bump()
@@ -1,124 +1,131 @@
 import logging
 
 from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from apps.monitoring import timing
+from apps.monitoring.profiling import profiled
+from apps.patients import cache as patient_cache
 from apps.patients.models import Patient
 
 logger = logging.getLogger(__name__)
 from apps.predictions.models import Prediction
-from apps.predictions.serializers import PredictionSerializer
+from apps.predictions.serializers import PREDICTION_COLUMNS, prediction_rows
+from apps.predictions.signals import predictions_created
+from config.conditional import conditional, set_validators
+from config.routers import replica_reads
 
 
 def _get_patient_for_request(request):
     """
-    Resolve patient for the current request.
-    - If user.role == "patient": return their Patient profile.
-    - If user.role == "provider": require patient_id in request body; return that Patient.
+    Resolve the patient id for the current request.
+    - If user.role == "patient": their Patient profile id (token claim / cache, see apps.patients.cache).
+    - If user.role == "provider": require patient_id in request body; return it if that Patient exists.
     - Otherwise return None.
     """
     user = request.user
     if user.role == "patient":
-        try:
-            return Patient.objects.get(user=user)
-        except Patient.DoesNotExist:
-            return None
+        return patient_cache.patient_id_for_user(user)
     if user.role == "provider":
         patient_id = request.data.get("patient_id")
         if not patient_id:
             return None
         try:
-            return Patient.objects.get(pk=patient_id)
-        except (Patient.DoesNotExist, ValueError):
+            return Patient.objects.filter(pk=patient_id).values_list("pk", flat=True).first()
+        except (ValueError, TypeError):
             return None
     return None
 
 
-@api_view(["POST"])
-@permission_classes([IsAuthenticated])
-def predict(request, disease):
+def _save_with_patient(request, patient_id, save):
     """
-    POST /api/predict/<disease>/
-    Body: { "features": { "feature_name": value, ... }, optional "patient_id" for providers }
-    Returns: { "prediction": 0|1, "probability": float, "risk_level": str, "risk_color": str, "risk_advice": str }
-    Saves prediction to DB linked to patient.
+    Run save(patient_id) in its own transaction and return its result, or None
+    when the requesting patient no longer has a profile. A patient's id comes
+    from a per-process cache that another worker's delete cannot clear: the
+    foreign key then fails at commit, so drop the entry, look the profile up
+    again and retry once.
     """
-    from ml_models.predictor import predict_disease, SUPPORTED_DISEASES, FEATURE_ORDER
+    try:
+        with transaction.atomic(savepoint=False):
+            return save(patient_id)
+    except IntegrityError:
+        if request.user.role != "patient":
+            raise
+        patient_cache.invalidate(request.user.id)
+        fresh_id = Patient.objects.filter(user_id=request.user.id).values_list("pk", flat=True).first()
+        if fresh_id is None:
+            return None
+        if fresh_id == patient_id:
+            raise
+        patient_cache.remember(request.user.id, fresh_id)
+        with transaction.atomic(savepoint=False):
+            return save(fresh_id)
 
-    # 1. Validate disease is supported
-    disease = disease.lower().strip()
-    if disease not in SUPPORTED_DISEASES:
-        return Response(
-            {"detail": f"Unsupported disease. Supported: {SUPPORTED_DISEASES}"},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
 
-    patient = _get_patient_for_request(request)
-    if patient is None:
+def _patient_gone():
+    return Response(
+        {"detail": "Patient not found. Sign in as a patient or provide a valid patient_id (for providers)."},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+def _patient_and_features(request):
+    """
+    (patient_id, features, None) for a predict request body, or
+    (None, None, error Response) when the patient or the features dict is missing.
+    """
+    with timing.span("patient_lookup"):
+        patient_id = _get_patient_for_request(request)
+    if patient_id is None:
         if request.user.role == "provider" and not request.data.get("patient_id"):
             logger.warning(
                 "predict(): provider %s submitted without patient_id",
                 request.user.username,
             )
-            return Response(
+            return None, None, Response(
                 {
                     "error": "Providers must include patient_id in the request body.",
                     "hint": "Send { features: {...}, patient_id: '<patient_code>' } in the request.",
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        return Response(
-            {"detail": "Patient not found. Sign in as a patient or provide a valid patient_id (for providers)."},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
+        return None, None, _patient_gone()
 
-    # 2. Validate features is a dict
+    # Validate features is a dict
     features = request.data.get("features")
     if features is None:
-        return Response(
+        return None, None, Response(
             {"detail": "Request body must include 'features'."},
             status=status.HTTP_400_BAD_REQUEST,
         )
     if not isinstance(features, dict):
-        return Response(
+        return None, None, Response(
             {"detail": "'features' must be a JSON object."},
             status=status.HTTP_400_BAD_REQUEST,
         )
+    return patient_id, features, None
 
-    # 3. Explicit input validation: required fields and numeric types
-    required = FEATURE_ORDER.get(disease, [])
-    missing = [f for f in required if f not in features]
-    if missing:
-        logger.warning("predict() validation failed: missing required fields for %s: %s", disease, missing)
-        return Response(
-            {"error": f"Missing required fields for {disease} disease: {missing}"},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
-    non_numeric = []
-    for name in required:
-        val = features.get(name)
-        try:
-            float(val)
-        except (TypeError, ValueError):
-            non_numeric.append(name)
-    if non_numeric:
-        logger.warning("predict() validation failed: non-numeric fields for %s: %s", disease, non_numeric)
+
+def _prediction_error_response(disease, exc):
+    """
+    Response for an exception raised by the predictor, or None to re-raise it.
+    `disease` names the model(s) in messages.
+    """
+    from ml_models.schema import FeatureValidationError
+
+    if isinstance(exc, FeatureValidationError):
+        logger.warning("predict() validation failed for %s: %s", disease, exc.errors)
         return Response(
-            {"error": f"Fields must be numeric for {disease} disease: {non_numeric}"},
+            {"error": str(exc), "errors": exc.errors},
             status=status.HTTP_400_BAD_REQUEST,
         )
-
-    # Development debugging only
-    if settings.DEBUG:
-        logger.debug("predict() user_id=%s disease=%s features=%s", request.user.id, disease, features)
-
-    try:
-        result = predict_disease(disease, features)
-    except (ImportError, OSError) as e:
-        err_msg = str(e)
+    if isinstance(exc, (ImportError, OSError)):
+        err_msg = str(exc)
         if "DLL" in err_msg or "_distance_wrap" in err_msg or "Application Control" in err_msg:
             logger.warning("ML runtime blocked (DLL/policy): %s", err_msg)
             return Response(
@@ -128,9 +135,9 @@ def predict(request, disease):
                 },
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
-        raise
-    except ValueError as e:
-        err_msg = str(e)
+        return None
+    if isinstance(exc, ValueError):
+        err_msg = str(exc)
         if "features" in err_msg.lower() and ("expecting" in err_msg.lower() or "expected" in err_msg.lower()):
             logger.warning("Feature count mismatch for %s: %s", disease, err_msg)
             return Response(
@@ -140,41 +147,251 @@ def predict(request, disease):
                 },
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        raise
+        return None
+    logger.exception("Prediction error")
+    if settings.DEBUG:
+        return Response({"error": str(exc)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response({"error": "Prediction failed."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@profiled("predict")
+def predict(request, disease):
+    """
+    POST /api/predict/<disease>/
+    Body: { "features": { "feature_name": value, ... }, optional "patient_id" for providers,
+            optional "explain": true (or ?explain=true) }
+    Returns: { "prediction": 0|1, "probability": float, "risk_level": str, "risk_color": str, "risk_advice": str }
+    plus, when explaining, "explanation": { "base_value": float, "contributions": { feature: float } }.
+    Invalid features: 400 { "error": str, "errors": { "feature_name": [message, ...] } }.
+    Saves prediction to DB linked to patient.
+    """
+    # DRF authentication and permission checks ran before the view body
+    timing.mark("auth")
+    from ml_models.predictor import predict_disease, SUPPORTED_DISEASES
+
+    # 1. Validate disease is supported
+    disease = disease.lower().strip()
+    if disease not in SUPPORTED_DISEASES:
+        return Response(
+            {"detail": f"Unsupported disease. Supported: {SUPPORTED_DISEASES}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    # 2. Resolve the patient; features must be a dict
+    patient_id, features, error = _patient_and_features(request)
+    if error is not None:
+        return error
+
+    # Development debugging only
+    if settings.DEBUG:
+        logger.debug("predict() user_id=%s disease=%s features=%s", request.user.id, disease, features)
+
+    # 3. Features are validated (required, numeric, in range) once, by the predictor's schema
+    explain = str(request.data.get("explain", request.query_params.get("explain", ""))).lower() in ("1", "true", "yes")
+    try:
+        result = predict_disease(disease, features, explain=explain)
     except Exception as e:
-        logger.exception("Prediction error")
-        if settings.DEBUG:
-            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-        return Response({"error": "Prediction failed."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-    # 3. Save prediction result in Prediction model
-    Prediction.objects.create(
-        patient=patient,
-        disease_type=disease,
-        prediction=result["prediction"],
-        probability=result["probability"],
-        risk_level=result["risk_level"],
-    )
+        response = _prediction_error_response(disease, e)
+        if response is None:
+            raise
+        return response
+
+    # 4. Save prediction result in Prediction model (the rollup upsert runs after commit)
+    def save(patient_id):
+        prediction = Prediction.objects.create(
+            patient_id=patient_id,
+            requested_by_id=request.user.id,
+            disease_type=disease,
+            prediction=result["prediction"],
+            probability=result["probability"],
+            risk_level=result["risk_level"],
+        )
+        predictions_created.send(
+            sender=Prediction,
+            predictions=[prediction],
+            provider_ids=(request.user.id,) if request.user.role == "provider" else (),
+        )
+        return prediction
+
+    with timing.span("db_insert"):
+        if _save_with_patient(request, patient_id, save) is None:
+            return _patient_gone()
 
     return Response(result, status=status.HTTP_201_CREATED)
 
 
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+@profiled("predict")
+def predict_panel(request):
+    """
+    POST /api/predict/panel/
+    Body: { "diseases": ["heart", "hypertension", ...], "features": { union of their features },
+            optional "patient_id" for providers }
+    Returns: { "results": { disease: <predict response>, ... } }
+    One patient lookup and one validation for all diseases; the models run
+    concurrently and every prediction is saved in one bulk insert.
+    """
+    timing.mark("auth")
+    from ml_models.predictor import predict_panel as run_panel, SUPPORTED_DISEASES
+
+    diseases = request.data.get("diseases")
+    if not isinstance(diseases, list) or not diseases or not all(isinstance(d, str) for d in diseases):
+        return Response(
+            {"detail": f"'diseases' must be a non-empty list. Supported: {SUPPORTED_DISEASES}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    diseases = list(dict.fromkeys(d.lower().strip() for d in diseases))
+    unsupported = [d for d in diseases if d not in SUPPORTED_DISEASES]
+    if unsupported:
+        return Response(
+            {"detail": f"Unsupported diseases: {unsupported}. Supported: {SUPPORTED_DISEASES}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    patient_id, features, error = _patient_and_features(request)
+    if error is not None:
+        return error
+
+    try:
+        results = run_panel(diseases, features)
+    except Exception as e:
+        response = _prediction_error_response(", ".join(diseases), e)
+        if response is None:
+            raise
+        return response
+
+    def save(patient_id):
+        predictions = Prediction.objects.bulk_create([
+            Prediction(
+                patient_id=patient_id,
+                requested_by_id=request.user.id,
+                disease_type=disease,
+                prediction=result["prediction"],
+                probability=result["probability"],
+                risk_level=result["risk_level"],
+            )
+            for disease, result in results.items()
+        ])
+        predictions_created.send(
+            sender=Prediction,
+            predictions=predictions,
+            provider_ids=(request.user.id,) if request.user.role == "provider" else (),
+        )
+        return predictions
+
+    with timing.span("db_insert"):
+        if _save_with_patient(request, patient_id, save) is None:
+            return _patient_gone()
+
+    return Response({"results": results}, status=status.HTTP_201_CREATED)
+
+
+def _insights_etag(insights):
+    return f'W/"insights-{insights["disease"]}-{insights["model_sha256"][:16]}-{insights["computed_at"]}-{int(insights["stale"])}"'
+
+
+def _insights_validators(request, disease):
+    """(ETag, None) of the stored insights, already in memory after the first read."""
+    from ml_models.insights import from_labelled_data, load_insights
+    from ml_models.predictor import SUPPORTED_DISEASES
+
+    disease = disease.lower().strip()
+    insights = load_insights(disease) if disease in SUPPORTED_DISEASES else None
+    if insights is None or not from_labelled_data(insights):
+        return None
+    return _insights_etag(insights), None
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@conditional(_insights_validators)
+def model_insights(request, disease):
+    """
+    GET /api/predict/<disease>/insights/
+    Precomputed permutation importances and partial-dependence grids of the
+    disease's model (ml_models/insights.py), served from memory:
+    { "disease", "model_sha256", "computed_at", "reference", "stale",
+      "features": { name: { "importance", "importance_std", "grid", "partial_dependence" } } }
+    Features are ordered by importance; "stale" means the model changed since.
+    404 until computed on labelled rows (train_* scripts or
+    manage.py compute_model_insights --data); --synthetic results are not served.
+    """
+    from ml_models.insights import from_labelled_data, load_insights
+    from ml_models.predictor import SUPPORTED_DISEASES
+
+    disease = disease.lower().strip()
+    if disease not in SUPPORTED_DISEASES:
+        return Response(
+            {"detail": f"Unsupported disease. Supported: {SUPPORTED_DISEASES}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    insights = load_insights(disease)
+    if insights is None or not from_labelled_data(insights):
+        found = "No insights" if insights is None else f"Only {insights['reference']['source']} (unlabelled) insights"
+        return Response(
+            {"detail": f"{found} for {disease}. Run: python manage.py compute_model_insights {disease} --data <labelled.csv>"},
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    return set_validators(Response(insights), _insights_etag(insights))
+
+
+def _history_etag(patient_id, count, last_id):
+    return f'W/"history-{patient_id}-{count}-{last_id}"'
+
+
+def _history_validators(request):
+    """
+    (ETag, None) of the requested history from one aggregate over
+    pred_patient_created_idx: count and newest id catch inserts and deletes.
+    No Last-Modified: the newest created_at does not move forward on every
+    change (ingestion back-fills older rows, deleting the newest row moves it
+    back), so If-Modified-Since alone could get a wrong 304. None when there
+    is no history (the view answers the 404 / empty list).
+    """
+    user = request.user
+    if user.role == "patient":
+        patient_id = patient_cache.patient_id_for_user(user)
+    elif user.role == "provider":
+        try:
+            patient_id = int(request.query_params.get("patient_id", ""))
+        except ValueError:
+            patient_id = None
+    else:
+        patient_id = None
+    if patient_id is None:
+        return None
+    marker = Prediction.objects.filter(patient_id=patient_id).aggregate(count=Count("id"), last_id=Max("id"))
+    if not marker["count"]:
+        return None
+    return _history_etag(patient_id, marker["count"], marker["last_id"]), None
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@replica_reads
+@conditional(_history_validators)
 def prediction_list(request):
     """
     List predictions.
     - If user.role == "patient": return only their predictions.
     - If user.role == "provider": require query param patient_id; return that patient's predictions.
     - 400 if provider and patient_id missing; 404 if patient not found.
+    Carries an ETag; a matching If-None-Match gets 304 (config/conditional.py).
     """
     user = request.user
     if user.role == "patient":
-        try:
-            patient = Patient.objects.get(user=user)
-        except Patient.DoesNotExist:
-            return Response([])
-        qs = Prediction.objects.filter(patient=patient)
+        # With a cached patient id filter on it directly; otherwise join through
+        # the profile (a patient without one gets an empty list) and cache the id.
+        patient_id = patient_cache.cached_patient_id(user)
+        if patient_id is not None:
+            rows = Prediction.objects.filter(patient_id=patient_id).values_list(*PREDICTION_COLUMNS)
+        else:
+            rows = list(Prediction.objects.filter(patient__user_id=user.id).values_list(*PREDICTION_COLUMNS))
+            if rows:
+                patient_cache.remember(user.id, rows[0][1])
     elif user.role == "provider":
         patient_id = request.query_params.get("patient_id")
         if patient_id is None or patient_id == "":
@@ -183,35 +400,44 @@ def prediction_list(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         try:
-            patient = Patient.objects.get(pk=patient_id)
-        except (Patient.DoesNotExist, ValueError):
+            rows = list(Prediction.objects.filter(patient_id=patient_id).values_list(*PREDICTION_COLUMNS))
+        except ValueError:
+            rows = []
+            patient_id = None
+        # Only an empty history needs the extra existence check for the 404.
+        if not rows and (patient_id is None or not Patient.objects.filter(pk=patient_id).exists()):
             return Response(
                 {"detail": "Patient not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
-        qs = Prediction.objects.filter(patient=patient)
     else:
-        qs = Prediction.objects.none()
+        rows = []
 
-    serializer = PredictionSerializer(qs, many=True)
-    return Response(serializer.data)
+    rows = list(rows)
+    # Same JSON as PredictionSerializer(many=True), built from tuples (serializers.prediction_rows)
+    response = Response(prediction_rows(rows))
+    if rows:
+        # Same ETag as _history_validators()
+        etag = _history_etag(rows[0][1], len(rows), max(row[0] for row in rows))
+        set_validators(response, etag)
+    return response
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
+@replica_reads
 def prediction_detail(request, pk):
     """Get a single prediction by id (only if owned by current user's patient or current user is provider)."""
     user = request.user
-    try:
-        obj = Prediction.objects.get(pk=pk)
-    except Prediction.DoesNotExist:
-        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    qs = Prediction.objects.filter(pk=pk)
     if user.role == "patient":
-        try:
-            patient = Patient.objects.get(user=user)
-        except Patient.DoesNotExist:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-        if obj.patient_id != patient.id:
-            return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
-    serializer = PredictionSerializer(obj)
-    return Response(serializer.data)
+        # Ownership check in the same query
+        patient_id = patient_cache.cached_patient_id(user)
+        if patient_id is not None:
+            qs = qs.filter(patient_id=patient_id)
+        else:
+            qs = qs.filter(patient__user_id=user.id)
+    row = qs.values_list(*PREDICTION_COLUMNS).first()
+    if row is None:
+        return Response({"detail": "Not found."}, status=status.HTTP_404_NOT_FOUND)
+    return Response(prediction_rows([row])[0])
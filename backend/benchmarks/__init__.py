@@ -0,0 +1,48 @@
+"""
+Standalone performance benchmarks. Each module is runnable from backend/:
+  python -m benchmarks.<name> --help
+
+Benchmarks that need a database run against a throwaway test database
+(created from the configured DATABASE_URL / POSTGRES_* settings and dropped
+afterwards), so they never touch real data.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    """Configure Django settings for a benchmark process."""
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database(keepdb=False):
+    """Create (and migrate) the test database for the default alias; drop it on exit."""
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def timed(fn, repeat):
+    """Run fn() `repeat` times; return (mean_seconds, best_seconds)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return sum(samples) / len(samples), min(samples)
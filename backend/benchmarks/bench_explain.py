@@ -0,0 +1,65 @@
+"""
+Benchmark the latency of predict_disease(..., explain=True) (decision path
+contributions, ml_models/explain.py) against plain inference.
+
+Scores random valid feature rows for each disease with and without the
+explanation (no database; models are loaded and the tree tables built before
+timing) and reports the median per call and the ratio. Exits with status 1 when
+the explained call is slower than --max-ratio times the plain one.
+
+Run from backend/:
+  python -m benchmarks.bench_explain
+  python -m benchmarks.bench_explain --diseases heart stroke --calls 500 --max-ratio 1.5
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+
+from benchmarks import setup_django
+
+
+def median_call(fn, inputs):
+    samples = []
+    for features in inputs:
+        start = time.perf_counter()
+        fn(features)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--diseases", nargs="+")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--max-ratio", type=float, default=2.0)
+    args = parser.parse_args()
+
+    setup_django()
+    from ml_models.explain import tables_for
+    from ml_models.model_loader import get_model
+    from ml_models.predictor import SUPPORTED_DISEASES, predict_disease
+    from ml_models.samples import random_features
+
+    rng = random.Random(7)
+    failures = []
+    print(f"{'disease':>12} {'plain':>9} {'explain':>9} {'x':>5}")
+    for disease in args.diseases or SUPPORTED_DISEASES:
+        tables_for(get_model(disease))
+        inputs = [random_features(disease, rng) for _ in range(args.calls)]
+        predict_disease(disease, inputs[0], explain=True)
+        plain = median_call(lambda f: predict_disease(disease, f), inputs)
+        explained = median_call(lambda f: predict_disease(disease, f, explain=True), inputs)
+        ratio = explained / plain
+        print(f"{disease:>12} {plain * 1000:>7.2f}ms {explained * 1000:>7.2f}ms {ratio:>5.2f}")
+        if ratio > args.max_ratio:
+            failures.append(f"{disease}: explain is {ratio:.2f}x plain inference (max {args.max_ratio}x)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
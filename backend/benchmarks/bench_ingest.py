@@ -0,0 +1,110 @@
+"""
+Benchmark `manage.py ingest_predictions` (apps/predictions/ingest.py).
+
+Writes a CSV of random in-range vitals (ml_models.samples ranges) for seeded
+patients, then ingests it and reports rows/s for CSV parsing and vectorized
+scoring of one chunk, and for ingest_csv() end to end (parsing, scoring, the
+direct COPY / multi-row INSERT of the rows and the rollup upsert). As a
+baseline it also scores a sample row by row with predict_disease(), which is
+what one POST /api/predict/ per row would cost in model time alone. With
+--min-rate it exits with status 1 when the end-to-end rate is lower; there is
+no default threshold, as the rate depends on the machine and database (200k
+heart rows on one core with SQLite: about 64-71k rows/s over three runs).
+
+Run from backend/:
+  python -m benchmarks.bench_ingest                          # 200k heart rows
+  python -m benchmarks.bench_ingest --disease diabetes --rows 1000000 --chunk-size 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import setup_django, test_database
+
+
+def write_csv(path, disease, rows, patient_ids, seed=7):
+    from ml_models.samples import DISEASE_RANGES
+
+    rng = np.random.default_rng(seed)
+    columns = {"patient_id": rng.choice(patient_ids, size=rows)}
+    for name, (lo, hi) in DISEASE_RANGES[disease].items():
+        if isinstance(lo, int) and isinstance(hi, int):
+            columns[name] = rng.integers(lo, hi + 1, size=rows)
+        else:
+            columns[name] = rng.uniform(lo, hi, size=rows).round(2)
+    # Spread over the last year, as a clinic's history would be
+    columns["created_at"] = (
+        pd.Timestamp.now(tz="UTC") - pd.to_timedelta(rng.integers(0, 365 * 86400, size=rows), unit="s")
+    ).strftime("%Y-%m-%dT%H:%M:%S+00:00")
+    pd.DataFrame(columns).to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--disease", default="heart")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--patients", type=int, default=1000)
+    parser.add_argument("--chunk-size", type=int, default=50_000)
+    parser.add_argument("--baseline-rows", type=int, default=500, help="Rows scored one by one for comparison.")
+    parser.add_argument("--min-rate", type=float, default=0, help="End-to-end rows/s to require (0: report only).")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+
+    from apps.patients.models import Patient
+    from apps.predictions import ingest
+    from apps.predictions.models import Prediction
+    from ml_models.columns import normalize_columns
+    from ml_models.predictor import FEATURE_ORDER, predict_disease, predict_frame
+
+    User = get_user_model()
+    with test_database(), tempfile.TemporaryDirectory() as tmp:
+        print(f"Seeding {args.patients:,} patients ({connection.vendor})...")
+        users = User.objects.bulk_create(
+            [User(username=f"ingest{i}", role="patient", password="!") for i in range(args.patients)]
+        )
+        patients = Patient.objects.bulk_create([Patient(user=u) for u in users])
+        path = os.path.join(tmp, f"{args.disease}.csv")
+        write_csv(path, args.disease, args.rows, [p.id for p in patients])
+        print(f"Wrote {args.rows:,} rows ({os.path.getsize(path) / 1e6:.1f} MB)")
+
+        # Stage timings on the first chunk
+        start = time.perf_counter()
+        chunk = normalize_columns(pd.read_csv(path, nrows=args.chunk_size))
+        parse = time.perf_counter() - start
+        start = time.perf_counter()
+        predict_frame(args.disease, chunk[FEATURE_ORDER[args.disease]])
+        score = time.perf_counter() - start
+        print(f"\nPer {len(chunk):,}-row chunk:")
+        print(f"  read_csv + normalize   {len(chunk) / parse:>12,.0f} rows/s")
+        print(f"  predict_frame          {len(chunk) / score:>12,.0f} rows/s")
+
+        result = ingest.ingest_csv(args.disease, path, chunk_size=args.chunk_size)
+        assert Prediction.objects.count() == result.created
+        print(f"\ningest_csv end to end ({result.created:,} saved, {result.rejected:,} rejected)")
+        print(f"  {result.seconds:.2f} s   {result.rows_per_second:>12,.0f} rows/s")
+
+        sample = chunk[FEATURE_ORDER[args.disease]].head(args.baseline_rows).to_dict("records")
+        start = time.perf_counter()
+        for features in sample:
+            predict_disease(args.disease, features)
+        single = time.perf_counter() - start
+        print(f"\npredict_disease() row by row (model time only, no HTTP or DB)")
+        print(f"  {len(sample) / single:>12,.0f} rows/s")
+
+    if result.rows_per_second < args.min_rate:
+        print(f"FAIL: ingest_csv ran at {result.rows_per_second:,.0f} rows/s, under {args.min_rate:,.0f}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    random.seed(7)
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark API JSON rendering and parsing: DRF's stdlib JSONRenderer/JSONParser
+against config.renderers (orjson), on prediction history payloads.
+
+Builds N Prediction objects in memory (no database), serializes them with
+PredictionSerializer (the JSON GET /api/predictions/ returns), then renders it with
+each renderer and parses it back. Reports payload size (raw and gzipped; the
+two renderers emit the same bytes, which is checked) and the time per payload.
+
+Run from backend/:
+  python -m benchmarks.bench_json                       # 1k, 10k, 100k predictions
+  python -m benchmarks.bench_json --sizes 1000 50000 --repeat 10
+"""
+import argparse
+import gzip
+import io
+import random
+from datetime import timedelta
+
+from benchmarks import setup_django, timed
+
+
+def build_payload(n, seed=7):
+    from django.utils import timezone
+
+    from apps.predictions.models import Prediction
+    from apps.predictions.serializers import PredictionSerializer
+    from ml_models.predictor import RISK_LEVELS, SUPPORTED_DISEASES
+
+    rng = random.Random(seed)
+    now = timezone.now()
+    predictions = [
+        Prediction(
+            id=i + 1,
+            patient_id=rng.randint(1, 5000),
+            disease_type=rng.choice(SUPPORTED_DISEASES),
+            prediction=rng.randint(0, 1),
+            probability=round(rng.random(), 4),
+            risk_level=rng.choice(RISK_LEVELS),
+            created_at=now - timedelta(seconds=rng.randint(0, 365 * 86400), microseconds=rng.randint(0, 999999)),
+        )
+        for i in range(n)
+    ]
+    return PredictionSerializer(predictions, many=True).data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from config.renderers import ORJSONParser, ORJSONRenderer
+
+    print(f"{'predictions':>11} {'bytes':>12} {'gzip':>11}   {'render json':>11} {'orjson':>9} {'x':>5}"
+          f"   {'parse json':>10} {'orjson':>9} {'x':>5}")
+    for n in args.sizes:
+        data = build_payload(n)
+        body = JSONRenderer().render(data)
+        assert ORJSONRenderer().render(data) == body, "renderers disagree"
+        size, packed = len(body), len(gzip.compress(body, 6))
+
+        render_std, _ = timed(lambda: JSONRenderer().render(data), args.repeat)
+        render_fast, _ = timed(lambda: ORJSONRenderer().render(data), args.repeat)
+        parse_std, _ = timed(lambda: JSONParser().parse(io.BytesIO(body)), args.repeat)
+        parse_fast, _ = timed(lambda: ORJSONParser().parse(io.BytesIO(body)), args.repeat)
+        print(
+            f"{n:>11,} {size:>12,} {packed:>11,}   {render_std * 1000:>9.1f}ms {render_fast * 1000:>7.1f}ms "
+            f"{render_std / render_fast:>5.1f}   {parse_std * 1000:>8.1f}ms {parse_fast * 1000:>7.1f}ms "
+            f"{parse_std / parse_fast:>5.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
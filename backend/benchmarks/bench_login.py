@@ -0,0 +1,110 @@
+"""
+Benchmark login credential resolution over a large user table.
+
+Compares the legacy login lookups (email filter, then provider license filter,
+then authenticate() fetching by username again) with CredentialBackend's single
+query, with and without the Lower() indexes from accounts migration 0002.
+Password hashing is excluded: it costs the same on both paths.
+
+Run from backend/:
+  python -m benchmarks.bench_login                  # 1M users
+  python -m benchmarks.bench_login --users 100000 --lookups 500
+"""
+import argparse
+import random
+
+from benchmarks import setup_django, test_database, timed
+
+
+def legacy_resolve(User, identifier):
+    """The lookups login() did before CredentialBackend (3 queries worst case)."""
+    user = User.objects.filter(email=identifier).first()
+    if user:
+        identifier = user.username
+    else:
+        user = User.objects.filter(medical_license=identifier, role="provider").first()
+        if user:
+            identifier = user.username
+    return User.objects.filter(username=identifier).first()
+
+
+def seed_users(User, n, batch_size=20000):
+    from django.contrib.auth.hashers import make_password
+
+    password = make_password("bench-pass-123")
+    for start in range(0, n, batch_size):
+        rows = []
+        for i in range(start, min(n, start + batch_size)):
+            provider = i % 10 == 0
+            rows.append(User(
+                username=f"user{i}",
+                email=f"User{i}@Bench.Example",
+                role="provider" if provider else "patient",
+                medical_license=f"LIC-{i:07d}" if provider else None,
+                password=password,
+            ))
+        User.objects.bulk_create(rows, batch_size=batch_size)
+        print(f"  {min(n, start + batch_size):>9,} users", end="\r", flush=True)
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=300, help="Lookups per identifier kind.")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from apps.accounts.backends import CredentialBackend
+
+    User = get_user_model()
+    backend = CredentialBackend()
+    rng = random.Random(7)
+
+    with test_database():
+        print(f"Seeding {args.users:,} users ({connection.vendor})...")
+        seed_users(User, args.users)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        n = args.users
+        kinds = {
+            "username": [f"user{rng.randrange(n)}" for _ in range(args.lookups)],
+            # Legacy lookup is case-sensitive, so feed it the stored spelling
+            "email": [f"User{rng.randrange(n)}@Bench.Example" for _ in range(args.lookups)],
+            "license": [f"LIC-{rng.randrange(0, n, 10):07d}" for _ in range(args.lookups)],
+            "unknown": [f"nobody{i}@nowhere.example" for i in range(args.lookups)],
+        }
+
+        def run(label, resolve):
+            print(f"\n{label}")
+            for kind, idents in kinds.items():
+                with CaptureQueriesContext(connection) as ctx:
+                    for ident in idents:
+                        resolve(ident)
+                mean, _ = timed(lambda: [resolve(ident) for ident in idents], 1)
+                print(
+                    f"  {kind:<9} {mean / len(idents) * 1e6:10.1f} us/lookup"
+                    f"   {len(ctx.captured_queries) / len(idents):.1f} queries/lookup"
+                )
+
+        indexes = [idx for idx in User._meta.indexes]
+        with connection.schema_editor() as editor:
+            for idx in indexes:
+                editor.remove_index(User, idx)
+        run("Legacy lookups, no email/license indexes (before migration 0002)", lambda i: legacy_resolve(User, i))
+        run("CredentialBackend, no email/license indexes", backend.resolve_user)
+        with connection.schema_editor() as editor:
+            for idx in indexes:
+                editor.add_index(User, idx)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        run("CredentialBackend with Lower() indexes (after migration 0002)", backend.resolve_user)
+
+
+if __name__ == "__main__":
+    main()
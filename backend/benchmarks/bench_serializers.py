@@ -0,0 +1,77 @@
+"""
+Benchmark the prediction history read path: PredictionSerializer over model
+instances (the previous GET /api/predictions/) against values_list() rows
+mapped by apps.predictions.serializers.prediction_rows (the current one).
+
+Seeds one patient with N predictions in a throwaway test database and times
+query + serialization for each path (rendering is excluded; both produce the
+same JSON, which is checked).
+
+Run from backend/:
+  python -m benchmarks.bench_serializers                  # 1k, 10k, 100k rows
+  python -m benchmarks.bench_serializers --sizes 5000 --repeat 10
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from benchmarks import setup_django, test_database, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.utils import timezone
+    from rest_framework.renderers import JSONRenderer
+
+    from apps.patients.models import Patient
+    from apps.predictions.models import Prediction
+    from apps.predictions.serializers import PREDICTION_COLUMNS, PredictionSerializer, prediction_rows
+    from ml_models.predictor import RISK_LEVELS, SUPPORTED_DISEASES
+
+    User = get_user_model()
+    rng = random.Random(7)
+    with test_database():
+        print(f"Database: {connection.vendor}")
+        print(f"{'rows':>9} {'ModelSerializer':>16} {'values rows':>12} {'rows/s before':>14} {'rows/s after':>13} {'x':>5}")
+        for n in args.sizes:
+            user = User.objects.create_user(username=f"bench{n}", password="!", role="patient")
+            patient = Patient.objects.create(user=user)
+            now = timezone.now()
+            Prediction.objects.bulk_create(
+                [
+                    Prediction(
+                        patient=patient,
+                        disease_type=rng.choice(SUPPORTED_DISEASES),
+                        prediction=rng.randint(0, 1),
+                        probability=round(rng.random(), 4),
+                        risk_level=rng.choice(RISK_LEVELS),
+                        created_at=now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+                    )
+                    for _ in range(n)
+                ],
+                batch_size=5000,
+            )
+            history = Prediction.objects.filter(patient_id=patient.id)
+
+            def before():
+                return PredictionSerializer(list(history), many=True).data
+
+            def after():
+                return prediction_rows(history.values_list(*PREDICTION_COLUMNS))
+
+            assert JSONRenderer().render(before()) == JSONRenderer().render(after()), "outputs differ"
+            slow, _ = timed(before, args.repeat)
+            fast, _ = timed(after, args.repeat)
+            print(f"{n:>9,} {slow * 1000:>14.1f}ms {fast * 1000:>10.1f}ms {n / slow:>14,.0f} {n / fast:>13,.0f} "
+                  f"{slow / fast:>5.1f}")
+
+
+if __name__ == "__main__":
+    main()
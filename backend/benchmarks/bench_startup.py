@@ -0,0 +1,112 @@
+"""
+Benchmark cold start: `manage.py check` and importing the WSGI app, each in a
+fresh interpreter under `python -X importtime`.
+
+For every target reports the median wall time over --repeat runs, the import
+time Python itself accounts for, the packages that import time goes to and
+whether the heavy ML stack (pandas, scikit-learn, joblib, scipy) was imported. Exits with
+status 1 when a target's median goes over its budget, or when `check` / `wsgi`
+import the ML stack, which only inference or the model preload
+(ml_models.model_loader.preload, target `wsgi+models`) should pay for.
+
+Run from backend/:
+  python -m benchmarks.bench_startup
+  python -m benchmarks.bench_startup --repeat 10 --budget check=1.5 --budget wsgi=1.5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from benchmarks import BACKEND_DIR
+
+ML_STACK = ("pandas", "sklearn", "joblib", "scipy")
+
+# name -> (argv after `python -X importtime`, extra environment, ML stack allowed)
+TARGETS = {
+    "check": (["manage.py", "check"], {}, False),
+    "wsgi": (["-c", "import config.wsgi"], {"ML_MODEL_PRELOAD": "False"}, False),
+    "wsgi+models": (["-c", "import config.wsgi"], {"ML_MODEL_PRELOAD": "True"}, True),
+}
+DEFAULT_BUDGETS = {"check": 1.5, "wsgi": 1.5, "wsgi+models": 5.0}
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        head, cumulative_us, name = line.split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(head[len("import time:"):]), int(cumulative_us), depth))
+    return rows
+
+
+def run(target, repeat):
+    argv, extra_env, _ = TARGETS[target]
+    env = {**os.environ, "DJANGO_SETTINGS_MODULE": "config.settings", **extra_env}
+    walls, rows = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", *argv], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+        )
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            sys.exit(f"{target} failed:\n{proc.stderr[-2000:]}")
+        rows = parse_importtime(proc.stderr)
+    return statistics.median(walls), rows
+
+
+def parse_budgets(values):
+    budgets = dict(DEFAULT_BUDGETS)
+    for value in values:
+        name, _, seconds = value.partition("=")
+        if name not in TARGETS or not seconds:
+            raise argparse.ArgumentTypeError(f"--budget expects one of {', '.join(TARGETS)}=<seconds>, got {value!r}")
+        budgets[name] = float(seconds)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest packages to list per target.")
+    parser.add_argument("--budget", action="append", default=[], metavar="TARGET=SECONDS",
+                        help=f"Median wall-time budget (defaults: {DEFAULT_BUDGETS}).")
+    args = parser.parse_args()
+    try:
+        budgets = parse_budgets(args.budget)
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+
+    failures = []
+    for target in args.targets:
+        wall, rows = run(target, args.repeat)
+        packages = Counter()
+        for name, self_us, _, _ in rows:
+            packages[name.split(".", 1)[0]] += self_us
+        ml_loaded = [m for m in ML_STACK if m in packages]
+        budget = budgets[target]
+        print(f"{target}: {wall:.2f}s median wall (budget {budget:.2f}s), "
+              f"{sum(packages.values()) / 1e6:.2f}s in imports, {len(rows)} modules, "
+              f"ML stack: {', '.join(ml_loaded) or 'not loaded'}")
+        for package, self_us in packages.most_common(args.top):
+            print(f"  {self_us / 1000:>9.1f}ms  {package}")
+        if wall > budget:
+            failures.append(f"{target} took {wall:.2f}s, over its {budget:.2f}s budget")
+        if ml_loaded and not TARGETS[target][2]:
+            failures.append(f"{target} imported {', '.join(ml_loaded)}; keep them behind the first inference")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,3 +8,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_asgi_application()
+
+# Only serving processes preload the models (see ml_models.model_loader.preload)
+from ml_models.model_loader import preload  # noqa: E402
+
+preload()
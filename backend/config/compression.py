@@ -0,0 +1,230 @@
+"""
+Response compression for API payloads (gzip, or brotli when installed).
+
+CompressionMiddleware negotiates Accept-Encoding (q-values honoured; br is
+preferred over gzip at equal q when the brotli package is importable) and
+compresses text-like bodies: JSON, text/*, JavaScript, XML, CSV. It leaves
+alone bodies under COMPRESSION_MIN_BYTES (framing costs more than it saves),
+anything that already has a Content-Encoding (WhiteNoise's precompressed
+static files, .gz downloads), bodiless statuses and the secret-bearing
+COMPRESSION_EXEMPT_PATHS (secrets next to user-chosen input in a compressed
+body are what BREACH needs): by default /api/auth/, which issues tokens, and
+/api/admin/patients/import/, whose invite uid/token pairs sit next to the
+usernames and emails copied from the uploaded CSV.
+
+Streaming responses are compressed chunk by chunk with a sync flush after
+each chunk, so clients still receive rows as they are produced. Bytes in/out,
+the per-response ratio and the CPU time spent compressing are recorded in
+apps.monitoring.metrics.
+"""
+import time
+import zlib
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+from apps.monitoring import metrics
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "image/svg+xml",
+)
+_NO_BODY_STATUSES = (204, 304)
+
+
+def _compressible(content_type):
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return (
+        media_type.startswith("text/")
+        or media_type in COMPRESSIBLE_TYPES
+        or media_type.endswith(("+json", "+xml"))
+    )
+
+
+def negotiate(accept_encoding, available):
+    """
+    The coding from `available` (in server preference order) the client rates
+    highest in its Accept-Encoding header, or None (identity).
+    """
+    ratings = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        ratings[coding] = q
+    best, best_q = None, 0.0
+    for coding in available:
+        q = ratings.get(coding, ratings.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _Gzip:
+    name = "gzip"
+
+    def __init__(self):
+        # wbits=31: gzip container, mtime 0
+        self._z = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._z.compress(data)
+
+    def flush(self):
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._z.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    name = "br"
+
+    def __init__(self):
+        self._b = brotli.Compressor(mode=brotli.MODE_TEXT, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._b.process(data)
+
+    def flush(self):
+        return self._b.flush()
+
+    def finish(self):
+        return self._b.finish()
+
+
+CODERS = {"br": _Brotli, "gzip": _Gzip} if brotli is not None else {"gzip": _Gzip}
+
+
+def _record(encoding, size_in, size_out, cpu):
+    metrics.COMPRESSION_BYTES.inc(size_in, encoding=encoding, direction="in")
+    metrics.COMPRESSION_BYTES.inc(size_out, encoding=encoding, direction="out")
+    metrics.COMPRESSION_CPU.observe(cpu, encoding=encoding)
+    if size_in:
+        metrics.COMPRESSION_RATIO.observe(size_out / size_in, encoding=encoding)
+
+
+class _StreamStats:
+    def __init__(self, coder):
+        self.coder = coder
+        self.size_in = self.size_out = 0
+        self.cpu = 0.0
+
+    def step(self, chunk=None):
+        start = time.thread_time()
+        if chunk is None:
+            out = self.coder.finish()
+        else:
+            out = self.coder.compress(chunk) + self.coder.flush()
+            self.size_in += len(chunk)
+        self.cpu += time.thread_time() - start
+        self.size_out += len(out)
+        return out
+
+    def done(self):
+        _record(self.coder.name, self.size_in, self.size_out, self.cpu)
+
+
+def _compress_stream(chunks, coder):
+    stats = _StreamStats(coder)
+    try:
+        for chunk in chunks:
+            if chunk:
+                out = stats.step(chunk)
+                if out:
+                    yield out
+        yield stats.step()
+    finally:
+        stats.done()
+
+
+async def _acompress_stream(chunks, coder):
+    stats = _StreamStats(coder)
+    try:
+        async for chunk in chunks:
+            if chunk:
+                out = stats.step(chunk)
+                if out:
+                    yield out
+        yield stats.step()
+    finally:
+        stats.done()
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies the client accepts (see module docstring).
+    Removed from the stack when settings.COMPRESSION_ENABLED is False.
+    Place it above any middleware that reads or rewrites the body.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "COMPRESSION_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.min_bytes = settings.COMPRESSION_MIN_BYTES
+        self.exempt_paths = tuple(settings.COMPRESSION_EXEMPT_PATHS)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.status_code in _NO_BODY_STATUSES
+            or response.has_header("Content-Encoding")
+            or not _compressible(response.get("Content-Type", ""))
+            or request.path.startswith(self.exempt_paths)
+        ):
+            return response
+        if not response.streaming and len(response.content) < self.min_bytes:
+            metrics.COMPRESSION_SKIPPED.inc(reason="small")
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""), CODERS)
+        if encoding is None:
+            metrics.COMPRESSION_SKIPPED.inc(reason="not_accepted")
+            return response
+        coder = CODERS[encoding]()
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _acompress_stream(response.streaming_content, coder)
+            else:
+                response.streaming_content = _compress_stream(response.streaming_content, coder)
+            # Compressed size is only known once the stream ends
+            del response.headers["Content-Length"]
+        else:
+            content = response.content
+            start = time.thread_time()
+            compressed = coder.compress(content) + coder.finish()
+            cpu = time.thread_time() - start
+            if len(compressed) >= len(content):
+                metrics.COMPRESSION_SKIPPED.inc(reason="no_gain")
+                return response
+            _record(encoding, len(content), len(compressed), cpu)
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag promises byte-identical bodies; the encoded one is not (RFC 9110 8.8.1)
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
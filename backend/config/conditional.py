@@ -0,0 +1,65 @@
+"""
+HTTP conditional GETs (ETag / Last-Modified) for dashboard reads that rarely change.
+
+@conditional(validators) goes below @api_view. When a GET carries
+If-None-Match or If-Modified-Since, validators(request, *args, **kwargs) is
+asked for the resource's current (etag, last_modified) from a cheap marker
+(an aggregate over an index, a cache key) and a match is answered 304 before
+the view queries or serializes anything. Views put the same validators on
+their 200 responses with set_validators(), computed from the data they
+already fetched, so unconditional requests cost nothing extra.
+
+Responses are marked private, no-cache (browsers keep them but revalidate
+every time) and vary on the credentials, since the same URL differs per user.
+"""
+from functools import wraps
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+
+def _finish(response, etag, last_modified):
+    if etag:
+        response["ETag"] = quote_etag(etag)
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ("Authorization", "Cookie"))
+    return response
+
+
+def set_validators(response, etag, last_modified=None):
+    """Add ETag (a weak W/"..." tag) / Last-Modified (aware datetime) to a 200 response."""
+    if response.status_code == 200:
+        _finish(response, etag, last_modified)
+    return response
+
+
+def conditional(validators):
+    """
+    Answer conditional GET/HEAD requests with 304 when validators() matches.
+    validators returns (etag, last_modified) or None when the view should run
+    (e.g. to produce its 400/404).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in ("GET", "HEAD") and (
+                "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+            ):
+                current = validators(request, *args, **kwargs)
+                if current is not None:
+                    etag, last_modified = current
+                    response = get_conditional_response(
+                        request,
+                        etag=quote_etag(etag) if etag else None,
+                        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+                    )
+                    if response is not None:
+                        return _finish(response, etag, last_modified)
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,82 @@
+"""
+orjson-backed JSON renderer and parser for DRF (REST_FRAMEWORK settings).
+
+Output matches rest_framework.renderers.JSONRenderer with the default
+settings: compact UTF-8, aware UTC datetimes end in "Z", Decimals render as
+numbers, U+2028/U+2029 are escaped. Types orjson does not know (Decimal,
+timedelta, lazy strings, querysets, ...) go through DRF's own JSONEncoder.
+Payloads orjson cannot encode as DRF does fall back to JSONRenderer: integers
+wider than 64 bits (orjson refuses them) and NaN or infinite floats (orjson
+writes null; DRF's strict JSON raises ValueError). The output is still not
+byte-identical for floats Python writes with an exponent: JSONRenderer gives
+1e+16 and 1e-05 where orjson gives 1e16 and 0.00001. Both parse to the same
+value. Without orjson installed, or when a client asks for indented output or
+a non-UTF-8 charset, both classes fall back to the stdlib implementation.
+"""
+import math
+
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+if orjson is not None:
+    OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+_default = JSONEncoder().default
+
+
+def _has_non_finite(data):
+    """True if a NaN or infinite float is nested anywhere in dicts, lists and tuples."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif hasattr(value, "tolist"):
+            # numpy arrays (OPT_SERIALIZE_NUMPY)
+            stack.append(value.tolist())
+    return False
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        try:
+            ret = orjson.dumps(data, default=_default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            # e.g. an integer wider than 64 bits
+            return super().render(data, accepted_media_type, renderer_context)
+        # orjson writes NaN and infinities as null; let JSONRenderer reject them
+        if b"null" in ret and _has_non_finite(data):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Valid JSON but not valid JavaScript; JSONRenderer escapes them too
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", "utf-8")
+        if orjson is None or encoding.lower().replace("_", "-") not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,112 @@
+"""
+Read-replica routing.
+
+Views decorated with @replica_reads send their ORM reads to one of
+settings.DATABASE_REPLICAS (chosen at random per request); every other read and
+all writes stay on "default". A user who wrote recently is pinned to the primary
+for REPLICA_PIN_SECONDS so they read their own writes: ReplicaPinMiddleware
+notes writes made during a request and stores the pin in the Django cache
+(shared between workers only if CACHES is: see REDIS_URL and the accounts.W001
+system check). With no replicas configured the router, decorator and middleware
+are all no-ops.
+"""
+import functools
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+
+_PIN_KEY = "db-pin:{}"
+
+# Per-request routing state: {"replica": alias or None, "wrote": bool}
+_routing = ContextVar("db_routing", default=None)
+
+
+def _pinned(user):
+    return bool(user and user.is_authenticated and cache.get(_PIN_KEY.format(user.pk)))
+
+
+def pin_to_primary(user):
+    """Route `user`'s @replica_reads requests to the primary for REPLICA_PIN_SECONDS."""
+    seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+    if seconds > 0:
+        cache.set(_PIN_KEY.format(user.pk), 1, timeout=seconds)
+
+
+class ReplicaRouter:
+    """Database router: reads on a replica inside @replica_reads views, everything else on default."""
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is not None and state["replica"]:
+            return state["replica"]
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state["wrote"] = True
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+def replica_reads(view):
+    """
+    Decorator for read-only DRF function views (apply under @api_view): run the
+    view's queries against a replica unless the user is pinned to the primary.
+    """
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        if not replicas or _pinned(getattr(request, "user", None)):
+            return view(request, *args, **kwargs)
+        state = _routing.get()
+        token = None
+        if state is None:
+            # Outside ReplicaPinMiddleware (e.g. called directly)
+            state = {"replica": None, "wrote": False}
+            token = _routing.set(state)
+        previous = state["replica"]
+        state["replica"] = random.choice(replicas)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            state["replica"] = previous
+            if token is not None:
+                _routing.reset(token)
+
+    return wrapper
+
+
+class ReplicaPinMiddleware:
+    """
+    Track ORM writes per request and pin the writing user to the primary.
+    Removed from the stack unless settings.DATABASE_REPLICAS is non-empty.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "DATABASE_REPLICAS", []):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = {"replica": None, "wrote": False}
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        # DRF sets request.user on the underlying HttpRequest once it authenticates
+        user = getattr(request, "user", None)
+        if state["wrote"] and user is not None and user.is_authenticated:
+            pin_to_primary(user)
+        return response
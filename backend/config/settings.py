@@ -49,18 +49,27 @@ INSTALLED_APPS = [
     "apps.accounts",
     "apps.patients",
     "apps.predictions",
+    "apps.monitoring",
 ]
 
 MIDDLEWARE = [
+    # First, so request latency and SQL counts cover the whole stack
+    "apps.monitoring.middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # moved here
+    # Below WhiteNoise (static files are precompressed), above anything touching the body
+    "config.compression.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # Pins users who wrote to the primary for replica reads (no-op without replicas)
+    "config.routers.ReplicaPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    # Last, so its "auth" stage covers only DRF dispatch (no-op unless PREDICT_TIMING)
+    "apps.monitoring.middleware.TimingMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -98,6 +107,8 @@ CORS_ALLOWED_ORIGINS = os.environ.get(
 # Custom User Model
 # -----------------------------------------------------------------------------
 AUTH_USER_MODEL = "accounts.User"
+# Login by username, email or provider medical license in one indexed query
+AUTHENTICATION_BACKENDS = ["apps.accounts.backends.CredentialBackend"]
 
 # -----------------------------------------------------------------------------
 # Password validation & Auth
@@ -125,42 +136,188 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # -----------------------------------------------------------------------------
 # Django REST Framework
 # -----------------------------------------------------------------------------
+# JWT auth honours logout / role-change revocations (apps/accounts/authentication.py);
+# JWT_STATELESS builds request.user from token claims, skipping the per-request User query.
+JWT_STATELESS = os.environ.get("JWT_STATELESS", "False") == "True"
+JWT_REVOCATION_CACHE = os.environ.get("JWT_REVOCATION_CACHE", "default")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.accounts.authentication.ClaimsJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # orjson in place of the stdlib json module; same output (config/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": [
+        "config.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "config.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
 }
 CORS_ALLOW_CREDENTIALS = True
 
+# Response compression (config/compression.py): gzip, or brotli when installed
+# (pip install brotli). Bodies under COMPRESSION_MIN_BYTES and the secret-bearing
+# COMPRESSION_EXEMPT_PATHS (BREACH) go out as they are: auth tokens, and the
+# patient import's invite uid/token pairs next to usernames from the upload.
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION_ENABLED", "True") == "True"
+COMPRESSION_MIN_BYTES = int(os.environ.get("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.environ.get("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_EXEMPT_PATHS = os.environ.get(
+    "COMPRESSION_EXEMPT_PATHS", "/api/auth/,/api/admin/patients/import/"
+).split(",")
+
+# -----------------------------------------------------------------------------
+# Monitoring
+# -----------------------------------------------------------------------------
+# Per-stage timing of the predict path (Server-Timing header + /api/monitoring/timing/)
+PREDICT_TIMING = os.environ.get("PREDICT_TIMING", "False") == "True"
+# Prometheus /metrics: under gunicorn set a writable dir so all workers are aggregated
+METRICS_MULTIPROC_DIR = os.environ.get("METRICS_MULTIPROC_DIR", "")
+METRICS_FLUSH_INTERVAL = float(os.environ.get("METRICS_FLUSH_INTERVAL", "1.0"))
+# /metrics requires "Authorization: Bearer <METRICS_AUTH_TOKEN>"; without a token it
+# is refused unless METRICS_PUBLIC (default: DEBUG), e.g. on a private scrape network
+METRICS_AUTH_TOKEN = os.environ.get("METRICS_AUTH_TOKEN", "")
+METRICS_PUBLIC = os.environ.get("METRICS_PUBLIC", str(DEBUG)) == "True"
+# Opt-in cProfile capture of predict requests (see apps/monitoring/profiling.py)
+PROFILING_ENABLED = os.environ.get("PROFILING_ENABLED", "False") == "True"
+PROFILING_SAMPLE_RATE = float(os.environ.get("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_HEADER_SECRET = os.environ.get("PROFILING_HEADER_SECRET", "")
+PROFILING_DIR = Path(os.environ.get("PROFILING_DIR", BASE_DIR / "profiles"))
+PROFILING_MAX_FILES = int(os.environ.get("PROFILING_MAX_FILES", "50"))
+
 # -----------------------------------------------------------------------------
 # Database (supports DATABASE_URL and legacy POSTGRES_* vars)
 # -----------------------------------------------------------------------------
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
+# Connection reuse, applied to both branches below. By default each worker thread
+# keeps its connection for DB_CONN_MAX_AGE seconds (0 = reconnect per request) and
+# health-checks it before reuse. DB_POOL=True switches Postgres to Django's built-in
+# pool (needs psycopg 3 with psycopg_pool: pip install "psycopg[binary,pool]").
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", "600"))
+DB_CONN_HEALTH_CHECKS = os.environ.get("DB_CONN_HEALTH_CHECKS", "True") == "True"
+DB_CONNECT_TIMEOUT = int(os.environ.get("DB_CONNECT_TIMEOUT", "5"))
+DB_POOL = os.environ.get("DB_POOL", "False") == "True"
+DB_POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "10"))
+
+
+def _with_connection_settings(db):
+    db["CONN_HEALTH_CHECKS"] = DB_CONN_HEALTH_CHECKS
+    db["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+    if db["ENGINE"] != "django.db.backends.postgresql":
+        return db
+    options = db.setdefault("OPTIONS", {})
+    options.setdefault("connect_timeout", DB_CONNECT_TIMEOUT)
+    if DB_POOL:
+        from importlib.util import find_spec
+
+        if find_spec("psycopg") and find_spec("psycopg_pool"):
+            # Pooled connections go back to the pool on close; Django requires CONN_MAX_AGE=0
+            db["CONN_MAX_AGE"] = 0
+            options["pool"] = {
+                "min_size": DB_POOL_MIN_SIZE,
+                "max_size": DB_POOL_MAX_SIZE,
+                "timeout": DB_POOL_TIMEOUT,
+            }
+        else:
+            import warnings
+
+            warnings.warn("DB_POOL=True needs psycopg 3 and psycopg_pool; using persistent connections.")
+    return db
+
+
 if DATABASE_URL:
     DATABASES = {
-        "default": dj_database_url.config(
-            default=DATABASE_URL,
-            conn_max_age=600,
-        )
+        "default": _with_connection_settings(dj_database_url.parse(DATABASE_URL))
     }
 else:
     DATABASES = {
-        "default": {
+        "default": _with_connection_settings({
             "ENGINE": "django.db.backends.postgresql",
             "NAME": os.environ.get("POSTGRES_DB", "disease_prediction_db"),
             "USER": os.environ.get("POSTGRES_USER", "postgres"),
             "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
             "HOST": os.environ.get("POSTGRES_HOST", "localhost"),
             "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        })
+    }
+
+# Monthly partitions for predictions on Postgres (apps/predictions/partitioning.py);
+# converted and maintained by `manage.py manage_prediction_partitions`. Retention 0 keeps all months.
+PREDICTION_PARTITION_MONTHS_AHEAD = int(os.environ.get("PREDICTION_PARTITION_MONTHS_AHEAD", "3"))
+PREDICTION_RETENTION_MONTHS = int(os.environ.get("PREDICTION_RETENTION_MONTHS", "0"))
+
+# Read replicas: comma-separated URLs. Views decorated with config.routers.replica_reads
+# read from them unless the user wrote within REPLICA_PIN_SECONDS (read-your-writes).
+DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL", "")
+DATABASE_REPLICAS = []
+for _i, _url in enumerate(filter(None, (u.strip() for u in DATABASE_REPLICA_URL.split(","))), start=1):
+    DATABASES[f"replica_{_i}"] = _with_connection_settings(dj_database_url.parse(_url))
+    # Tests run against the primary's test database
+    DATABASES[f"replica_{_i}"]["TEST"] = {"MIRROR": "default"}
+    DATABASE_REPLICAS.append(f"replica_{_i}")
+DATABASE_ROUTERS = ["config.routers.ReplicaRouter"]
+REPLICA_PIN_SECONDS = float(os.environ.get("REPLICA_PIN_SECONDS", "5"))
+
+# -----------------------------------------------------------------------------
+# Cache (local memory per process; set REDIS_URL to share it between workers)
+# -----------------------------------------------------------------------------
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
         }
     }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# user -> patient id cache for patient-scoped views (apps/patients/cache.py);
+# set PATIENT_CACHE_ALIAS=default to share entries between workers via CACHES
+PATIENT_CACHE_SIZE = int(os.environ.get("PATIENT_CACHE_SIZE", "10000"))
+PATIENT_CACHE_ALIAS = os.environ.get("PATIENT_CACHE_ALIAS", "")
+
+# Admin user counts (/api/admin/users/count/): on Postgres, filters the planner
+# estimates above ADMIN_EXACT_COUNT_LIMIT rows report the estimate, not COUNT(*)
+ADMIN_EXACT_COUNT_LIMIT = int(os.environ.get("ADMIN_EXACT_COUNT_LIMIT", "50000"))
+ADMIN_COUNT_CACHE_SECONDS = int(os.environ.get("ADMIN_COUNT_CACHE_SECONDS", "60"))
+# Admin stats ETag (apps/accounts/stats_version.py): lifetime of the version key in
+# the default cache; bounds staleness when workers do not share a cache (no REDIS_URL)
+ADMIN_STATS_VERSION_SECONDS = int(os.environ.get("ADMIN_STATS_VERSION_SECONDS", "300"))
+
+# Bulk patient import (apps/patients/importer.py): rows per transaction, password
+# hashing processes for `manage.py import_patients` (0 = one per CPU; the admin
+# upload always hashes inline) and invite token lifetime in seconds
+PATIENT_IMPORT_CHUNK_SIZE = int(os.environ.get("PATIENT_IMPORT_CHUNK_SIZE", "500"))
+PATIENT_IMPORT_HASH_WORKERS = int(os.environ.get("PATIENT_IMPORT_HASH_WORKERS", "0"))
+PASSWORD_RESET_TIMEOUT = int(os.environ.get("INVITE_TOKEN_SECONDS", str(14 * 24 * 3600)))
+
+# -----------------------------------------------------------------------------
+# ML models
+# -----------------------------------------------------------------------------
+# Keep loaded .pkl models in memory per worker; False reloads on every request (debugging)
+ML_MODEL_CACHE = os.environ.get("ML_MODEL_CACHE", "True") == "True"
+# Load all models when a WSGI/ASGI worker boots; False defers each to its first prediction
+ML_MODEL_PRELOAD = os.environ.get("ML_MODEL_PRELOAD", "True") == "True"
+
 from datetime import timedelta
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=24),
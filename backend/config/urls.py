@@ -5,6 +5,8 @@ from django.contrib import admin
 from django.http import JsonResponse
 from django.urls import path, include
 
+from apps.monitoring.views import healthz, prometheus_metrics, readyz
+
 
 def api_root(request):
     """Root URL: confirm backend is up and list API entry points for frontend."""
@@ -17,12 +19,22 @@ def api_root(request):
             "login": "/api/auth/login/",
             "logout": "/api/auth/logout/",
             "register": "/api/auth/register/",
+            "accept_invite": "/api/auth/invite/accept/",
             "me": "/api/auth/me/",
             "patients": "/api/patients/",
             "predict": "/api/predict/<disease>/",
+            "predict_panel": "/api/predict/panel/",
+            "model_insights": "/api/predict/<disease>/insights/",
             "predictions": "/api/predictions/",
             "admin_stats": "/api/admin/stats/",
+            "admin_analytics": "/api/admin/analytics/",
             "admin_users": "/api/admin/users/",
+            "admin_users_count": "/api/admin/users/count/",
+            "admin_import_patients": "/api/admin/patients/import/",
+            "monitoring_timing": "/api/monitoring/timing/",
+            "metrics": "/metrics",
+            "healthz": "/healthz",
+            "readyz": "/readyz",
         },
     })
 
@@ -30,9 +42,13 @@ def api_root(request):
 urlpatterns = [
     path("", api_root),
     path("admin/", admin.site.urls),
+    path("metrics", prometheus_metrics),
+    path("healthz", healthz),
+    path("readyz", readyz),
     path("api/auth/", include("apps.accounts.urls")),
     path("api/admin/", include("apps.accounts.admin_urls")),
     path("api/patients/", include("apps.patients.urls")),
     path("api/predict/", include("apps.predictions.predict_urls")),
     path("api/predictions/", include("apps.predictions.urls")),
+    path("api/monitoring/", include("apps.monitoring.urls")),
 ]
@@ -8,3 +8,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Only serving processes preload the models (see ml_models.model_loader.preload)
+from ml_models.model_loader import preload  # noqa: E402
+
+preload()
@@ -0,0 +1,7 @@
+"""
+End-to-end HTTP load-test harness for the predict API.
+Seeds patients, starts the app under gunicorn and drives
+POST /api/predict/<disease>/ and GET /api/predictions/ with a configurable mix.
+
+Run from backend/: python -m loadtest --help
+"""
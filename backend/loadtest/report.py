@@ -0,0 +1,110 @@
+"""
+Summaries for a load-test run: throughput, percentiles, latency histograms
+and the per-stage breakdown reported by the app in Server-Timing headers.
+"""
+import math
+from collections import defaultdict
+
+# Histogram bucket upper bounds in ms (last bucket is open-ended).
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, math.inf)
+BAR_WIDTH = 40
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def histogram(values):
+    """Counts per BUCKETS_MS bucket."""
+    counts = [0] * len(BUCKETS_MS)
+    for v in values:
+        for i, bound in enumerate(BUCKETS_MS):
+            if v <= bound:
+                counts[i] += 1
+                break
+    return counts
+
+
+def _stats(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "mean_ms": sum(values) / len(values) if values else 0.0,
+        "p50_ms": percentile(values, 50),
+        "p90_ms": percentile(values, 90),
+        "p99_ms": percentile(values, 99),
+        "max_ms": values[-1] if values else 0.0,
+    }
+
+
+def summarize(samples, wall_seconds):
+    """Build a JSON-serializable summary dict from run samples."""
+    by_op = defaultdict(list)
+    for s in samples:
+        by_op[s.op].append(s)
+
+    ops = {}
+    for op, op_samples in sorted(by_op.items()):
+        ok = [s.latency_ms for s in op_samples if 200 <= s.status < 300]
+        statuses = defaultdict(int)
+        for s in op_samples:
+            statuses[str(s.status)] += 1
+        stage_values = defaultdict(list)
+        for s in op_samples:
+            for name, ms in s.stages.items():
+                stage_values[name].append(ms)
+        ops[op] = {
+            "requests": len(op_samples),
+            "statuses": dict(statuses),
+            "latency": _stats(ok),
+            "histogram": histogram(ok),
+            "stages": {name: _stats(vals) for name, vals in stage_values.items()},
+        }
+
+    return {
+        "requests": len(samples),
+        "wall_seconds": wall_seconds,
+        "throughput_rps": len(samples) / wall_seconds if wall_seconds else 0.0,
+        "bucket_bounds_ms": [b if b != math.inf else None for b in BUCKETS_MS],
+        "operations": ops,
+    }
+
+
+def _bucket_label(i):
+    bound = BUCKETS_MS[i]
+    if bound == math.inf:
+        return f">{BUCKETS_MS[i - 1]:g} ms"
+    return f"<={bound:g} ms"
+
+
+def format_text(summary):
+    """Human-readable report."""
+    lines = [
+        f"Requests: {summary['requests']}  Wall: {summary['wall_seconds']:.1f}s  "
+        f"Throughput: {summary['throughput_rps']:.1f} req/s",
+    ]
+    for op, data in summary["operations"].items():
+        lat = data["latency"]
+        lines.append("")
+        lines.append(f"== {op}: {data['requests']} requests, statuses {data['statuses']}")
+        lines.append(
+            f"   latency (2xx) mean {lat['mean_ms']:.1f}  p50 {lat['p50_ms']:.1f}  "
+            f"p90 {lat['p90_ms']:.1f}  p99 {lat['p99_ms']:.1f}  max {lat['max_ms']:.1f} ms"
+        )
+        peak = max(data["histogram"]) or 1
+        for i, count in enumerate(data["histogram"]):
+            if count:
+                bar = "#" * max(1, round(count / peak * BAR_WIDTH))
+                lines.append(f"   {_bucket_label(i):>10} | {bar} {count}")
+        if data["stages"]:
+            lines.append("   per-stage (Server-Timing):")
+            for name, st in sorted(data["stages"].items(), key=lambda kv: -kv[1]["mean_ms"]):
+                lines.append(
+                    f"     {name:<18} mean {st['mean_ms']:8.3f}  p50 {st['p50_ms']:8.3f}  "
+                    f"p99 {st['p99_ms']:8.3f} ms  (n={st['count']})"
+                )
+    return "\n".join(lines)
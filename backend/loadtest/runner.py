@@ -0,0 +1,175 @@
+"""
+Drives the API with a pool of client threads and records per-request samples.
+Each thread keeps its own HTTP connection and picks operations by weighted mix.
+"""
+import http.client
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from ml_models.samples import random_features
+
+DISEASES = ("heart", "hypertension", "diabetes", "stroke")
+
+
+@dataclass
+class Sample:
+    """One completed request."""
+
+    op: str
+    status: int
+    latency_ms: float
+    # Server-Timing stages reported by the app, if any: name -> ms
+    stages: dict = field(default_factory=dict)
+
+
+def parse_server_timing(header):
+    """Parse 'name;dur=1.2, other;dur=3' into { name: float_ms }."""
+    stages = {}
+    if not header:
+        return stages
+    for part in header.split(","):
+        bits = [b.strip() for b in part.split(";")]
+        if not bits[0]:
+            continue
+        for b in bits[1:]:
+            if b.startswith("dur="):
+                try:
+                    stages[bits[0]] = float(b[4:])
+                except ValueError:
+                    pass
+    return stages
+
+
+def parse_mix(spec):
+    """'predict=7,history=3' -> [('predict', 7.0), ('history', 3.0)]"""
+    mix = []
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}. Known: {sorted(OPERATIONS)}")
+        mix.append((name, float(weight or 1)))
+    if not mix or sum(w for _, w in mix) <= 0:
+        raise ValueError("Operation mix must have a positive total weight.")
+    return mix
+
+
+class VirtualUser:
+    """A patient (or the provider acting for a patient) with its own connection."""
+
+    def __init__(self, base_url, token, patient_id=None, as_provider=False, rng=None):
+        parts = urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port
+        self.token = token
+        self.patient_id = patient_id
+        self.as_provider = as_provider
+        self.rng = rng or random.Random()
+        self.conn = None
+
+    def _request(self, method, path, body=None):
+        headers = {"Authorization": f"Bearer {self.token}", "Accept": "application/json"}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers["Content-Type"] = "application/json"
+        for attempt in (1, 2):
+            if self.conn is None:
+                self.conn = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            try:
+                start = time.perf_counter()
+                self.conn.request(method, path, body=payload, headers=headers)
+                resp = self.conn.getresponse()
+                resp.read()
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+                if resp.getheader("Connection", "").lower() == "close":
+                    self.close()
+                return resp.status, elapsed_ms, resp.getheader("Server-Timing")
+            except (http.client.HTTPException, ConnectionError):
+                # Server closed an idle keep-alive connection; retry once on a fresh one.
+                self.close()
+                if attempt == 2:
+                    raise
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def predict(self):
+        disease = self.rng.choice(DISEASES)
+        body = {"features": random_features(disease, self.rng)}
+        if self.as_provider:
+            body["patient_id"] = self.patient_id
+        return self._request("POST", f"/api/predict/{disease}/", body)
+
+    def history(self):
+        path = "/api/predictions/"
+        if self.as_provider:
+            path += f"?patient_id={self.patient_id}"
+        return self._request("GET", path)
+
+
+OPERATIONS = {
+    "predict": VirtualUser.predict,
+    "history": VirtualUser.history,
+}
+
+
+def run(base_url, identities, mix, concurrency, duration=None, requests=None, seed=0):
+    """
+    Run `concurrency` threads until `duration` seconds pass or `requests` total complete.
+    identities: list of dicts with token, patient_id and as_provider, assigned round-robin
+    to threads (each thread builds its own VirtualUser objects and connections).
+    Returns (samples, wall_seconds).
+    """
+    if duration is None and requests is None:
+        raise ValueError("Pass duration and/or requests.")
+    names = [name for name, _ in mix]
+    weights = [w for _, w in mix]
+    samples = []
+    lock = threading.Lock()
+    budget = [requests if requests is not None else float("inf")]
+    deadline = time.monotonic() + duration if duration else float("inf")
+
+    def take_ticket():
+        with lock:
+            if budget[0] <= 0:
+                return False
+            budget[0] -= 1
+            return True
+
+    def worker(idx):
+        rng = random.Random(seed + idx)
+        mine = [
+            VirtualUser(base_url, rng=rng, **identity)
+            for identity in (identities[idx::concurrency] or [identities[idx % len(identities)]])
+        ]
+        local = []
+        i = 0
+        while time.monotonic() < deadline and take_ticket():
+            user = mine[i % len(mine)]
+            i += 1
+            op = rng.choices(names, weights)[0]
+            try:
+                status, latency_ms, timing = OPERATIONS[op](user)
+            except (OSError, http.client.HTTPException):
+                local.append(Sample(op, 0, 0.0))
+                continue
+            local.append(Sample(op, status, latency_ms, parse_server_timing(timing)))
+        for user in mine:
+            user.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, time.perf_counter() - started
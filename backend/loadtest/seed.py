@@ -0,0 +1,90 @@
+"""
+Seed load-test users: N patients (with some prediction history) and one provider.
+Reuses the random feature/outcome generators from ml_models/seed_demo_data.py.
+Idempotent: existing lt_patient_<i> users are kept, only missing ones are created.
+"""
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from apps.patients.models import Patient
+from apps.predictions.models import Prediction
+from ml_models.samples import random_outcome
+
+User = get_user_model()
+
+PATIENT_PREFIX = "lt_patient_"
+PROVIDER_USERNAME = "lt_provider"
+PASSWORD = "loadtest123"
+DISEASES = ("heart", "diabetes", "hypertension", "stroke")
+
+
+def seed(n_patients, history_per_patient=10, seed_value=42, batch_size=1000):
+    """
+    Ensure n_patients patients and one provider exist.
+    Returns (provider_user, [(user_id, patient_id), ...]) ordered by patient index.
+    """
+    rng = random.Random(seed_value)
+    # Hash once: PBKDF2 per user would dominate seeding time.
+    password_hash = make_password(PASSWORD)
+
+    provider, _ = User.objects.get_or_create(
+        username=PROVIDER_USERNAME,
+        defaults={
+            "email": "lt_provider@loadtest.test",
+            "role": User.Role.PROVIDER,
+            "full_name": "Load Test Provider",
+            "password": password_hash,
+        },
+    )
+
+    usernames = [f"{PATIENT_PREFIX}{i}" for i in range(n_patients)]
+    existing = set(
+        User.objects.filter(username__in=usernames).values_list("username", flat=True)
+    )
+    missing = [u for u in usernames if u not in existing]
+    for start in range(0, len(missing), batch_size):
+        chunk = missing[start:start + batch_size]
+        with transaction.atomic():
+            User.objects.bulk_create(
+                [
+                    User(
+                        username=u,
+                        email=f"{u}@loadtest.test",
+                        role=User.Role.PATIENT,
+                        full_name=u.replace("_", " ").title(),
+                        password=password_hash,
+                    )
+                    for u in chunk
+                ],
+                batch_size=batch_size,
+            )
+            # bulk_create does not return pks on every backend; re-read them.
+            user_ids = list(User.objects.filter(username__in=chunk).values_list("id", flat=True))
+            Patient.objects.bulk_create(
+                [Patient(user_id=uid) for uid in user_ids], batch_size=batch_size
+            )
+            if history_per_patient:
+                patient_ids = Patient.objects.filter(user_id__in=user_ids).values_list("id", flat=True)
+                Prediction.objects.bulk_create(
+                    [
+                        Prediction(
+                            patient_id=pid,
+                            disease_type=rng.choice(DISEASES),
+                            **random_outcome(rng),
+                        )
+                        for pid in patient_ids
+                        for _ in range(history_per_patient)
+                    ],
+                    batch_size=batch_size,
+                )
+        print(f"  seeded {min(start + batch_size, len(missing))}/{len(missing)} new patients")
+
+    rows = (
+        Patient.objects.filter(user__username__in=usernames)
+        .values_list("user__username", "user_id", "id")
+    )
+    by_username = {username: (uid, pid) for username, uid, pid in rows}
+    return provider, [by_username[u] for u in usernames]
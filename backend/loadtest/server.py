@@ -0,0 +1,85 @@
+"""
+Start and stop the app under gunicorn for a load-test run.
+"""
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+class GunicornServer:
+    """Runs `gunicorn config.wsgi:application` as a child process."""
+
+    def __init__(self, host="127.0.0.1", port=8765, workers=4, threads=1, env=None, log_path=None):
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.threads = threads
+        self.env = env or {}
+        self.log_path = log_path
+        self.process = None
+        self._log_file = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self, timeout=60):
+        env = os.environ.copy()
+        env.update(self.env)
+        env.setdefault("DJANGO_ALLOWED_HOSTS", f"{self.host},localhost")
+        cmd = [
+            sys.executable, "-m", "gunicorn", "config.wsgi:application",
+            "--bind", f"{self.host}:{self.port}",
+            "--workers", str(self.workers),
+            "--threads", str(self.threads),
+            "--timeout", "120",
+        ]
+        if self.log_path:
+            self._log_file = open(self.log_path, "ab")
+        self.process = subprocess.Popen(
+            cmd,
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=self._log_file or subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+        )
+        self._wait_until_up(timeout)
+        return self
+
+    def _wait_until_up(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(
+                    f"gunicorn exited with code {self.process.returncode} (see {self.log_path or 'its output'})"
+                )
+            try:
+                with urllib.request.urlopen(self.base_url + "/", timeout=2):
+                    return
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.25)
+        self.stop()
+        raise RuntimeError(f"gunicorn did not answer on {self.base_url} within {timeout}s")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -1,14 +1,36 @@
 """
 ML models package: model loading and inference.
 Place heart.pkl, hypertension.pkl, stroke.pkl, diabetes.pkl here.
+
+The names below are resolved on first access (PEP 562), so importing
+ml_models or ml_models.model_loader (settings, middleware, management
+commands) does not pull in pandas / scikit-learn / joblib; they load with
+the first inference or an explicit load_all_models().
 """
-from .model_loader import get_model, load_all_models
-from .predictor import predict_disease, RISK_LEVELS, SUPPORTED_DISEASES
-
-__all__ = [
-    "get_model",
-    "load_all_models",
-    "predict_disease",
-    "RISK_LEVELS",
-    "SUPPORTED_DISEASES",
-]
+from importlib import import_module
+
+_EXPORTS = {
+    "FeatureValidationError": "schema",
+    "get_model": "model_loader",
+    "load_all_models": "model_loader",
+    "predict_disease": "predictor",
+    "predict_frame": "predictor",
+    "predict_panel": "predictor",
+    "RISK_LEVELS": "predictor",
+    "SUPPORTED_DISEASES": "predictor",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
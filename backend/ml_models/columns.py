@@ -0,0 +1,25 @@
+"""
+Column-name normalization shared by the training scripts and CSV ingestion.
+Spreadsheet headers like "Blood Pressure" or "BloodPressure" map to the
+feature names in predictor.FEATURE_ORDER ("blood_pressure").
+"""
+
+# Normalized header -> feature name, for datasets that drop the underscores
+COLUMN_ALIASES = {
+    "bloodpressure": "blood_pressure",
+    "skinthickness": "skin_thickness",
+    "diabetespedigreefunction": "diabetes_pedigree_function",
+    "residencetype": "residence_type",
+}
+
+
+def normalize_column(name) -> str:
+    """Strip, lowercase and underscore a header, then apply COLUMN_ALIASES."""
+    name = str(name).strip().lower().replace(" ", "_")
+    return COLUMN_ALIASES.get(name, name)
+
+
+def normalize_columns(df):
+    """Rename a DataFrame's columns with normalize_column(); returns the same frame."""
+    df.columns = [normalize_column(c) for c in df.columns]
+    return df
@@ -0,0 +1,126 @@
+"""
+Per-prediction explanations for the tree ensembles: Saabas-style decision path
+contributions, without SHAP.
+
+Walking one tree from its root to the sample's leaf, every split moves the
+node's positive-class probability; that change is credited to the split's
+feature. Summed over the path and averaged over the forest (predict_proba is
+the mean of the trees' leaf probabilities), the contributions add up exactly:
+
+    probability = base_value + sum(contributions.values())
+
+where base_value is the forest's mean root probability (the training prior).
+
+TreeTables flattens all trees of a fitted forest into arrays indexed by a
+global node id (children, split feature and threshold, and each node's
+probability change from its parent, already divided by the number of trees),
+once per model. explain_row() then walks every tree at once, one NumPy step
+per tree level, so the cost is the depth of the deepest tree rather than the
+number of nodes or trees.
+"""
+import threading
+import weakref
+
+import numpy as np
+
+# fitted final estimator -> TreeTables (dropped with the model, e.g. on clear_model_cache)
+_tables = weakref.WeakKeyDictionary()
+_tables_lock = threading.Lock()
+
+
+class TreeTables:
+    """All trees of one fitted classifier, flattened for vectorized traversal."""
+
+    def __init__(self, estimator):
+        trees = [t.tree_ for t in getattr(estimator, "estimators_", [estimator])]
+        positive = list(estimator.classes_).index(1) if 1 in estimator.classes_ else -1
+        offsets = np.cumsum([0] + [t.node_count for t in trees])
+        self.roots = offsets[:-1]
+        left, right, feature, threshold, delta = [], [], [], [], []
+        base = 0.0
+        for tree, offset in zip(trees, self.roots):
+            value = tree.value[:, 0, :]
+            p = value[:, positive] / value.sum(axis=1)
+            leaf = tree.children_left == -1
+            # Leaves point at themselves so finished trees stay put while deeper ones walk on
+            own = np.arange(tree.node_count) + offset
+            left.append(np.where(leaf, own, tree.children_left + offset))
+            right.append(np.where(leaf, own, tree.children_right + offset))
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(np.where(leaf, np.inf, tree.threshold))
+            parent_p = np.empty_like(p)
+            internal = np.flatnonzero(~leaf)
+            parent_p[0] = p[0]
+            parent_p[tree.children_left[internal]] = p[internal]
+            parent_p[tree.children_right[internal]] = p[internal]
+            delta.append(p - parent_p)
+            base += p[0]
+        n_trees = len(trees)
+        self.left = np.concatenate(left)
+        self.right = np.concatenate(right)
+        self.feature = np.concatenate(feature)
+        self.threshold = np.concatenate(threshold)
+        self.delta = np.concatenate(delta) / n_trees
+        self.base_value = base / n_trees
+        self.depth = max(t.max_depth for t in trees)
+        self.n_features = estimator.n_features_in_
+
+    def contributions(self, X):
+        """(n_samples, n_features) contributions for the rows of transformed X."""
+        # Trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        node = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        out = np.zeros((len(X), self.n_features))
+        for _ in range(self.depth):
+            split = self.feature[node]
+            node_next = np.where(X[rows, split] <= self.threshold[node], self.left[node], self.right[node])
+            moved = node_next != node
+            # Credit the child's probability change to the feature its parent split on
+            np.add.at(out, (np.broadcast_to(rows, node.shape)[moved], split[moved]), self.delta[node_next[moved]])
+            node = node_next
+        return out
+
+
+def supports(model) -> bool:
+    """True when the model (or a Pipeline's final step) is a fitted tree classifier."""
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    trees = getattr(estimator, "estimators_", [estimator])
+    return hasattr(estimator, "classes_") and all(hasattr(t, "tree_") for t in trees)
+
+
+def tables_for(model) -> TreeTables:
+    estimator = model.steps[-1][1] if hasattr(model, "steps") else model
+    tables = _tables.get(estimator)
+    if tables is None:
+        with _tables_lock:
+            tables = _tables.get(estimator)
+            if tables is None:
+                tables = _tables[estimator] = TreeTables(estimator)
+    return tables
+
+
+def _feature_names(model, input_df):
+    if hasattr(model, "steps") and len(model.steps) > 1 and hasattr(model[:-1], "get_feature_names_out"):
+        # ColumnTransformer prefixes outputs with the transformer name ("num__age")
+        return [name.split("__", 1)[-1] for name in model[:-1].get_feature_names_out()]
+    return list(input_df.columns)
+
+
+def explain_row(model, input_df) -> dict | None:
+    """
+    {"base_value", "contributions": {feature: change in positive-class probability}}
+    for a single-row input DataFrame, largest effect first; None when the model
+    is not a tree classifier.
+    """
+    if not supports(model):
+        return None
+    X = model[:-1].transform(input_df) if hasattr(model, "steps") and len(model.steps) > 1 else input_df
+    tables = tables_for(model)
+    values = tables.contributions(X)[0]
+    names = _feature_names(model, input_df)
+    order = np.argsort(-np.abs(values), kind="stable")
+    return {
+        "base_value": round(float(tables.base_value), 4),
+        "contributions": {names[i]: round(float(values[i]), 4) for i in order},
+    }
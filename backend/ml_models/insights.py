@@ -0,0 +1,216 @@
+"""
+Global model insights, computed offline and stored next to each model.
+
+For one fitted Pipeline and a reference set of rows (the held-out split in the
+train_* scripts, a labelled CSV or, with --synthetic, rows drawn from the
+clinical ranges in `manage.py compute_model_insights`):
+
+- permutation importance: drop in ROC AUC when a feature's column is shuffled,
+  mean and spread over `repeats` shuffles;
+- partial dependence: mean positive-class probability over the reference rows
+  with the feature set to each value of a grid (the categorical codes, or
+  quantiles of the reference values).
+
+Each method stacks all its modified copies of the reference rows into one
+DataFrame and scores them with a single predict_proba call. The result is
+written to ml_models/<disease>_insights.json together with a hash of the
+.pkl, and load_insights() serves it from memory, re-reading the file only
+when it changes. Insights without labels only say how the model reacts to
+its inputs, not which features predict the disease, so the API serves only
+labelled ones (from_labelled_data()). This module does not need Django, so the
+training scripts can call save_insights() directly.
+"""
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .schema import FEATURES
+
+ML_MODELS_DIR = Path(__file__).resolve().parent
+
+DEFAULT_GRID_SIZE = 20
+DEFAULT_REPEATS = 5
+DEFAULT_MAX_ROWS = 1000
+
+# disease -> (file mtime_ns, insights)
+_cache = {}
+_cache_lock = threading.Lock()
+# (path, mtime_ns, size) -> sha256 of a model file
+_hashes = {}
+
+
+def insights_path(disease: str) -> Path:
+    return ML_MODELS_DIR / f"{disease}_insights.json"
+
+
+def model_path(disease: str) -> Path:
+    return ML_MODELS_DIR / f"{disease}.pkl"
+
+
+def file_sha256(path: Path) -> str:
+    """sha256 of a file, memoized while its mtime and size stay the same."""
+    stat = path.stat()
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    digest = _hashes.get(key)
+    if digest is None:
+        digest = _hashes[key] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return digest
+
+
+def _positive_proba(model, frame):
+    proba = model.predict_proba(frame)
+    return proba[:, list(model.classes_).index(1)] if 1 in model.classes_ else proba[:, -1]
+
+
+def _score(y, probability):
+    """ROC AUC of probability against labels y; accuracy when y has one class."""
+    from sklearn.metrics import roc_auc_score
+
+    if len(np.unique(y)) < 2:
+        return float(np.mean((probability >= 0.5) == y))
+    return float(roc_auc_score(y, probability))
+
+
+def _grid(name, values, grid_size):
+    feature = FEATURES.get(name)
+    if feature is not None and feature.choices:
+        return np.array(feature.choices, dtype=float)
+    unique = np.unique(values)
+    if len(unique) <= grid_size:
+        return unique.astype(float)
+    return np.unique(np.round(np.quantile(values, np.linspace(0.05, 0.95, grid_size)), 2))
+
+
+def permutation_importance(model, X, y, repeats=DEFAULT_REPEATS, seed=42):
+    """{column: (mean drop in score, std)} with every shuffle scored in one predict_proba call."""
+    rng = np.random.default_rng(seed)
+    n = len(X)
+    values = X.to_numpy(dtype=float)
+    blocks = []
+    for j in range(values.shape[1]):
+        for _ in range(repeats):
+            block = values.copy()
+            block[:, j] = block[rng.permutation(n), j]
+            blocks.append(block)
+    stacked = pd.DataFrame(np.concatenate(blocks), columns=X.columns)
+    probability = _positive_proba(model, stacked).reshape(values.shape[1], repeats, n)
+    baseline = _score(y, _positive_proba(model, X))
+    drops = np.array([[baseline - _score(y, p) for p in per_feature] for per_feature in probability])
+    return {name: (float(drops[j].mean()), float(drops[j].std())) for j, name in enumerate(X.columns)}
+
+
+def partial_dependence(model, X, grid_size=DEFAULT_GRID_SIZE):
+    """{column: (grid, mean positive probability at each grid value)}, all in one predict_proba call."""
+    values = X.to_numpy(dtype=float)
+    grids = [_grid(name, values[:, j], grid_size) for j, name in enumerate(X.columns)]
+    blocks = []
+    for j, grid in enumerate(grids):
+        block = np.repeat(values[None, :, :], len(grid), axis=0)
+        block[:, :, j] = grid[:, None]
+        blocks.append(block.reshape(-1, values.shape[1]))
+    probability = _positive_proba(model, pd.DataFrame(np.concatenate(blocks), columns=X.columns))
+    result, start = {}, 0
+    for name, grid in zip(X.columns, grids):
+        stop = start + len(grid) * len(values)
+        result[name] = (grid, probability[start:stop].reshape(len(grid), len(values)).mean(axis=1))
+        start = stop
+    return result
+
+
+def compute_insights(model, X, y=None, *, grid_size=DEFAULT_GRID_SIZE, repeats=DEFAULT_REPEATS,
+                     max_rows=DEFAULT_MAX_ROWS, seed=42, source="reference"):
+    """
+    Insights dict for a fitted model on reference rows X (DataFrame with the
+    model's feature columns). Without labels y, importance measures how well the
+    shuffled model still agrees with its own predictions.
+    """
+    X = X.reset_index(drop=True).astype(float)
+    if y is None:
+        y = np.asarray(model.predict(X)).astype(int)
+        scoring = "roc_auc_vs_model_predictions"
+    else:
+        y = np.asarray(y).astype(int)
+        scoring = "roc_auc"
+    if len(X) > max_rows:
+        keep = np.sort(np.random.default_rng(seed).choice(len(X), max_rows, replace=False))
+        X, y = X.iloc[keep].reset_index(drop=True), y[keep]
+
+    importance = permutation_importance(model, X, y, repeats=repeats, seed=seed)
+    dependence = partial_dependence(model, X, grid_size=grid_size)
+    features = {}
+    for name in sorted(X.columns, key=lambda c: importance[c][0], reverse=True):
+        grid, probability = dependence[name]
+        features[name] = {
+            "importance": round(importance[name][0], 4),
+            "importance_std": round(importance[name][1], 4),
+            "grid": [round(float(v), 4) for v in grid],
+            "partial_dependence": [round(float(p), 4) for p in probability],
+        }
+    return {
+        "computed_at": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z"),
+        "reference": {"source": source, "rows": len(X), "scoring": scoring, "repeats": repeats},
+        "features": features,
+    }
+
+
+def save_insights(disease, model, X, y=None, **options) -> tuple[Path, dict]:
+    """
+    compute_insights() for ml_models/<disease>.pkl and write <disease>_insights.json
+    next to it. Returns (path, insights); report them with summary().
+    """
+    insights = {"disease": disease, "model_sha256": file_sha256(model_path(disease))}
+    insights.update(compute_insights(model, X, y, **options))
+    path = insights_path(disease)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(insights, separators=(",", ":")) + "\n")
+    tmp.replace(path)
+    return path, insights
+
+
+def from_labelled_data(insights) -> bool:
+    """Whether importance was scored against true labels rather than the model's own predictions."""
+    return insights["reference"]["scoring"] == "roc_auc"
+
+
+def summary(path, insights, top=5) -> str:
+    """One line for the caller to print: where the insights went and the top-ranked features."""
+    ranking = ", ".join(f"{name} {f['importance']:.3f}" for name, f in list(insights["features"].items())[:top])
+    line = f"Saved insights to {path} (top features: {ranking})"
+    if not from_labelled_data(insights):
+        line += "; computed without labels, so the API does not serve them"
+    return line
+
+
+def load_insights(disease: str):
+    """
+    The stored insights for a disease with "stale": whether the .pkl changed
+    since they were computed; None when there are none. Kept in memory and
+    re-read only when the file's mtime changes.
+    """
+    path = insights_path(disease)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    cached = _cache.get(disease)
+    if cached is None or cached[0] != mtime:
+        with _cache_lock:
+            cached = _cache.get(disease)
+            if cached is None or cached[0] != mtime:
+                cached = _cache[disease] = (mtime, json.loads(path.read_text()))
+    insights = cached[1]
+    try:
+        stale = file_sha256(model_path(disease)) != insights.get("model_sha256")
+    except FileNotFoundError:
+        stale = True
+    return {**insights, "stale": stale}
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
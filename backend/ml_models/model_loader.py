@@ -1,12 +1,17 @@
 """
 Loads sklearn .pkl models from disk.
-Caching disabled for debugging: models are loaded fresh on each request.
+Models are cached per process after the first load; set ML_MODEL_CACHE=False
+to load fresh on each request (debugging).
 """
 import logging
+import threading
+import time
 from pathlib import Path
 
 from django.conf import settings
 
+from apps.monitoring import metrics
+
 logger = logging.getLogger(__name__)
 
 # Absolute path to project root (backend directory when manage.py lives there)
@@ -37,19 +42,51 @@ def _log_model_type(model, disease: str) -> None:
         logger.info("Loaded model type: %s (raw estimator, disease=%s)", model_type, disease)
 
 
+# disease -> loaded model (only used when settings.ML_MODEL_CACHE is True)
+_MODEL_CACHE = {}
+_cache_lock = threading.Lock()
+# disease -> seconds the last load from disk took (reported by /readyz)
+_LOAD_SECONDS = {}
+
+
+def _cache_enabled() -> bool:
+    return getattr(settings, "ML_MODEL_CACHE", True)
+
+
 def get_model(disease: str):
     """
-    Load and return the model for the given disease from disk.
-    No cache: loads fresh every time (for debugging).
+    Return the model for the given disease, loading it from disk on first use.
+    With ML_MODEL_CACHE=False, loads fresh every time (for debugging).
     """
     disease = disease.lower().strip()
     if disease not in DISEASE_MODEL_FILENAMES:
         raise ValueError(f"Unsupported disease: {disease}. Supported: {list(DISEASE_MODEL_FILENAMES)}")
-    return _load_model(disease)
+    if not _cache_enabled():
+        return _load_model(disease)
+    model = _MODEL_CACHE.get(disease)
+    metrics.record_cache("model", model is not None)
+    if model is None:
+        with _cache_lock:
+            # Another thread may have loaded it while we waited.
+            model = _MODEL_CACHE.get(disease)
+            if model is None:
+                model = _MODEL_CACHE[disease] = _load_model(disease)
+    return model
+
+
+def load_seconds() -> dict:
+    """disease -> duration of its last load from disk in this process."""
+    return dict(_LOAD_SECONDS)
+
+
+def clear_model_cache() -> None:
+    """Drop cached models so the next get_model() reloads from disk."""
+    with _cache_lock:
+        _MODEL_CACHE.clear()
 
 
 def _load_model(disease: str):
-    """Load a single model from disk (no caching)."""
+    """Load a single model from disk (bypasses the cache)."""
     import joblib
 
     filename = DISEASE_MODEL_FILENAMES[disease]
@@ -59,7 +96,11 @@ def _load_model(disease: str):
         raise FileNotFoundError(
             f"Model file not found: {abs_path}. Place {filename} in the ml_models directory (under BASE_DIR)."
         )
+    start = time.perf_counter()
     model = joblib.load(model_path)
+    elapsed = _LOAD_SECONDS[disease] = time.perf_counter() - start
+    metrics.MODEL_LOADS.inc(disease=disease)
+    metrics.MODEL_LOAD_LATENCY.observe(elapsed, disease=disease)
     logger.info("Loaded model for disease=%s from %s", disease, model_path.resolve())
     _log_model_type(model, disease)
     return model
@@ -67,11 +108,9 @@ def _load_model(disease: str):
 
 def load_all_models() -> dict:
     """
-    Load all supported models from disk. Returns dict of disease -> model.
-    No caching. Skips missing files and logs a warning.
+    Load all supported models from disk (into the cache when enabled).
+    Returns dict of disease -> model. Skips missing files and logs a warning.
     """
-    import joblib
-
     loaded = {}
     for disease, filename in DISEASE_MODEL_FILENAMES.items():
         model_path = BASE_DIR / "ml_models" / filename
@@ -79,10 +118,29 @@ def load_all_models() -> dict:
             logger.warning("Model file not found: %s (place %s in ml_models/)", model_path.resolve(), filename)
             continue
         try:
-            model = joblib.load(model_path)
-            loaded[disease] = model
-            logger.info("Loaded model for disease=%s from %s", disease, model_path.resolve())
-            _log_model_type(model, disease)
+            model = _load_model(disease)
         except Exception as e:
             logger.warning("Failed to load %s: %s", model_path, e)
+            continue
+        loaded[disease] = model
+        if _cache_enabled():
+            with _cache_lock:
+                _MODEL_CACHE[disease] = model
     return loaded
+
+
+def preload() -> None:
+    """
+    Load and warm up every model (ml_models.warmup) when a server process boots
+    (config/wsgi.py, config/asgi.py) so the first predictions do not pay for it;
+    off with ML_MODEL_PRELOAD=False. Management commands never call this and load
+    models only if they predict.
+    """
+    if not getattr(settings, "ML_MODEL_PRELOAD", True):
+        return
+    try:
+        from .warmup import warm_up
+
+        warm_up()
+    except Exception as e:
+        logger.warning("ML models not preloaded at startup: %s", e)
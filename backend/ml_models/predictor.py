@@ -4,10 +4,18 @@ Each disease has one Pipeline .pkl (ColumnTransformer + StandardScaler + Model).
 No manual scaling, no encoder/scaler loading.
 """
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
+from joblib import parallel_config
+
+from apps.monitoring import timing
 
 from .model_loader import get_model, DISEASE_MODEL_FILENAMES
+from .schema import Schema
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +41,13 @@ FEATURE_ORDER = {
     ],
 }
 
+# Allowed values per feature (ml_models.schema), compiled once per disease
+SCHEMAS = {disease: Schema(disease, order) for disease, order in FEATURE_ORDER.items()}
+
+# Runs the models of a predict_panel() call side by side; created on first use
+_executor = None
+_executor_lock = threading.Lock()
+
 # 0-30% Low, 31-60% Moderate, 61-80% High, 81-100% Critical
 RISK_LEVELS = ("Low", "Moderate", "High", "Critical")
 RISK_BANDS = (
@@ -52,45 +67,21 @@ def _probability_to_risk_assessment(probability: float) -> dict:
     return {"risk_level": "Critical", "color": "darkred", "advice": "Immediate medical attention"}
 
 
-def _validate_features(disease: str, features: dict) -> None:
-    if not isinstance(features, dict):
-        raise ValueError("features must be a dict of feature name -> numeric value")
-    order = FEATURE_ORDER.get(disease)
-    if not order:
-        raise ValueError(f"Unknown disease: {disease}. Supported: {SUPPORTED_DISEASES}")
-    missing = [n for n in order if n not in features]
-    if missing:
-        raise ValueError(f"Missing required features for {disease}: {missing}")
-    for name in order:
-        val = features[name]
-        if val is None:
-            raise ValueError(f"Feature '{name}' must be numeric, got None")
-        try:
-            float(val)
-        except (TypeError, ValueError):
-            raise ValueError(f"Feature '{name}' must be numeric, got {type(val).__name__}: {repr(val)}")
-
-
-def _features_to_dataframe(disease: str, features: dict) -> pd.DataFrame:
-    """Build a single-row DataFrame with columns in FEATURE_ORDER[disease]."""
-    order = FEATURE_ORDER[disease]
-    row = [float(features[name]) for name in order]
-    return pd.DataFrame([row], columns=order)
-
-
-def predict_disease(disease: str, features: dict):
-    """
-    Run inference using the disease Pipeline only.
-    model = get_model(disease); prediction = model.predict(input_df); probability from model.predict_proba(input_df).
-    """
-    disease = disease.lower().strip()
-    if disease not in SUPPORTED_DISEASES:
-        raise ValueError(f"Unsupported disease: {disease}. Supported: {SUPPORTED_DISEASES}")
+def risk_levels(probabilities) -> np.ndarray:
+    """Vectorized risk level of each probability (same bands as predict_disease)."""
+    bounds = np.array([band[0] for band in RISK_BANDS])
+    names = np.array([band[1] for band in RISK_BANDS], dtype=object)
+    index = np.searchsorted(bounds, np.clip(np.asarray(probabilities, dtype=float), 0.0, 1.0), side="left")
+    return names.take(index)
+
+
+def _row_to_dataframe(disease: str, row: np.ndarray) -> pd.DataFrame:
+    """Single-row DataFrame with columns in FEATURE_ORDER[disease] from a validated row."""
+    return pd.DataFrame(row.reshape(1, -1), columns=FEATURE_ORDER[disease])
 
-    _validate_features(disease, features)
-    input_df = _features_to_dataframe(disease, features)
-    model = get_model(disease)
 
+def _score(model, input_df: pd.DataFrame) -> dict:
+    """predict_disease() result for a single-row input DataFrame."""
     prediction = model.predict(input_df)
     pred_label = int(prediction[0])
 
@@ -112,3 +103,121 @@ def predict_disease(disease: str, features: dict):
         "risk_color": risk_assessment["color"],
         "risk_advice": risk_assessment["advice"],
     }
+
+
+def predict_disease(disease: str, features: dict, explain: bool = False):
+    """
+    Run inference using the disease Pipeline only.
+    model = get_model(disease); prediction = model.predict(input_df); probability from model.predict_proba(input_df).
+    Features are checked against SCHEMAS[disease]; raises FeatureValidationError
+    (a ValueError with per-field errors) when any is missing or out of range.
+    With explain=True the result also has "explanation": each feature's
+    contribution to the probability (ml_models.explain), or None for models
+    that are not tree ensembles.
+    """
+    disease = disease.lower().strip()
+    if disease not in SUPPORTED_DISEASES:
+        raise ValueError(f"Unsupported disease: {disease}. Supported: {SUPPORTED_DISEASES}")
+
+    with timing.span("validate_features"):
+        row = SCHEMAS[disease].validate(features)
+    with timing.span("dataframe"):
+        input_df = _row_to_dataframe(disease, row)
+    with timing.span("model_load"):
+        model = get_model(disease)
+
+    with timing.span("predict_proba"):
+        result = _score(model, input_df)
+    if explain:
+        from .explain import explain_row
+
+        with timing.span("explain"):
+            result["explanation"] = explain_row(model, input_df)
+    return result
+
+
+@lru_cache(maxsize=None)
+def _panel_schema(diseases: tuple):
+    """
+    (Schema over the union of the diseases' features, {disease: column indexes
+    into its rows}) for a sorted tuple of diseases.
+    """
+    names = list(dict.fromkeys(name for disease in diseases for name in FEATURE_ORDER[disease]))
+    columns = {disease: [names.index(name) for name in FEATURE_ORDER[disease]] for disease in diseases}
+    return Schema(", ".join(diseases), names), columns
+
+
+def _panel_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(len(SUPPORTED_DISEASES), thread_name_prefix="predict-panel")
+    return _executor
+
+
+def predict_panel(diseases, features: dict) -> dict:
+    """
+    predict_disease() for several diseases on one set of features: the union of
+    their features is validated once, diseases with the same FEATURE_ORDER
+    (heart, hypertension) share one input row, and the models run concurrently
+    on a thread pool (sklearn and NumPy release the GIL in their inner loops).
+    Returns {disease: result} in the order given; duplicates are dropped.
+    """
+    diseases = list(dict.fromkeys(d.lower().strip() for d in diseases))
+    unsupported = [d for d in diseases if d not in SUPPORTED_DISEASES]
+    if unsupported or not diseases:
+        raise ValueError(f"Unsupported diseases: {unsupported}. Supported: {SUPPORTED_DISEASES}")
+
+    with timing.span("validate_features"):
+        schema, columns = _panel_schema(tuple(sorted(diseases)))
+        row = schema.validate(features)
+    with timing.span("dataframe"):
+        frames = {}
+        for disease in diseases:
+            order = tuple(FEATURE_ORDER[disease])
+            if order not in frames:
+                frames[order] = _row_to_dataframe(disease, row[columns[disease]])
+        inputs = [frames[tuple(FEATURE_ORDER[d])] for d in diseases]
+    with timing.span("model_load"):
+        models = [get_model(d) for d in diseases]
+
+    with timing.span("predict_proba"):
+        if len(diseases) == 1:
+            results = [_score(models[0], inputs[0])]
+        else:
+            results = list(_panel_executor().map(_score, models, inputs))
+    return dict(zip(diseases, results))
+
+
+def predict_frame(disease: str, frame: pd.DataFrame) -> dict:
+    """
+    Batch counterpart of predict_disease() for a DataFrame holding the
+    FEATURE_ORDER[disease] columns, already checked with
+    SCHEMAS[disease].validate_columns(): one predict_proba call for all rows.
+    Returns arrays "prediction" (int), "probability" (rounded like
+    predict_disease) and "risk_level".
+    """
+    disease = disease.lower().strip()
+    if disease not in SUPPORTED_DISEASES:
+        raise ValueError(f"Unsupported disease: {disease}. Supported: {SUPPORTED_DISEASES}")
+    model = get_model(disease)
+    input_df = frame[FEATURE_ORDER[disease]].astype(float)
+    if hasattr(model, "predict_proba"):
+        # Ensembles left at n_jobs=None (the trained forests) spread trees over all cores
+        with parallel_config(n_jobs=-1, prefer="threads"):
+            proba = model.predict_proba(input_df)
+        # Pipeline.predict() is classes_[argmax(predict_proba)]; reuse the probabilities
+        labels = np.asarray(model.classes_).take(proba.argmax(axis=1)).astype(int)
+        if proba.shape[1] >= 2:
+            probability = proba[:, 1]
+        else:
+            probability = np.where(labels == 1, proba[:, 0], 1.0 - proba[:, 0])
+    else:
+        labels = np.asarray(model.predict(input_df)).astype(int)
+        probability = (labels == 1).astype(float)
+    return {
+        "prediction": labels,
+        "probability": np.round(probability, 4),
+        "risk_level": risk_levels(probability),
+    }
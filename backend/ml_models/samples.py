@@ -0,0 +1,129 @@
+"""
+Sample model inputs: random feature generators shared by the demo seeder and the
+load-test harness, and the canned SAMPLE_INPUTS used by the pipeline smoke test and
+the model warm-up. Values stay within realistic clinical ranges so every sample is
+valid model input.
+"""
+import random
+
+# Realistic clinical ranges (min, max) per feature for random sampling
+HEART_RANGES = {
+    "age": (35, 75),
+    "sex": (0, 1),
+    "cp": (0, 3),
+    "trestbps": (110, 180),
+    "chol": (150, 350),
+    "fbs": (0, 1),
+    "restecg": (0, 2),
+    "thalach": (90, 180),
+    "exang": (0, 1),
+    "oldpeak": (0.0, 4.0),
+    "slope": (0, 2),
+    "ca": (0, 3),
+    "thal": (0, 3),
+}
+DIABETES_RANGES = {
+    "pregnancies": (0, 15),
+    "glucose": (70, 200),
+    "blood_pressure": (60, 110),
+    "skin_thickness": (10, 60),
+    "insulin": (0, 300),
+    "bmi": (18.0, 45.0),
+    "diabetes_pedigree_function": (0.1, 2.5),
+    "age": (21, 80),
+}
+STROKE_RANGES = {
+    "gender": (0, 1),
+    "age": (25, 85),
+    "hypertension": (0, 1),
+    "heart_disease": (0, 1),
+    "ever_married": (0, 1),
+    "work_type": (0, 4),
+    "residence_type": (0, 1),
+    "avg_glucose_level": (80.0, 250.0),
+    "bmi": (18.0, 45.0),
+    "smoking_status": (0, 3),
+}
+DISEASE_RANGES = {
+    "heart": HEART_RANGES,
+    "hypertension": HEART_RANGES,
+    "diabetes": DIABETES_RANGES,
+    "stroke": STROKE_RANGES,
+}
+
+# One fixed, valid input per disease (predictor.FEATURE_ORDER): the pipeline smoke test
+# (test_pipeline.py) and the worker warm-up (warmup.py) run these
+SAMPLE_INPUTS = {
+    "heart": {
+        "age": 52,
+        "sex": 1,
+        "cp": 0,
+        "trestbps": 125,
+        "chol": 212,
+        "fbs": 0,
+        "restecg": 1,
+        "thalach": 168,
+        "exang": 0,
+        "oldpeak": 1.0,
+        "slope": 2,
+        "ca": 2,
+        "thal": 3,
+    },
+    "hypertension": {
+        "age": 55,
+        "sex": 1,
+        "cp": 2,
+        "trestbps": 140,
+        "chol": 220,
+        "fbs": 1,
+        "restecg": 0,
+        "thalach": 145,
+        "exang": 0,
+        "oldpeak": 0.5,
+        "slope": 1,
+        "ca": 0,
+        "thal": 2,
+    },
+    "diabetes": {
+        "pregnancies": 2,
+        "glucose": 120,
+        "blood_pressure": 70,
+        "skin_thickness": 25,
+        "insulin": 100,
+        "bmi": 26.5,
+        "diabetes_pedigree_function": 0.5,
+        "age": 35,
+    },
+    "stroke": {
+        "gender": 1,
+        "age": 45,
+        "hypertension": 0,
+        "heart_disease": 0,
+        "ever_married": 1,
+        "work_type": 2,
+        "residence_type": 1,
+        "avg_glucose_level": 95.0,
+        "bmi": 24.0,
+        "smoking_status": 1,
+    },
+}
+
+
+def random_features(disease, rng=random):
+    """Generate a dict of random features within realistic medical ranges."""
+    ranges = DISEASE_RANGES.get(disease, {})
+    features = {}
+    for name, (lo, hi) in ranges.items():
+        if isinstance(lo, int) and isinstance(hi, int):
+            features[name] = rng.randint(lo, hi)
+        else:
+            features[name] = round(rng.uniform(lo, hi), 2)
+    return features
+
+
+def random_outcome(rng=random):
+    """Random { prediction, probability, risk_level } used when no model is available."""
+    probability = round(rng.uniform(0.1, 0.85), 4)
+    prediction = 1 if probability >= 0.5 else 0
+    risk_level = "Low" if probability <= 0.33 else "Moderate" if probability <= 0.66 else "High"
+    return {"prediction": prediction, "probability": probability, "risk_level": risk_level}
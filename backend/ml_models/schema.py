@@ -0,0 +1,181 @@
+"""
+Feature schemas: what each model input may hold, checked once per request or batch.
+
+FEATURES describes every feature name used in predictor.FEATURE_ORDER (bounds,
+integer codes, categorical domain; the same name means the same thing across
+diseases). A Schema compiles the specs for one disease's column order into
+NumPy arrays, then
+
+- validate(features) coerces one dict (the POST /api/predict/ body) to a float
+  row or raises FeatureValidationError with every failing field;
+- validate_columns(frame) checks a whole DataFrame (CSV ingestion) column-wise
+  and returns the float matrix with per-field masks of the bad rows.
+
+Codes and ranges follow the prediction form (frontend PredictPage FIELD_CONFIG);
+upper bounds on measurements only catch unit or typing mistakes.
+"""
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Feature:
+    """One model input: allowed [low, high], integer-only, or one of `choices`."""
+
+    low: float = 0.0
+    high: float = np.inf
+    integer: bool = False
+    choices: tuple = ()
+
+
+def categorical(*choices):
+    return Feature(low=min(choices), high=max(choices), integer=True, choices=tuple(choices))
+
+
+BINARY = categorical(0, 1)
+
+FEATURES = {
+    # Shared
+    "age": Feature(high=120),
+    "sex": BINARY,
+    "bmi": Feature(high=100),
+    # Heart / hypertension (UCI heart disease coding)
+    "cp": categorical(0, 1, 2, 3),
+    "trestbps": Feature(high=300),
+    "chol": Feature(high=1000),
+    "fbs": BINARY,
+    "restecg": categorical(0, 1, 2),
+    "thalach": Feature(high=300),
+    "exang": BINARY,
+    "oldpeak": Feature(low=-10, high=10),
+    "slope": categorical(0, 1, 2),
+    "ca": categorical(0, 1, 2, 3),
+    "thal": categorical(0, 1, 2, 3),
+    # Diabetes (Pima)
+    "pregnancies": Feature(high=30, integer=True),
+    "glucose": Feature(high=1000),
+    "blood_pressure": Feature(high=300),
+    "skin_thickness": Feature(high=100),
+    "insulin": Feature(high=1000),
+    "diabetes_pedigree_function": Feature(high=5),
+    # Stroke (label-encoded as in train_stroke)
+    "gender": BINARY,
+    "hypertension": BINARY,
+    "heart_disease": BINARY,
+    "ever_married": BINARY,
+    "work_type": categorical(0, 1, 2, 3, 4),
+    "residence_type": BINARY,
+    "avg_glucose_level": Feature(high=1000),
+    "smoking_status": categorical(0, 1, 2, 3),
+}
+
+REQUIRED = "Required."
+NOT_A_NUMBER = "Must be a number."
+
+
+class FeatureValidationError(ValueError):
+    """Invalid features; `errors` maps each failing field to a list of messages."""
+
+    def __init__(self, disease, errors):
+        self.disease = disease
+        self.errors = errors
+        detail = "; ".join(f"{name}: {messages[0]}" for name, messages in errors.items())
+        super().__init__(f"Invalid features for {disease}: {detail}")
+
+
+@dataclass
+class ColumnCheck:
+    """Result of Schema.validate_columns()."""
+
+    values: np.ndarray  # float64, rows x features, NaN where invalid
+    valid: np.ndarray  # bool per row
+    invalid: dict  # field -> bool mask of rows failing it (only failing fields)
+
+
+def _domain_message(feature):
+    if feature.choices:
+        return f"Must be one of {', '.join(str(c) for c in feature.choices)}."
+    if feature.integer:
+        return f"Must be a whole number between {feature.low:g} and {feature.high:g}."
+    if np.isinf(feature.high):
+        return f"Must be at least {feature.low:g}."
+    return f"Must be between {feature.low:g} and {feature.high:g}."
+
+
+class Schema:
+    """FEATURES compiled for one disease's column order."""
+
+    def __init__(self, disease, names):
+        self.disease = disease
+        self.names = tuple(names)
+        specs = [FEATURES[name] for name in self.names]
+        self.low = np.array([f.low for f in specs], dtype=float)
+        self.high = np.array([f.high for f in specs], dtype=float)
+        self.integer = np.array([f.integer for f in specs])
+        # Categorical domains that are not just every integer in [low, high]
+        self.choices = {
+            i: np.array(f.choices, dtype=float)
+            for i, f in enumerate(specs)
+            if f.choices and len(f.choices) != f.high - f.low + 1
+        }
+        self.messages = tuple(_domain_message(f) for f in specs)
+        self._specs = tuple(
+            (name, f.low, f.high, f.integer, frozenset(f.choices), message)
+            for name, f, message in zip(self.names, specs, self.messages)
+        )
+
+    def _out_of_domain(self, values):
+        """Bool mask of finite values (rows x features) that are not allowed."""
+        bad = (values < self.low) | (values > self.high) | (self.integer & (values != np.round(values)))
+        for i, choices in self.choices.items():
+            bad[..., i] |= ~np.isin(values[..., i], choices)
+        return bad & np.isfinite(values)
+
+    def validate(self, features):
+        """
+        Float row (ndarray in self.names order) from a dict of name -> number
+        (numbers, numeric strings and booleans are accepted). Raises
+        FeatureValidationError listing every missing, non-numeric or
+        out-of-range field.
+        """
+        if not isinstance(features, dict):
+            raise FeatureValidationError(self.disease, {"features": ["Must be an object of feature name -> number."]})
+        # One row is cheaper to check in plain Python than through NumPy ufuncs
+        row = []
+        errors = {}
+        for name, low, high, integer, choices, message in self._specs:
+            value = features.get(name)
+            if value is None or value == "":
+                errors[name] = [REQUIRED]
+                continue
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                errors[name] = [NOT_A_NUMBER]
+                continue
+            if not math.isfinite(value):
+                errors[name] = [NOT_A_NUMBER]
+            elif not low <= value <= high or (integer and not value.is_integer()) or (choices and value not in choices):
+                errors[name] = [message]
+            row.append(value)
+        if errors:
+            raise FeatureValidationError(self.disease, errors)
+        return np.array(row)
+
+    def validate_columns(self, frame):
+        """
+        Check every row of a DataFrame holding self.names columns in one pass:
+        values are coerced with pd.to_numeric, and missing, non-numeric or
+        out-of-range cells mark their row invalid.
+        """
+        values = np.column_stack([
+            pd.to_numeric(frame[name], errors="coerce").to_numpy(dtype=float, na_value=np.nan) for name in self.names
+        ])
+        with np.errstate(invalid="ignore"):
+            bad = ~np.isfinite(values) | self._out_of_domain(values)
+        values[bad] = np.nan
+        invalid = {self.names[i]: bad[:, i] for i in np.flatnonzero(bad.any(axis=0))}
+        return ColumnCheck(values=values, valid=~bad.any(axis=1), invalid=invalid)
@@ -4,7 +4,6 @@ Creates demo_patient / demo123, demo_provider / demo123, and 10 sample predictio
 Run from backend/: python ml_models/seed_demo_data.py
 """
 import os
-import random
 import sys
 
 # Configure Django before importing apps
@@ -18,66 +17,10 @@ django.setup()
 from django.contrib.auth import get_user_model
 from apps.patients.models import Patient
 from apps.predictions.models import Prediction
+from ml_models.samples import random_features, random_outcome
 
 User = get_user_model()
 
-# Realistic clinical ranges (min, max) per feature for random sampling
-HEART_RANGES = {
-    "age": (35, 75),
-    "sex": (0, 1),
-    "cp": (0, 3),
-    "trestbps": (110, 180),
-    "chol": (150, 350),
-    "fbs": (0, 1),
-    "restecg": (0, 2),
-    "thalach": (90, 180),
-    "exang": (0, 1),
-    "oldpeak": (0.0, 4.0),
-    "slope": (0, 2),
-    "ca": (0, 3),
-    "thal": (0, 3),
-}
-DIABETES_RANGES = {
-    "pregnancies": (0, 15),
-    "glucose": (70, 200),
-    "blood_pressure": (60, 110),
-    "skin_thickness": (10, 60),
-    "insulin": (0, 300),
-    "bmi": (18.0, 45.0),
-    "diabetes_pedigree_function": (0.1, 2.5),
-    "age": (21, 80),
-}
-STROKE_RANGES = {
-    "gender": (0, 1),
-    "age": (25, 85),
-    "hypertension": (0, 1),
-    "heart_disease": (0, 1),
-    "ever_married": (0, 1),
-    "work_type": (0, 4),
-    "residence_type": (0, 1),
-    "avg_glucose_level": (80.0, 250.0),
-    "bmi": (18.0, 45.0),
-    "smoking_status": (0, 3),
-}
-DISEASE_RANGES = {
-    "heart": HEART_RANGES,
-    "hypertension": HEART_RANGES,
-    "diabetes": DIABETES_RANGES,
-    "stroke": STROKE_RANGES,
-}
-
-
-def random_features(disease):
-    """Generate a dict of random features within realistic medical ranges."""
-    ranges = DISEASE_RANGES.get(disease, {})
-    features = {}
-    for name, (lo, hi) in ranges.items():
-        if isinstance(lo, int) and isinstance(hi, int):
-            features[name] = random.randint(lo, hi)
-        else:
-            features[name] = round(random.uniform(lo, hi), 2)
-    return features
-
 
 def main():
     print("Seeding demo data...")
@@ -131,24 +74,17 @@ def main():
             if use_predictor:
                 try:
                     result = predict_disease(disease, features)
-                    prediction = result["prediction"]
-                    probability = result["probability"]
-                    risk_level = result["risk_level"]
                 except Exception:
-                    probability = round(random.uniform(0.1, 0.85), 4)
-                    prediction = 1 if probability >= 0.5 else 0
-                    risk_level = "Low" if probability <= 0.33 else "Moderate" if probability <= 0.66 else "High"
+                    result = random_outcome()
             else:
-                probability = round(random.uniform(0.1, 0.85), 4)
-                prediction = 1 if probability >= 0.5 else 0
-                risk_level = "Low" if probability <= 0.33 else "Moderate" if probability <= 0.66 else "High"
+                result = random_outcome()
 
             Prediction.objects.create(
                 patient=patient,
                 disease_type=disease,
-                prediction=prediction,
-                probability=probability,
-                risk_level=risk_level,
+                prediction=result["prediction"],
+                probability=result["probability"],
+                risk_level=result["risk_level"],
             )
             created += 1
 
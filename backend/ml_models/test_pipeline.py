@@ -19,62 +19,7 @@ import django
 django.setup()
 
 from ml_models.predictor import predict_disease, FEATURE_ORDER, SUPPORTED_DISEASES
-
-# Sample input dict per disease (numeric values only; must match FEATURE_ORDER)
-SAMPLE_INPUTS = {
-    "heart": {
-        "age": 52,
-        "sex": 1,
-        "cp": 0,
-        "trestbps": 125,
-        "chol": 212,
-        "fbs": 0,
-        "restecg": 1,
-        "thalach": 168,
-        "exang": 0,
-        "oldpeak": 1.0,
-        "slope": 2,
-        "ca": 2,
-        "thal": 3,
-    },
-    "hypertension": {
-        "age": 55,
-        "sex": 1,
-        "cp": 2,
-        "trestbps": 140,
-        "chol": 220,
-        "fbs": 1,
-        "restecg": 0,
-        "thalach": 145,
-        "exang": 0,
-        "oldpeak": 0.5,
-        "slope": 1,
-        "ca": 0,
-        "thal": 2,
-    },
-    "diabetes": {
-        "pregnancies": 2,
-        "glucose": 120,
-        "blood_pressure": 70,
-        "skin_thickness": 25,
-        "insulin": 100,
-        "bmi": 26.5,
-        "diabetes_pedigree_function": 0.5,
-        "age": 35,
-    },
-    "stroke": {
-        "gender": 1,
-        "age": 45,
-        "hypertension": 0,
-        "heart_disease": 0,
-        "ever_married": 1,
-        "work_type": 2,
-        "residence_type": 1,
-        "avg_glucose_level": 95.0,
-        "bmi": 24.0,
-        "smoking_status": 1,
-    },
-}
+from ml_models.samples import SAMPLE_INPUTS
 
 
 def main():
@@ -1,7 +1,7 @@
 """
 Train diabetes model as a single sklearn Pipeline.
 Pipeline: ColumnTransformer (StandardScaler for numeric) + RandomForestClassifier.
-Fit on raw DataFrame; save only diabetes.pkl. No separate scaler/encoder files.
+Fit on raw DataFrame; save only diabetes.pkl (plus diabetes_insights.json, see insights.py). No separate scaler/encoder files.
 Run from backend/: python -m ml_models.train_diabetes
 """
 import sys
@@ -16,6 +16,9 @@ from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+from .columns import normalize_columns
+from .insights import save_insights, summary
+
 # Must match predictor FEATURE_ORDER["diabetes"]
 FEATURE_COLUMNS = [
     "pregnancies",
@@ -45,15 +48,8 @@ def main():
         sys.exit(1)
 
     df = pd.read_csv(data_path)
-    # Normalize column names to lowercase with underscores to match FEATURE_COLUMNS if needed
-    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-    # Map common variants to our names
-    col_map = {
-        "bloodpressure": "blood_pressure",
-        "skinthickness": "skin_thickness",
-        "diabetespedigreefunction": "diabetes_pedigree_function",
-    }
-    df = df.rename(columns=col_map)
+    # Lowercase / underscore headers and map variants like "BloodPressure" to FEATURE_COLUMNS
+    df = normalize_columns(df)
 
     target_col = next((c for c in TARGET_COLUMNS if c in df.columns), None)
     if target_col is None:
@@ -89,6 +85,8 @@ def main():
     out_path = ML_MODELS_DIR / "diabetes.pkl"
     joblib.dump(pipeline, out_path)
     print(f"Saved pipeline to {out_path}")
+    # Importances and partial dependence served by GET /api/predict/diabetes/insights/
+    print(summary(*save_insights("diabetes", pipeline, X_test, y_test, source="held-out split")))
 
 
 if __name__ == "__main__":
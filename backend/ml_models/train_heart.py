@@ -1,7 +1,7 @@
 """
 Train heart disease model as a single sklearn Pipeline.
 Pipeline: ColumnTransformer (numeric -> StandardScaler) + RandomForestClassifier.
-Fit on raw DataFrame; save only heart.pkl. No *_scaler.pkl or encoders.
+Fit on raw DataFrame; save only heart.pkl (plus heart_insights.json, see insights.py). No *_scaler.pkl or encoders.
 Run from backend/: python -m ml_models.train_heart
 """
 import sys
@@ -16,6 +16,8 @@ from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+from .insights import save_insights, summary
+
 # Must match predictor FEATURE_ORDER["heart"]
 FEATURE_COLUMNS = [
     "age", "sex", "cp", "trestbps", "chol", "fbs", "restecg",
@@ -79,13 +81,13 @@ def main():
         print(f"Test accuracy: {acc:.4f}")
         prob = pl.predict_proba(sanity_df)[0][1]
         print(f"Sanity check (high-risk input) probability: {prob:.4f}")
-        return pl, prob
+        return pl, prob, (X_test, y_test)
 
-    pipeline, prob = train_and_check(y)
+    pipeline, prob, held_out = train_and_check(y)
     if prob < 0.3:
         print("Probability near 0 for high-risk input — target likely inverted. Retraining with y = 1 - y.")
         y_flipped = 1 - y
-        pipeline, prob = train_and_check(y_flipped)
+        pipeline, prob, held_out = train_and_check(y_flipped)
         if prob < 0.65:
             print("WARNING: Sanity probability still below 0.65 after flip. Check data and features.")
         else:
@@ -98,6 +100,8 @@ def main():
     out_path = ML_MODELS_DIR / "heart.pkl"
     joblib.dump(pipeline, out_path)
     print(f"Saved pipeline to {out_path}")
+    # Importances and partial dependence served by GET /api/predict/heart/insights/
+    print(summary(*save_insights("heart", pipeline, *held_out, source="held-out split")))
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
 """
 Train hypertension model as a single sklearn Pipeline.
 Pipeline: ColumnTransformer (StandardScaler for numeric) + RandomForestClassifier.
-Fit on raw DataFrame; save only hypertension.pkl. No separate scaler/encoder files.
+Fit on raw DataFrame; save only hypertension.pkl (plus hypertension_insights.json, see insights.py). No separate scaler/encoder files.
 Run from backend/: python -m ml_models.train_hypertension
 """
 import sys
@@ -16,6 +16,9 @@ from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+from .columns import normalize_columns
+from .insights import save_insights, summary
+
 # Must match predictor FEATURE_ORDER["hypertension"] exactly (13 features)
 FEATURE_COLUMNS = [
     "age", "sex", "cp", "trestbps", "chol", "fbs", "restecg",
@@ -41,7 +44,7 @@ def main():
         sys.exit(1)
 
     df = pd.read_csv(data_path)
-    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
+    df = normalize_columns(df)
 
     target_col = next((c for c in TARGET_COLUMNS if c in df.columns), None)
     if target_col is None:
@@ -77,6 +80,8 @@ def main():
     out_path = ML_MODELS_DIR / "hypertension.pkl"
     joblib.dump(pipeline, out_path)
     print(f"Saved pipeline to {out_path}")
+    # Importances and partial dependence served by GET /api/predict/hypertension/insights/
+    print(summary(*save_insights("hypertension", pipeline, X_test, y_test, source="held-out split")))
 
 
 if __name__ == "__main__":
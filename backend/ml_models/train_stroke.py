@@ -1,7 +1,7 @@
 """
 Train stroke model as a single sklearn Pipeline.
 Pipeline: ColumnTransformer (StandardScaler for numeric, OneHotEncoder for categorical if any) + RandomForestClassifier.
-Fit on raw DataFrame; save only stroke.pkl. No separate scaler/encoder files.
+Fit on raw DataFrame; save only stroke.pkl (plus stroke_insights.json, see insights.py). No separate scaler/encoder files.
 Run from backend/: python -m ml_models.train_stroke
 """
 import sys
@@ -16,6 +16,9 @@ from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
 
+from .columns import normalize_columns
+from .insights import save_insights, summary
+
 # Must match predictor FEATURE_ORDER["stroke"]
 FEATURE_COLUMNS = [
     "gender",
@@ -46,9 +49,7 @@ def main():
         sys.exit(1)
 
     df = pd.read_csv(data_path)
-    df.columns = df.columns.str.strip().str.lower().str.replace(" ", "_")
-    if "residence_type" not in df.columns and "residence type" in df.columns:
-        df = df.rename(columns={"residence type": "residence_type"})
+    df = normalize_columns(df)
 
     target_col = next((c for c in TARGET_COLUMNS if c in df.columns), None)
     if target_col is None:
@@ -94,6 +95,15 @@ def main():
     out_path = ML_MODELS_DIR / "stroke.pkl"
     joblib.dump(pipeline, out_path)
     print(f"Saved pipeline to {out_path}")
+    # Importances and partial dependence served by GET /api/predict/stroke/insights/; they
+    # perturb numeric columns, so string-coded datasets get them from compute_model_insights
+    if categorical_cols:
+        print(
+            "Skipping insights (categorical columns); run: "
+            "python manage.py compute_model_insights stroke --data <numeric-coded labelled.csv>"
+        )
+    else:
+        print(summary(*save_insights("stroke", pipeline, X_test, y_test, source="held-out split")))
 
 
 if __name__ == "__main__":
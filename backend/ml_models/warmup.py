@@ -0,0 +1,77 @@
+"""
+Model warm-up and the readiness state behind /readyz.
+
+The first prediction per disease on a fresh worker pays for reading and
+unpickling the .pkl and for scikit-learn's first-call allocations. warm_up()
+does that up front: it loads each model and scores its canned
+samples.SAMPLE_INPUTS row once, with an explanation so the tree tables of
+ml_models.explain are built too, recording how long both took. Workers run it
+when they boot (model_loader.preload); with ML_MODEL_PRELOAD=False, /readyz
+starts it in a background thread and reports not ready until it is done.
+"""
+import logging
+import threading
+import time
+
+from .model_loader import DISEASE_MODEL_FILENAMES, get_model, load_seconds
+from .samples import SAMPLE_INPUTS
+
+logger = logging.getLogger(__name__)
+
+# disease -> {"loaded", "warmed", "load_ms", "warmup_ms", "error"}; absent until warmed up
+_state = {}
+_lock = threading.Lock()
+_thread = None
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def warm_up(diseases=None) -> dict:
+    """
+    Load and run one inference for each disease (default: all supported ones),
+    recording per-disease timings or the error; returns status().
+    """
+    from .predictor import predict_disease
+
+    for disease in diseases or DISEASE_MODEL_FILENAMES:
+        entry = {"loaded": False, "warmed": False, "load_ms": None, "warmup_ms": None, "error": None}
+        try:
+            get_model(disease)
+            entry["loaded"] = True
+            entry["load_ms"] = _ms(load_seconds().get(disease))
+            start = time.perf_counter()
+            predict_disease(disease, SAMPLE_INPUTS[disease], explain=True)
+            entry["warmup_ms"] = _ms(time.perf_counter() - start)
+            entry["warmed"] = True
+        except Exception as e:
+            # Reported by name only: /readyz is unauthenticated and messages carry paths
+            entry["error"] = type(e).__name__
+            logger.warning("Warm-up failed for disease=%s: %s", disease, e)
+        with _lock:
+            _state[disease] = entry
+    return status()
+
+
+def status() -> dict:
+    """{"ready": every supported model loaded and warmed, "models": {disease: entry or None}}."""
+    with _lock:
+        models = {disease: dict(_state[disease]) if disease in _state else None for disease in DISEASE_MODEL_FILENAMES}
+    return {"ready": all(entry and entry["warmed"] for entry in models.values()), "models": models}
+
+
+def start_background() -> None:
+    """Run warm_up() in a daemon thread unless one is already running."""
+    global _thread
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=warm_up, name="model-warmup", daemon=True)
+        _thread.start()
+
+
+def reset() -> None:
+    """Forget warm-up results (tests)."""
+    with _lock:
+        _state.clear()
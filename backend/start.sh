@@ -4,4 +4,13 @@
 # so we must migrate here to create tables like accounts_user.
 set -o errexit
 python manage.py migrate --noinput
+# Keep upcoming monthly prediction partitions in place; a no-op unless the table
+# was converted with --convert (see PREDICTION_PARTITION_MONTHS_AHEAD and
+# PREDICTION_RETENTION_MONTHS).
+python manage.py manage_prediction_partitions
+# Per-worker metric files from a previous run would be summed into /metrics.
+if [ -n "${METRICS_MULTIPROC_DIR:-}" ]; then
+  rm -rf "$METRICS_MULTIPROC_DIR"
+  mkdir -p "$METRICS_MULTIPROC_DIR"
+fi
 exec gunicorn config.wsgi:application "$@"
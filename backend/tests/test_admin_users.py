@@ -0,0 +1,67 @@
+"""
+Django test: admin user list keyset pagination, role / search filters and the
+count endpoint (apps/accounts/admin_views.py).
+Run from backend: python manage.py test tests.test_admin_users
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class AdminUserListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="au_admin", password="testpass123", role=User.Role.ADMIN)
+        for i in range(7):
+            User.objects.create_user(
+                username=f"au_patient_{i}",
+                email=f"patient{i}@clinic.example",
+                full_name=f"Amina Patient {i}",
+                password="testpass123",
+                role=User.Role.PATIENT,
+            )
+        User.objects.create_user(
+            username="au_doctor", full_name="Jean Doctor", password="testpass123", role=User.Role.PROVIDER
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_keyset_pages_cover_every_user_once(self):
+        seen = []
+        url = "/api/admin/users/?limit=3"
+        while url:
+            body = self.client.get(url).json()
+            self.assertLessEqual(len(body["results"]), 3)
+            seen.extend(u["id"] for u in body["results"])
+            url = f"/api/admin/users/?limit=3&cursor={body['next_cursor']}" if body["next_cursor"] else None
+        expected = list(User.objects.order_by("-date_joined", "-id").values_list("id", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_role_and_prefix_filters(self):
+        body = self.client.get("/api/admin/users/?role=provider").json()
+        self.assertEqual([u["username"] for u in body["results"]], ["au_doctor"])
+        # Case-insensitive prefix on username, email or full name
+        self.assertEqual(len(self.client.get("/api/admin/users/?q=AMINA").json()["results"]), 7)
+        self.assertEqual(len(self.client.get("/api/admin/users/?q=patient3@").json()["results"]), 1)
+        self.assertEqual(self.client.get("/api/admin/users/?q=doctor").json()["results"], [])
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get("/api/admin/users/?limit=0").status_code, 400)
+        self.assertEqual(self.client.get("/api/admin/users/?cursor=not-a-cursor").status_code, 400)
+
+    def test_count(self):
+        response = self.client.get("/api/admin/users/count/?q=au_")
+        self.assertEqual(response.json(), {"count": 9, "estimated": False})
+
+    def test_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(username="au_doctor"))
+        self.assertEqual(client.get("/api/admin/users/").status_code, 403)
+        self.assertEqual(client.get("/api/admin/users/count/").status_code, 403)
@@ -0,0 +1,53 @@
+"""
+Django test: the accounts system checks reject stateless JWT with a per-process
+revocation cache and warn about read replicas with a per-process pin cache.
+Run from backend: python manage.py test tests.test_checks
+"""
+from django.test import SimpleTestCase, override_settings
+
+from apps.accounts.checks import check_replica_pin_cache, check_revocation_cache
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+REDIS = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://localhost:6379/0"}}
+SHARED = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "revocations": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://localhost:6379/0"},
+}
+
+
+class RevocationCacheCheckTests(SimpleTestCase):
+    def ids(self):
+        return [error.id for error in check_revocation_cache(None)]
+
+    @override_settings(JWT_STATELESS=False, CACHES=LOCMEM)
+    def test_database_backed_auth_needs_nothing(self):
+        self.assertEqual(self.ids(), [])
+
+    @override_settings(JWT_STATELESS=True, JWT_REVOCATION_CACHE="default", CACHES=LOCMEM)
+    def test_stateless_with_locmem_is_an_error(self):
+        self.assertEqual(self.ids(), ["accounts.E002"])
+
+    @override_settings(JWT_STATELESS=True, JWT_REVOCATION_CACHE="revocations", CACHES=SHARED)
+    def test_stateless_with_shared_cache_passes(self):
+        self.assertEqual(self.ids(), [])
+
+    @override_settings(JWT_STATELESS=True, JWT_REVOCATION_CACHE="missing", CACHES=LOCMEM)
+    def test_unknown_alias_is_an_error(self):
+        self.assertEqual(self.ids(), ["accounts.E001"])
+
+
+class ReplicaPinCacheCheckTests(SimpleTestCase):
+    def ids(self):
+        return [warning.id for warning in check_replica_pin_cache(None)]
+
+    @override_settings(DATABASE_REPLICAS=[], CACHES=LOCMEM)
+    def test_no_replicas_needs_nothing(self):
+        self.assertEqual(self.ids(), [])
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"], CACHES=LOCMEM)
+    def test_replicas_with_locmem_warns(self):
+        self.assertEqual(self.ids(), ["accounts.W001"])
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"], CACHES=REDIS)
+    def test_replicas_with_shared_cache_passes(self):
+        self.assertEqual(self.ids(), [])
@@ -0,0 +1,84 @@
+"""
+Django test: CompressionMiddleware (config/compression.py) negotiates gzip,
+skips small, exempt and already-encoded bodies, compresses streaming responses
+chunk by chunk and records the metrics.
+Run from backend: python manage.py test tests.test_compression
+"""
+import gzip
+import json
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.monitoring import metrics
+from config.compression import CompressionMiddleware, negotiate
+
+BODY = json.dumps([{"id": i, "disease_type": "heart", "risk_level": "Low"} for i in range(200)]).encode()
+
+
+def middleware(response):
+    return CompressionMiddleware(lambda request: response)
+
+
+@override_settings(COMPRESSION_MIN_BYTES=1024, COMPRESSION_EXEMPT_PATHS=["/api/auth/"])
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        metrics.reset()
+        self.factory = RequestFactory()
+
+    def get(self, response, path="/api/predictions/", accept="gzip, deflate"):
+        return middleware(response)(self.factory.get(path, HTTP_ACCEPT_ENCODING=accept))
+
+    def test_json_is_gzipped(self):
+        response = self.get(HttpResponse(BODY, content_type="application/json"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertEqual(metrics.COMPRESSION_BYTES.values[("gzip", "in")], len(BODY))
+        self.assertEqual(metrics.COMPRESSION_BYTES.values[("gzip", "out")], len(response.content))
+        self.assertEqual(sum(metrics.COMPRESSION_RATIO.values[("gzip",)][:-1]), 1)
+        self.assertIn(("gzip",), metrics.COMPRESSION_CPU.values)
+
+    def test_strong_etag_is_weakened(self):
+        original = HttpResponse(BODY, content_type="application/json")
+        original["ETag"] = '"abc"'
+        self.assertEqual(self.get(original)["ETag"], 'W/"abc"')
+
+    def test_left_alone(self):
+        cases = {
+            "small": (HttpResponse(b'{"ok": true}', content_type="application/json"), "/api/predictions/", "gzip"),
+            "not accepted": (HttpResponse(BODY, content_type="application/json"), "/api/predictions/", "identity"),
+            "refused": (HttpResponse(BODY, content_type="application/json"), "/api/predictions/", "gzip;q=0"),
+            "binary": (HttpResponse(BODY, content_type="application/gzip"), "/api/predictions/", "gzip"),
+            "exempt": (HttpResponse(BODY, content_type="application/json"), "/api/auth/login/", "gzip"),
+        }
+        for case, (original, path, accept) in cases.items():
+            with self.subTest(case):
+                response = self.get(original, path=path, accept=accept)
+                self.assertFalse(response.has_header("Content-Encoding"))
+                self.assertEqual(response.content, original.content)
+        encoded = HttpResponse(b"x" * 2048, content_type="text/css")
+        encoded["Content-Encoding"] = "br"
+        self.assertEqual(self.get(encoded)["Content-Encoding"], "br")
+        self.assertEqual(metrics.COMPRESSION_SKIPPED.values[("small",)], 1)
+        self.assertEqual(metrics.COMPRESSION_SKIPPED.values[("not_accepted",)], 2)
+
+    def test_streaming_is_compressed_per_chunk(self):
+        chunks = [BODY[i:i + 500] for i in range(0, len(BODY), 500)]
+        response = self.get(StreamingHttpResponse(iter(chunks), content_type="text/csv"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        parts = list(response.streaming_content)
+        # One flushed block per input chunk plus the trailer
+        self.assertEqual(len(parts), len(chunks) + 1)
+        self.assertEqual(gzip.decompress(b"".join(parts)), BODY)
+        self.assertEqual(metrics.COMPRESSION_BYTES.values[("gzip", "in")], len(BODY))
+
+    def test_negotiate(self):
+        self.assertEqual(negotiate("gzip, deflate, br", ("br", "gzip")), "br")
+        self.assertEqual(negotiate("br;q=0.5, gzip", ("br", "gzip")), "gzip")
+        self.assertEqual(negotiate("*", ("br", "gzip")), "br")
+        self.assertEqual(negotiate("*, br;q=0", ("br", "gzip")), "gzip")
+        self.assertIsNone(negotiate("", ("br", "gzip")))
+        self.assertIsNone(negotiate("deflate", ("gzip",)))
@@ -0,0 +1,136 @@
+"""
+Django test: ETag on prediction history, ETag / Last-Modified on the patient profile and
+admin stats; matching conditional GETs get 304 from the cheap markers.
+Run from backend: python manage.py test tests.test_conditional
+"""
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from apps.accounts import stats_version
+from apps.patients import cache as patient_cache
+from apps.patients.models import Patient
+from apps.predictions.models import Prediction
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="cg_admin", password="testpass123", role=User.Role.ADMIN)
+        cls.provider = User.objects.create_user(username="cg_provider", password="testpass123", role=User.Role.PROVIDER)
+        user = User.objects.create_user(username="cg_patient", password="testpass123", role=User.Role.PATIENT)
+        cls.patient = Patient.objects.create(user=user)
+        for disease in ("heart", "stroke"):
+            cls.add_prediction(disease)
+
+    @classmethod
+    def add_prediction(cls, disease):
+        return Prediction.objects.create(
+            patient=cls.patient, disease_type=disease, prediction=0, probability=0.2, risk_level="Low"
+        )
+
+    def setUp(self):
+        cache.clear()
+        patient_cache.clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_history_etag_and_304(self):
+        client = self.client_for(self.patient.user)
+        first = client.get("/api/predictions/history/")
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first["ETag"].startswith('W/"history-'))
+        self.assertIn("no-cache", first["Cache-Control"])
+        self.assertIn("Authorization", first["Vary"])
+
+        # Patient id is cached by now: only the marker aggregate runs
+        with self.assertNumQueries(1):
+            again = client.get("/api/predictions/history/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again["ETag"], first["ETag"])
+        self.assertEqual(again.content, b"")
+
+        self.add_prediction("diabetes")
+        changed = client.get("/api/predictions/history/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(len(changed.json()), 3)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+
+    def test_provider_history_etag_only(self):
+        client = self.client_for(self.provider)
+        path = f"/api/predictions/?patient_id={self.patient.id}"
+        first = client.get(path)
+        self.assertNotIn("Last-Modified", first)
+        self.assertEqual(client.get(path, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        # A back-filled older row changes the history; If-Modified-Since alone never gets a 304
+        backfill = self.add_prediction("diabetes")
+        Prediction.objects.filter(pk=backfill.pk).update(created_at=backfill.created_at - timedelta(days=30))
+        again = client.get(path, HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(len(again.json()), 3)
+        self.assertEqual(client.get(path, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 200)
+        missing = client.get("/api/predictions/?patient_id=999999", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(missing.status_code, 404)
+
+    def test_patient_profile(self):
+        client = self.client_for(self.patient.user)
+        first = client.get("/api/patients/me/")
+        self.assertEqual(client.get("/api/patients/me/", HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+        user = self.patient.user
+        user.full_name = "Renamed"
+        user.save()
+        changed = client.get("/api/patients/me/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["user"]["full_name"], "Renamed")
+
+    def test_admin_stats_version(self):
+        client = self.client_for(self.admin)
+        first = client.get("/api/admin/stats/")
+        self.assertEqual(first.status_code, 200)
+        with self.assertNumQueries(0):
+            again = client.get("/api/admin/stats/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_prediction("diabetes")
+            self.add_prediction("heart")
+        changed = client.get("/api/admin/stats/", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.json()["total_predictions"], 4)
+
+        # Non-admins still get 403, never a 304
+        denied = self.client_for(self.provider).get("/api/admin/stats/", HTTP_IF_NONE_MATCH=changed["ETag"])
+        self.assertEqual(denied.status_code, 403)
+
+    def test_stats_version_bumps_once_per_commit(self):
+        with mock.patch.object(stats_version.cache, "set", wraps=stats_version.cache.set) as cache_set:
+            with self.captureOnCommitCallbacks(execute=True):
+                for _ in range(3):
+                    stats_version.bump()
+            self.assertEqual(cache_set.call_count, 1)
+
+            # A bump rolled back with its savepoint does not swallow the next one
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        stats_version.bump()
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+            self.assertEqual(cache_set.call_count, 1)
+            with self.captureOnCommitCallbacks(execute=True):
+                stats_version.bump()
+            self.assertEqual(cache_set.call_count, 2)
@@ -0,0 +1,62 @@
+"""
+Django test: read-replica routing and read-your-writes pinning (config/routers.py).
+Replica aliases are only named in settings here; routing decisions are checked
+through django.db.router, and HTTP tests point DATABASE_REPLICAS at "default".
+Run from backend: python manage.py test tests.test_db_routing
+"""
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.patients.models import Patient
+from apps.predictions.models import Prediction
+from config.routers import pin_to_primary, replica_reads
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+
+@replica_reads
+def _routing_view(request):
+    return router.db_for_read(Prediction), router.db_for_write(Prediction)
+
+
+class ReplicaRouterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="rr_patient", password="testpass123", role=User.Role.PATIENT)
+        cls.patient = Patient.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_reads_primary(self):
+        self.assertEqual(_routing_view(SimpleNamespace(user=self.user)), ("default", "default"))
+
+    @override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"])
+    def test_reads_go_to_replica_writes_to_primary(self):
+        read_db, write_db = _routing_view(SimpleNamespace(user=self.user))
+        self.assertIn(read_db, ["replica_1", "replica_2"])
+        self.assertEqual(write_db, "default")
+        # Only inside decorated views
+        self.assertEqual(router.db_for_read(Prediction), "default")
+
+    @override_settings(DATABASE_REPLICAS=["replica_1"])
+    def test_pinned_user_reads_primary(self):
+        pin_to_primary(self.user)
+        self.assertEqual(_routing_view(SimpleNamespace(user=self.user))[0], "default")
+
+    @override_settings(DATABASE_REPLICAS=["default"], REPLICA_PIN_SECONDS=5)
+    def test_write_pins_user(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get("/api/predictions/").status_code, 200)
+        self.assertIsNone(cache.get(f"db-pin:{self.user.pk}"))
+        response = client.post("/api/predict/heart/", {"features": HEART_FEATURES}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(cache.get(f"db-pin:{self.user.pk}"))
@@ -0,0 +1,81 @@
+"""
+Django test: decision path contributions (ml_models/explain.py) add up to the
+forest's probability, match a per-tree walk, and come back from the predict
+endpoint with explain=true.
+Run from backend: python manage.py test tests.test_explain
+"""
+import random
+
+import numpy as np
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from sklearn.linear_model import LogisticRegression
+
+from apps.patients.models import Patient
+from ml_models.explain import explain_row, tables_for
+from ml_models.model_loader import get_model
+from ml_models.predictor import FEATURE_ORDER, SCHEMAS
+from ml_models.samples import random_features
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+
+class TreeContributionTests(SimpleTestCase):
+    def frame(self, disease, n, seed=3):
+        rng = random.Random(seed)
+        rows = [SCHEMAS[disease].validate(random_features(disease, rng)) for _ in range(n)]
+        return pd.DataFrame(np.array(rows), columns=FEATURE_ORDER[disease])
+
+    def test_contributions_add_up_to_probability(self):
+        for disease in FEATURE_ORDER:
+            with self.subTest(disease):
+                model = get_model(disease)
+                frame = self.frame(disease, 50)
+                tables = tables_for(model)
+                contributions = tables.contributions(model[:-1].transform(frame))
+                np.testing.assert_allclose(
+                    tables.base_value + contributions.sum(axis=1), model.predict_proba(frame)[:, 1], atol=1e-9
+                )
+
+    def test_matches_per_tree_walk(self):
+        model = get_model("heart")
+        forest = model.steps[-1][1]
+        X = model[:-1].transform(self.frame("heart", 1)).astype(np.float32)
+        expected = np.zeros(X.shape[1])
+        for tree in forest.estimators_:
+            value = tree.tree_.value[:, 0, 1] / tree.tree_.value[:, 0, :].sum(axis=1)
+            path = tree.decision_path(X).indices
+            for parent, child in zip(path[:-1], path[1:]):
+                expected[tree.tree_.feature[parent]] += (value[child] - value[parent]) / len(forest.estimators_)
+        np.testing.assert_allclose(tables_for(model).contributions(X)[0], expected, atol=1e-12)
+
+    def test_non_tree_model_is_not_explained(self):
+        frame = self.frame("diabetes", 20)
+        model = LogisticRegression().fit(frame, np.arange(20) % 2)
+        self.assertIsNone(explain_row(model, frame.iloc[:1]))
+
+
+class PredictExplainTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="explain_patient", password="testpass123", role=User.Role.PATIENT)
+        Patient.objects.create(user=user)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_explain_flag(self):
+        response = self.client.post("/api/predict/heart/", {"features": HEART_FEATURES, "explain": True}, format="json")
+        self.assertEqual(response.status_code, 201)
+        explanation = response.json()["explanation"]
+        self.assertEqual(set(explanation["contributions"]), set(FEATURE_ORDER["heart"]))
+        magnitudes = [abs(v) for v in explanation["contributions"].values()]
+        self.assertEqual(magnitudes, sorted(magnitudes, reverse=True))
+        total = explanation["base_value"] + sum(explanation["contributions"].values())
+        self.assertAlmostEqual(total, response.json()["probability"], delta=0.001)
+
+        query = self.client.post("/api/predict/heart/?explain=true", {"features": HEART_FEATURES}, format="json")
+        self.assertIn("explanation", query.json())
+        plain = self.client.post("/api/predict/heart/", {"features": HEART_FEATURES}, format="json")
+        self.assertNotIn("explanation", plain.json())
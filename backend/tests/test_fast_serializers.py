@@ -0,0 +1,81 @@
+"""
+Django test: the values_list() read paths of the prediction and patient endpoints
+(prediction_rows, patient_row) return byte-identical JSON to the ModelSerializers.
+Run from backend: python manage.py test tests.test_fast_serializers
+"""
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.patients.models import Patient
+from apps.patients.serializers import PatientSerializer
+from apps.predictions.models import Prediction
+from apps.predictions.serializers import PredictionSerializer
+
+User = get_user_model()
+
+
+class FastSerializerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = User.objects.create_user(username="fs_provider", password="testpass123", role=User.Role.PROVIDER)
+        user = User.objects.create_user(
+            username="fs_patient",
+            password="testpass123",
+            role=User.Role.PATIENT,
+            email="fs@test.example",
+            full_name="Fast Serializer",
+            date_of_birth=date(1970, 5, 17),
+            medical_license=None,
+        )
+        cls.patient = Patient.objects.create(user=user)
+        for i, disease in enumerate(("heart", "diabetes", "stroke")):
+            Prediction.objects.create(
+                patient=cls.patient,
+                disease_type=disease,
+                prediction=i % 2,
+                probability=0.1234 * (i + 1),
+                risk_level="Low",
+                created_at=datetime(2026, 1, 2 + i, 9, 30, 15, 250000 * i, tzinfo=dt_timezone.utc),
+            )
+
+    def get(self, path, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.content
+
+    def expected(self, data):
+        return JSONRenderer().render(data)
+
+    def check_all(self):
+        predictions = Prediction.objects.filter(patient=self.patient)
+        self.assertEqual(
+            self.get(f"/api/predictions/?patient_id={self.patient.id}", self.provider),
+            self.expected(PredictionSerializer(predictions, many=True).data),
+        )
+        self.assertEqual(
+            self.get("/api/predictions/", self.patient.user),
+            self.expected(PredictionSerializer(predictions, many=True).data),
+        )
+        first = predictions.first()
+        self.assertEqual(
+            self.get(f"/api/predictions/{first.pk}/", self.patient.user),
+            self.expected(PredictionSerializer(first).data),
+        )
+        patient = Patient.objects.select_related("user").get(pk=self.patient.pk)
+        self.assertEqual(self.get("/api/patients/me/", self.patient.user), self.expected(PatientSerializer(patient).data))
+        self.assertEqual(
+            self.get(f"/api/patients/{patient.pk}/", self.provider), self.expected(PatientSerializer(patient).data)
+        )
+
+    def test_same_json_as_model_serializers(self):
+        self.check_all()
+
+    @override_settings(TIME_ZONE="Africa/Kigali")
+    def test_same_json_in_local_time_zone(self):
+        self.check_all()
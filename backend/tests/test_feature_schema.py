@@ -0,0 +1,63 @@
+"""
+Django test: feature schemas (ml_models/schema.py) for single requests and batches,
+and the structured 400 from the predict endpoint.
+Run from backend: python manage.py test tests.test_feature_schema
+"""
+import numpy as np
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from apps.patients.models import Patient
+from ml_models.predictor import FEATURE_ORDER, SCHEMAS
+from ml_models.schema import FeatureValidationError
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+
+class SchemaTests(SimpleTestCase):
+    def test_validate_coerces_in_feature_order(self):
+        features = {**HEART_FEATURES, "age": "55", "sex": True}
+        row = SCHEMAS["heart"].validate(features)
+        self.assertEqual(row.dtype, np.float64)
+        self.assertEqual(row.tolist(), [float(features[name]) for name in FEATURE_ORDER["heart"]])
+
+    def test_validate_reports_every_field(self):
+        features = {**HEART_FEATURES, "cp": 7, "chol": "high", "thal": 1.5, "oldpeak": float("nan")}
+        del features["age"]
+        with self.assertRaises(FeatureValidationError) as ctx:
+            SCHEMAS["heart"].validate(features)
+        errors = ctx.exception.errors
+        self.assertEqual(list(errors), ["age", "cp", "chol", "oldpeak", "thal"])
+        self.assertEqual(errors["age"], ["Required."])
+        self.assertEqual(errors["chol"], ["Must be a number."])
+        self.assertEqual(errors["oldpeak"], ["Must be a number."])
+        self.assertIn("0, 1, 2, 3", errors["cp"][0])
+
+    def test_validate_columns_masks_bad_rows(self):
+        frame = pd.DataFrame([HEART_FEATURES] * 4)
+        frame.loc[1, "chol"] = "n/a"
+        frame.loc[2, "age"] = -3
+        frame.loc[3, "sex"] = None
+        check = SCHEMAS["heart"].validate_columns(frame)
+        self.assertEqual(check.values.shape, (4, len(FEATURE_ORDER["heart"])))
+        self.assertEqual(check.valid.tolist(), [True, False, False, False])
+        self.assertEqual(sorted(check.invalid), ["age", "chol", "sex"])
+        self.assertEqual(check.invalid["age"].tolist(), [False, False, True, False])
+
+
+class PredictValidationTests(TestCase):
+    def test_invalid_features_return_field_errors(self):
+        user = User.objects.create_user(username="schema_patient", password="testpass123", role=User.Role.PATIENT)
+        Patient.objects.create(user=user)
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.post(
+            "/api/predict/heart/", {"features": {**HEART_FEATURES, "slope": 5, "ca": "x"}}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        data = response.json()
+        self.assertEqual(sorted(data["errors"]), ["ca", "slope"])
+        self.assertIn("slope", data["error"])
@@ -0,0 +1,61 @@
+"""
+Django test: /healthz liveness and /readyz readiness (database reachable, every
+model loaded and warmed up on its canned sample, with timings).
+Run from backend: python manage.py test tests.test_health
+"""
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TestCase
+
+from ml_models import warmup
+from ml_models.model_loader import DISEASE_MODEL_FILENAMES
+
+
+class HealthCheckTests(TestCase):
+    def setUp(self):
+        warmup.reset()
+        self.addCleanup(warmup.reset)
+
+    def test_healthz(self):
+        response = self.client.get("/healthz")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_not_ready_until_warmed_up(self):
+        with mock.patch.object(warmup, "start_background") as start:
+            response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "not_ready")
+        self.assertTrue(response.json()["database"]["ok"])
+        start.assert_called_once()
+
+    def test_ready_after_warm_up(self):
+        result = warmup.warm_up()
+        self.assertTrue(result["ready"])
+        with mock.patch.object(warmup, "start_background") as start:
+            response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["status"], "ready")
+        self.assertEqual(set(body["models"]), set(DISEASE_MODEL_FILENAMES))
+        for entry in body["models"].values():
+            self.assertTrue(entry["loaded"] and entry["warmed"])
+            self.assertIsNotNone(entry["warmup_ms"])
+        start.assert_not_called()
+
+    def test_failed_model_keeps_worker_not_ready(self):
+        with mock.patch.object(warmup, "get_model", side_effect=FileNotFoundError("/srv/ml_models/heart.pkl")):
+            warmup.warm_up(["heart"])
+        with mock.patch.object(warmup, "start_background"):
+            body = self.client.get("/readyz").json()
+        self.assertEqual(body["models"]["heart"], {
+            "loaded": False, "warmed": False, "load_ms": None, "warmup_ms": None, "error": "FileNotFoundError",
+        })
+
+    def test_database_down(self):
+        warmup.warm_up()
+        with mock.patch("apps.monitoring.views.connection.cursor", side_effect=OperationalError("down")):
+            response = self.client.get("/readyz")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["database"], {"ok": False, "error": "OperationalError"})
@@ -0,0 +1,114 @@
+"""
+Django test: CSV ingestion of historical predictions (apps/predictions/ingest.py),
+its vectorized scoring and the ingest_predictions command. The COPY path runs
+only against PostgreSQL.
+Run from backend: python manage.py test tests.test_ingest
+"""
+import io
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.patients.models import Patient
+from apps.predictions.ingest import ingest_csv
+from apps.predictions.models import Prediction, PredictionDailyRollup
+from ml_models.predictor import FEATURE_ORDER, predict_disease
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+
+def heart_csv(rows, header_case=str.upper):
+    """CSV text with spreadsheet-style headers (" AGE", "TRESTBPS", ...) for the given row dicts."""
+    columns = ["patient_id", "username", "created_at"] + FEATURE_ORDER["heart"]
+    lines = [",".join(f" {header_case(c)}" for c in columns)]
+    for row in rows:
+        lines.append(",".join(str(row.get(c, "")) for c in columns))
+    return "\n".join(lines) + "\n"
+
+
+class IngestTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.provider = User.objects.create_user(username="in_provider", password="testpass123", role=User.Role.PROVIDER)
+        cls.patient = Patient.objects.create(
+            user=User.objects.create_user(username="in_patient", password="testpass123", role=User.Role.PATIENT)
+        )
+
+    def test_scores_match_single_predictions(self):
+        older = {**HEART_FEATURES, "age": 70, "chol": 310, "ca": 3}
+        rows = [
+            {**HEART_FEATURES, "patient_id": self.patient.id, "created_at": "2025-03-01T09:30:00+00:00"},
+            {**older, "username": "in_patient", "created_at": "2025-03-02 10:00"},
+            {**HEART_FEATURES, "username": "in_patient"},
+        ]
+        result = ingest_csv("heart", io.StringIO(heart_csv(rows)), chunk_size=2, requested_by=self.provider)
+        self.assertEqual((result.rows, result.created, result.rejected), (3, 3, 0))
+
+        saved = list(Prediction.objects.order_by("created_at"))
+        self.assertEqual(saved[0].created_at, datetime(2025, 3, 1, 9, 30, tzinfo=dt_timezone.utc))
+        for prediction, features in zip(saved, [HEART_FEATURES, older, HEART_FEATURES]):
+            single = predict_disease("heart", features)
+            self.assertEqual(
+                (prediction.prediction, prediction.probability, prediction.risk_level),
+                (single["prediction"], single["probability"], single["risk_level"]),
+            )
+            self.assertEqual(prediction.requested_by_id, self.provider.id)
+        self.assertEqual(
+            sum(PredictionDailyRollup.objects.filter(provider_id=self.provider.id).values_list("count", flat=True)), 3
+        )
+
+    def test_rejects_bad_rows(self):
+        rows = [
+            {**HEART_FEATURES, "patient_id": 999999},
+            {**HEART_FEATURES, "username": "nobody"},
+            {**HEART_FEATURES, "patient_id": self.patient.id, "chol": "n/a"},
+            {**HEART_FEATURES, "patient_id": self.patient.id, "created_at": "yesterday"},
+            {**HEART_FEATURES, "patient_id": self.patient.id},
+        ]
+        result = ingest_csv("heart", io.StringIO(heart_csv(rows)))
+        self.assertEqual((result.created, result.rejected, result.rejected_lines), (1, 4, [2, 3, 4, 5]))
+
+    def test_missing_columns(self):
+        with self.assertRaises(ValueError):
+            ingest_csv("heart", io.StringIO("patient_id,age\n1,50\n"))
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "vitals.csv")
+            with open(path, "w") as f:
+                f.write(heart_csv([{**HEART_FEATURES, "username": "in_patient"}] * 4, header_case=str.title))
+            out = io.StringIO()
+            call_command("ingest_predictions", "heart", path, "--chunk-size", "3", stdout=out)
+        self.assertIn("Saved 4 of 4 heart predictions", out.getvalue())
+        self.assertEqual(self.patient.predictions.count(), 4)
+
+
+class PostgresCopyTests(TestCase):
+    def setUp(self):
+        if connection.vendor != "postgresql":
+            self.skipTest("COPY needs PostgreSQL")
+        self.patient = Patient.objects.create(
+            user=User.objects.create_user(username="copy_patient", password="testpass123", role=User.Role.PATIENT)
+        )
+
+    def test_copies_offset_and_naive_timestamps(self):
+        stamps = {
+            "2025-03-01T09:30:00Z": datetime(2025, 3, 1, 9, 30, tzinfo=dt_timezone.utc),
+            "2025-03-01T09:30:00+02:00": datetime(2025, 3, 1, 7, 30, tzinfo=dt_timezone.utc),
+            "2025-03-01T09:30:00-0530": datetime(2025, 3, 1, 15, 0, tzinfo=dt_timezone.utc),
+            "2025-03-01 09:30": timezone.make_aware(datetime(2025, 3, 1, 9, 30)),
+        }
+        rows = [{**HEART_FEATURES, "patient_id": self.patient.id, "created_at": text} for text in stamps]
+        result = ingest_csv("heart", io.StringIO(heart_csv(rows)), chunk_size=3)
+        self.assertEqual((result.created, result.rejected), (4, 0))
+        self.assertEqual(
+            sorted(Prediction.objects.values_list("created_at", flat=True)), sorted(stamps.values())
+        )
+        self.assertEqual(sum(PredictionDailyRollup.objects.values_list("count", flat=True)), 4)
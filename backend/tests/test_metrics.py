@@ -0,0 +1,74 @@
+"""
+Django test: Prometheus /metrics endpoint.
+- Predict traffic shows up in request counters, latency histograms, model/cache and DB query metrics.
+- Outside DEBUG the endpoint needs METRICS_AUTH_TOKEN unless METRICS_PUBLIC is on.
+- With METRICS_MULTIPROC_DIR, values written by other worker processes are merged in.
+Run from backend: python manage.py test tests.test_metrics
+"""
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.monitoring import metrics
+from apps.monitoring.checks import check_metrics_auth
+from apps.patients.models import Patient
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+
+@override_settings(METRICS_PUBLIC=True)
+class MetricsEndpointTests(TestCase):
+    def setUp(self):
+        metrics.reset()
+        user = User.objects.create_user(username="metrics_patient", password="testpass123", role=User.Role.PATIENT)
+        Patient.objects.create(user=user)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def test_predict_traffic_is_exported(self):
+        self.client.post("/api/predict/heart/", {"features": HEART_FEATURES}, format="json")
+        self.client.post("/api/predict/heart/", {"features": {}}, format="json")
+        body = self.client.get("/metrics").content.decode()
+
+        self.assertIn('predict_requests_total{disease="heart",status="201"} 1', body)
+        self.assertIn('predict_requests_total{disease="heart",status="400"} 1', body)
+        self.assertIn('predict_request_duration_seconds_count{disease="heart",status="201"} 1', body)
+        self.assertIn('http_request_db_queries_bucket{route="api/predict/<str:disease>/",le="+Inf"} 2', body)
+        self.assertIn('cache_requests_total{cache="model",result=', body)
+        self.assertIn("# TYPE process_resident_memory_bytes gauge", body)
+
+    @override_settings(METRICS_AUTH_TOKEN="s3cret")
+    def test_token_required_when_configured(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(METRICS_AUTH_TOKEN="", METRICS_PUBLIC=False)
+    def test_refused_without_token_unless_public(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        self.assertEqual([w.id for w in check_metrics_auth(None)], ["monitoring.W001"])
+        with override_settings(METRICS_PUBLIC=True):
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+            self.assertEqual(check_metrics_auth(None), [])
+
+    def test_multiprocess_files_are_merged(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            # A worker that has since exited: its counters still count, its gauges do not.
+            dead_pid = 2 ** 22 + 1
+            Path(tmp, f"metrics-{dead_pid}.json").write_text(json.dumps({
+                "pid": dead_pid,
+                "metrics": {
+                    "predict_requests_total": [[["heart", "201"], 5]],
+                    "process_resident_memory_bytes": [[[], 123]],
+                },
+            }))
+            with override_settings(METRICS_MULTIPROC_DIR=tmp):
+                metrics.PREDICT_REQUESTS.inc(disease="heart", status="201")
+                body = metrics.render()
+        self.assertIn('predict_requests_total{disease="heart",status="201"} 6', body)
+        self.assertNotIn(f'pid="{dead_pid}"', body)
@@ -0,0 +1,120 @@
+"""
+Django test: precomputed permutation importances and partial dependence
+(ml_models/insights.py) match a one-call-per-point computation, and
+GET /api/predict/<disease>/insights/ serves labelled ones from memory with an
+ETag and answers 404 for synthetic ones.
+Run from backend: python manage.py test tests.test_model_insights
+"""
+import io
+import random
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from ml_models import insights
+from ml_models.model_loader import get_model
+from ml_models.predictor import FEATURE_ORDER, SUPPORTED_DISEASES
+from ml_models.samples import random_features
+
+User = get_user_model()
+
+
+def reference_rows(disease, n, seed=5):
+    rng = random.Random(seed)
+    return pd.DataFrame([random_features(disease, rng) for _ in range(n)])[FEATURE_ORDER[disease]].astype(float)
+
+
+class ComputeInsightsTests(SimpleTestCase):
+    def test_partial_dependence_matches_point_by_point(self):
+        model, X = get_model("heart"), reference_rows("heart", 40)
+        dependence = insights.partial_dependence(model, X, grid_size=5)
+        self.assertEqual(list(dependence["cp"][0]), [0, 1, 2, 3])
+        for name in ("age", "cp"):
+            grid, curve = dependence[name]
+            expected = [model.predict_proba(X.assign(**{name: value}))[:, 1].mean() for value in grid]
+            np.testing.assert_allclose(curve, expected, atol=1e-12)
+
+    def test_permutation_importance_matches_single_shuffle(self):
+        model, X = get_model("diabetes"), reference_rows("diabetes", 60)
+        y = model.predict(X)
+        result = insights.permutation_importance(model, X, y, repeats=1, seed=3)
+        # Same shuffle order as the stacked computation: one permutation per feature, in column order
+        rng = np.random.default_rng(3)
+        baseline = insights._score(y, model.predict_proba(X)[:, 1])
+        for name in X.columns:
+            shuffled = X.copy()
+            shuffled[name] = X[name].to_numpy()[rng.permutation(len(X))]
+            drop = baseline - insights._score(y, model.predict_proba(shuffled)[:, 1])
+            self.assertAlmostEqual(result[name][0], drop, places=12)
+
+    def test_no_insights_are_shipped(self):
+        # Computed on synthetic rows they would rank features by the model's own quirks
+        for disease in SUPPORTED_DISEASES:
+            self.assertFalse(insights.insights_path(disease).exists(), disease)
+
+
+class ModelInsightsEndpointTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="insights_provider", password="testpass123", role=User.Role.PROVIDER)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+        self.dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.model_file = self.dir / "stroke.pkl"
+        self.model_file.write_bytes(b"model v1")
+        self.enterContext(mock.patch.object(insights, "ML_MODELS_DIR", self.dir))
+        insights.clear_cache()
+        self.addCleanup(insights.clear_cache)
+
+    def test_served_with_etag_and_stale_flag(self):
+        self.assertEqual(self.client.get("/api/predict/stroke/insights/").status_code, 404)
+        self.assertEqual(self.client.get("/api/predict/flu/insights/").status_code, 400)
+
+        X = reference_rows("stroke", 30)
+        labels = np.random.default_rng(1).integers(0, 2, len(X))
+        path, saved = insights.save_insights("stroke", get_model("stroke"), X, labels, grid_size=4, repeats=2)
+        self.assertEqual(path, self.dir / "stroke_insights.json")
+        self.assertIn("Saved insights to", insights.summary(path, saved))
+        response = self.client.get("/api/predict/stroke/insights/")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertFalse(body["stale"])
+        importances = [f["importance"] for f in body["features"].values()]
+        self.assertEqual(importances, sorted(importances, reverse=True))
+        etag = response["ETag"]
+        again = self.client.get("/api/predict/stroke/insights/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+
+        self.model_file.write_bytes(b"model v2, retrained")
+        changed = self.client.get("/api/predict/stroke/insights/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, 200)
+        self.assertTrue(changed.json()["stale"])
+
+    def test_command_reports_on_its_stdout(self):
+        out = io.StringIO()
+        with mock.patch("builtins.print") as printed:
+            call_command(
+                "compute_model_insights", "stroke", "--synthetic", "--rows", "20", "--repeats", "1", "--grid", "3",
+                stdout=out,
+            )
+        printed.assert_not_called()
+        self.assertIn(f"Saved insights to {self.dir / 'stroke_insights.json'}", out.getvalue())
+        self.assertIn("the API does not serve them", out.getvalue())
+        self.assertEqual(insights.load_insights("stroke")["reference"]["source"], "synthetic")
+
+    def test_synthetic_insights_are_not_served(self):
+        with self.assertRaises(CommandError):
+            call_command("compute_model_insights", "stroke", stdout=io.StringIO())
+        call_command(
+            "compute_model_insights", "stroke", "--synthetic", "--rows", "20", "--repeats", "1", "--grid", "3",
+            stdout=io.StringIO(),
+        )
+        response = self.client.get("/api/predict/stroke/insights/")
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("synthetic", response.json()["detail"])
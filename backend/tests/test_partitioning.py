@@ -0,0 +1,92 @@
+"""
+Django test: prediction partition helpers and the maintenance command.
+The conversion round trip needs PostgreSQL and is skipped on other databases.
+Run from backend: python manage.py test tests.test_partitioning
+"""
+from datetime import date, datetime, timezone
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from apps.patients.models import Patient
+from apps.predictions import partitioning
+from apps.predictions.models import Prediction
+
+User = get_user_model()
+
+
+class PartitionHelperTests(SimpleTestCase):
+    def test_month_arithmetic(self):
+        self.assertEqual(partitioning.month_start(datetime(2026, 3, 31, 23, 59, tzinfo=timezone.utc)), date(2026, 3, 1))
+        self.assertEqual(partitioning.add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        self.assertEqual(partitioning.add_months(date(2026, 1, 1), -1), date(2025, 12, 1))
+
+    def test_partition_name(self):
+        self.assertEqual(partitioning.partition_name(date(2026, 2, 1)), "predictions_prediction_p202602")
+
+    def test_retention_counts_the_current_month(self):
+        months = [date(2026, m, 1) for m in range(1, 11)]
+        listed = [(partitioning.partition_name(m), m) for m in months]
+        with mock.patch.object(partitioning, "list_partitions", return_value=listed):
+            expired = partitioning.expired_partitions(None, 3, today=datetime(2026, 10, 19, tzinfo=timezone.utc))
+        # Keep August, September and October
+        self.assertEqual([month for _, month in expired], months[:7])
+
+
+class PartitionCommandTests(TestCase):
+    def test_non_postgres_is_a_no_op(self):
+        if partitioning.supported(connection):
+            self.skipTest("Runs against PostgreSQL")
+        out = StringIO()
+        call_command("manage_prediction_partitions", "--retention-months", "12", stdout=out)
+        self.assertIn("needs PostgreSQL", out.getvalue())
+
+    def test_convert_and_unpartition_are_exclusive(self):
+        with self.assertRaises(CommandError):
+            call_command("manage_prediction_partitions", "--convert", "--unpartition", stdout=StringIO())
+
+
+class PostgresConversionTests(TestCase):
+    def setUp(self):
+        if not partitioning.supported(connection):
+            self.skipTest("Needs PostgreSQL")
+        user = User.objects.create_user(username="part_patient", password="testpass123", role=User.Role.PATIENT)
+        self.patient = Patient.objects.create(user=user)
+        for created_at in (datetime(2024, 1, 15, tzinfo=timezone.utc), datetime(2026, 2, 3, tzinfo=timezone.utc)):
+            Prediction.objects.create(
+                patient=self.patient, disease_type="heart", prediction=1, probability=0.7, risk_level="High",
+                created_at=created_at,
+            )
+
+    def layout(self):
+        """Index names and foreign keys of the table, ignoring the primary key."""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, partitioning.TABLE)
+        indexes = {name for name, info in constraints.items() if info["index"] and not info["primary_key"]}
+        foreign_keys = {
+            (tuple(info["columns"]), info["foreign_key"]) for info in constraints.values() if info["foreign_key"]
+        }
+        return indexes, foreign_keys
+
+    def test_convert_insert_and_unpartition(self):
+        before = self.layout()
+        ids = set(Prediction.objects.values_list("pk", flat=True))
+
+        partitioning.convert_to_partitioned(connection)
+        self.assertTrue(partitioning.is_partitioned(connection))
+        self.assertIn(date(2024, 1, 1), {month for _, month in partitioning.list_partitions(connection)})
+        self.assertEqual(self.layout(), before)
+        added = Prediction.objects.create(
+            patient=self.patient, disease_type="stroke", prediction=0, probability=0.2, risk_level="Low"
+        )
+        self.assertGreater(added.pk, max(ids))
+
+        partitioning.convert_to_plain(connection)
+        self.assertFalse(partitioning.is_partitioned(connection))
+        self.assertEqual(self.layout(), before)
+        self.assertEqual(set(Prediction.objects.values_list("pk", flat=True)), ids | {added.pk})
+        self.assertEqual(Prediction.objects.get(pk=added.pk).patient_id, self.patient.pk)
@@ -0,0 +1,129 @@
+"""
+Django test: bulk patient import (apps/patients/importer.py), its management
+command, the admin upload endpoint and invite acceptance.
+Run from backend: python manage.py test tests.test_patient_import
+"""
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.patients.importer import import_csv
+from apps.patients.models import Patient
+
+User = get_user_model()
+
+CSV = (
+    "username,email,full_name,phone,date_of_birth,password\n"
+    "imp_1,imp1@clinic.example,Imp One,0700,1990-01-31,secret-pass-1\n"
+    "imp_2,IMP2@clinic.example,Imp Two,,,secret-pass-2\n"
+    "imp_3,imp2@clinic.example,Duplicate Email,,,secret-pass-3\n"
+    "existing,,Taken Username,,,secret-pass-4\n"
+    "imp_5,not-an-email,,,31/01/1990,short\n"
+    ",,No Username,,,secret-pass-6\n"
+)
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    PATIENT_IMPORT_HASH_WORKERS=1,
+)
+class PatientImportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username="existing", password="testpass123")
+        cls.admin = User.objects.create_user(username="imp_admin", password="testpass123", role=User.Role.ADMIN)
+
+    def test_import_validates_and_creates_in_chunks(self):
+        progress = []
+        result = import_csv(io.StringIO(CSV), chunk_size=2, progress=lambda r: progress.append(r.rows))
+        self.assertEqual((result.rows, result.created, result.failed), (6, 2, 4))
+        self.assertEqual(progress, [2, 4, 6])
+        self.assertEqual(
+            {e["line"]: sorted(e["errors"]) for e in result.errors},
+            {4: ["email"], 5: ["username"], 6: ["date_of_birth", "email", "password"], 7: ["username"]},
+        )
+        user = User.objects.get(username="imp_1")
+        self.assertEqual(user.role, User.Role.PATIENT)
+        self.assertTrue(user.check_password("secret-pass-1"))
+        self.assertEqual(str(user.date_of_birth), "1990-01-31")
+        self.assertEqual(Patient.objects.filter(user__username__in=["imp_1", "imp_2"]).count(), 2)
+        # Re-running rejects everything as already existing
+        self.assertEqual(import_csv(io.StringIO(CSV)).created, 0)
+
+    def test_invites_and_accept(self):
+        result = import_csv(io.StringIO("username,email\ninv_1,inv1@clinic.example\n"))
+        self.assertEqual(result.created, 1)
+        user = User.objects.get(username="inv_1")
+        self.assertFalse(user.has_usable_password())
+        invite = result.invites[0]
+
+        client = APIClient()
+        response = client.post(
+            "/api/auth/invite/accept/", {"uid": invite["uid"], "token": invite["token"], "password": "chosen-pass-1"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("access", response.json())
+        user.refresh_from_db()
+        self.assertTrue(user.check_password("chosen-pass-1"))
+        # Single use
+        response = client.post(
+            "/api/auth/invite/accept/", {"uid": invite["uid"], "token": invite["token"], "password": "other-pass-2"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_missing_username_column(self):
+        with self.assertRaises(ValueError):
+            import_csv(io.StringIO("email\na@b.example\n"))
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "patients.csv")
+            with open(path, "w") as f:
+                f.write(CSV)
+            out = io.StringIO()
+            call_command("import_patients", path, "--chunk-size", "3", stdout=out)
+        self.assertIn("Imported 2 of 6 patients", out.getvalue())
+
+    def test_admin_upload(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        upload = SimpleUploadedFile("patients.csv", CSV.encode(), content_type="text/csv")
+        # The web worker hashes inline; only the management command spawns a pool
+        with mock.patch("apps.patients.importer.ProcessPoolExecutor", side_effect=AssertionError("pool spawned")):
+            response = client.post("/api/admin/patients/import/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["created"], 2)
+
+        client.force_authenticate(User.objects.get(username="imp_1"))
+        upload = SimpleUploadedFile("patients.csv", CSV.encode(), content_type="text/csv")
+        self.assertEqual(client.post("/api/admin/patients/import/", {"file": upload}).status_code, 403)
+
+    def test_admin_upload_with_invites_is_not_compressed(self):
+        # Invite tokens next to CSV-controlled usernames: compressing them would expose them to BREACH
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        csv_text = "username,email\n" + "".join(f"gz_{i},gz{i}@clinic.example\n" for i in range(30))
+        upload = SimpleUploadedFile("patients.csv", csv_text.encode(), content_type="text/csv")
+        response = client.post(
+            "/api/admin/patients/import/", {"file": upload, "invite": "true"}, format="multipart",
+            HTTP_ACCEPT_ENCODING="gzip",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertGreater(len(response.content), 1024)
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(len(response.json()["invites"]), 30)
+
+
+class PatientImportHashPoolTests(TestCase):
+    def test_parallel_hashing(self):
+        csv_text = "username,password\npool_1,secret-pass-1\npool_2,secret-pass-2\n"
+        result = import_csv(io.StringIO(csv_text), workers=2)
+        self.assertEqual(result.created, 2)
+        self.assertTrue(User.objects.get(username="pool_2").check_password("secret-pass-2"))
@@ -0,0 +1,66 @@
+"""
+Django test: POST /api/predict/panel/ scores several diseases from one feature set
+and saves all predictions together.
+Run from backend: python manage.py test tests.test_predict_panel
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.patients.models import Patient
+from apps.predictions.models import Prediction, PredictionDailyRollup
+from ml_models.predictor import predict_disease
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+DIABETES_FEATURES = {
+    "pregnancies": 2,
+    "glucose": 140,
+    "blood_pressure": 80,
+    "skin_thickness": 25,
+    "insulin": 90,
+    "bmi": 31.5,
+    "diabetes_pedigree_function": 0.6,
+    "age": 55,
+}
+
+
+class PredictPanelTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="panel_patient", password="testpass123", role=User.Role.PATIENT)
+        self.patient = Patient.objects.create(user=user)
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def post(self, diseases, features):
+        return self.client.post(
+            "/api/predict/panel/", {"diseases": diseases, "features": features}, format="json"
+        )
+
+    def test_panel_matches_single_predictions_and_saves_all(self):
+        features = {**HEART_FEATURES, **DIABETES_FEATURES}
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post(["heart", "Hypertension", "diabetes", "heart"], features)
+        self.assertEqual(response.status_code, 201)
+        results = response.json()["results"]
+        self.assertEqual(list(results), ["heart", "hypertension", "diabetes"])
+        for disease, result in results.items():
+            self.assertEqual(result, predict_disease(disease, features), disease)
+        saved = Prediction.objects.filter(patient=self.patient)
+        self.assertEqual(sorted(saved.values_list("disease_type", flat=True)), ["diabetes", "heart", "hypertension"])
+        self.assertEqual(sum(PredictionDailyRollup.objects.values_list("count", flat=True)), 3)
+
+    def test_missing_features_of_any_disease_reject_the_panel(self):
+        response = self.post(["heart", "diabetes"], HEART_FEATURES)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            sorted(response.json()["errors"]),
+            sorted(set(DIABETES_FEATURES) - set(HEART_FEATURES)),
+        )
+        self.assertFalse(Prediction.objects.exists())
+
+    def test_unknown_disease(self):
+        response = self.post(["heart", "flu"], HEART_FEATURES)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("flu", response.json()["detail"])
@@ -0,0 +1,80 @@
+"""
+Django test: opt-in profiling of the predict view.
+- X-Profile header with the configured secret writes a compressed profile; admins can list and download it.
+- The admin toggle parses "enabled" from JSON and form bodies alike.
+- Rotation keeps at most PROFILING_MAX_FILES; nothing is written when PROFILING_ENABLED is off.
+Run from backend: python manage.py test tests.test_profiling
+"""
+import gzip
+import marshal
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.monitoring import profiling
+from apps.patients.models import Patient
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+
+class PredictProfilingTests(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patient_user = User.objects.create_user(username="prof_patient", password="x" * 10, role=User.Role.PATIENT)
+        Patient.objects.create(user=patient_user)
+        self.patient_client = APIClient()
+        self.patient_client.force_authenticate(patient_user)
+        admin = User.objects.create_user(username="prof_admin", password="x" * 10, role=User.Role.ADMIN)
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(admin)
+
+    def _predict(self, **headers):
+        return self.patient_client.post("/api/predict/heart/", {"features": HEART_FEATURES}, format="json", **headers)
+
+    def test_header_profile_is_stored_and_downloadable(self):
+        with override_settings(PROFILING_ENABLED=True, PROFILING_HEADER_SECRET="abc", PROFILING_DIR=self.tmp.name):
+            response = self._predict(HTTP_X_PROFILE="abc")
+            self.assertEqual(response.status_code, 201)
+            name = response["X-Profile-Id"]
+
+            listing = self.admin_client.get("/api/monitoring/profiles/").json()
+            self.assertEqual([p["name"] for p in listing["profiles"]], [name])
+
+            download = self.admin_client.get(f"/api/monitoring/profiles/{name}/")
+            self.assertEqual(download.status_code, 200)
+            stats = marshal.loads(gzip.decompress(b"".join(download.streaming_content)))
+            self.assertTrue(any(func[2] == "predict_disease" for func in stats))
+
+            self.assertEqual(self.patient_client.get("/api/monitoring/profiles/").status_code, 403)
+            self.assertEqual(self.admin_client.get("/api/monitoring/profiles/..%2Fsecret/").status_code, 404)
+
+    def test_wrong_secret_or_disabled_does_not_profile(self):
+        with override_settings(PROFILING_ENABLED=True, PROFILING_HEADER_SECRET="abc", PROFILING_DIR=self.tmp.name):
+            self.assertNotIn("X-Profile-Id", self._predict(HTTP_X_PROFILE="nope"))
+        with override_settings(PROFILING_ENABLED=False, PROFILING_SAMPLE_RATE=1.0, PROFILING_DIR=self.tmp.name):
+            self.assertNotIn("X-Profile-Id", self._predict())
+        with override_settings(PROFILING_DIR=self.tmp.name):
+            self.assertEqual(profiling.list_profiles(), [])
+
+    def test_rotation_keeps_newest_files(self):
+        with override_settings(
+            PROFILING_ENABLED=True, PROFILING_SAMPLE_RATE=1.0, PROFILING_MAX_FILES=2, PROFILING_DIR=self.tmp.name
+        ):
+            names = [self._predict()["X-Profile-Id"] for _ in range(3)]
+            self.assertEqual([p["name"] for p in profiling.list_profiles()], names[:0:-1])
+
+    def test_toggle_parses_form_flag(self):
+        with override_settings(PROFILING_DIR=self.tmp.name):
+            response = self.admin_client.post("/api/monitoring/profiles/toggle/", {"enabled": "false"})
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(response.json()["forced_until"])
+            self.assertEqual(profiling.forced_until(), 0.0)
+
+            response = self.admin_client.post("/api/monitoring/profiles/toggle/", {"enabled": "true", "seconds": "60"})
+            self.assertIsNotNone(response.json()["forced_until"])
+            response = self.admin_client.post("/api/monitoring/profiles/toggle/", {"enabled": False}, format="json")
+            self.assertIsNone(response.json()["forced_until"])
@@ -0,0 +1,266 @@
+"""
+Django test: pin the number of SQL statements issued by every API endpoint.
+Each endpoint is exercised with several rows of related data so an N+1 pattern
+shows up as a changed count. Requests use force_authenticate, so the pinned
+numbers cover the view only (no session or token user lookups).
+A stale user -> patient cache entry is re-resolved instead of failing the insert.
+Run from backend: python manage.py test tests.test_query_counts
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.patients import cache as patient_cache
+from apps.patients.models import Patient
+from apps.predictions.models import Prediction
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class EndpointQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="qc_admin", password="testpass123", role=User.Role.ADMIN)
+        cls.provider = User.objects.create_user(
+            username="qc_provider",
+            password="testpass123",
+            email="qc_provider@test.example",
+            role=User.Role.PROVIDER,
+            medical_license="LIC-QC-1",
+        )
+        cls.patients = []
+        for i in range(3):
+            user = User.objects.create_user(
+                username=f"qc_patient_{i}",
+                password="testpass123",
+                email=f"qc_patient_{i}@test.example",
+                role=User.Role.PATIENT,
+            )
+            patient = Patient.objects.create(user=user)
+            cls.patients.append(patient)
+            for disease in ("heart", "diabetes", "stroke", "hypertension"):
+                Prediction.objects.create(
+                    patient=patient, disease_type=disease, prediction=1, probability=0.7, risk_level="High"
+                )
+        cls.empty_user = User.objects.create_user(username="qc_empty", password="testpass123", role=User.Role.PATIENT)
+        cls.empty_patient = Patient.objects.create(user=cls.empty_user)
+
+    def setUp(self):
+        patient_cache.clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def assert_queries(self, num, method, path, user=None, data=None):
+        client = self.client_for(user) if user else APIClient()
+        # Work deferred to commit (rollup upserts) counts too
+        with self.assertNumQueries(num), self.captureOnCommitCallbacks(execute=True):
+            response = getattr(client, method)(path, data, format="json") if data is not None else getattr(client, method)(path)
+        self.assertLess(response.status_code, 500, response.content)
+        return response
+
+    # --- accounts ---------------------------------------------------------
+
+    def test_api_root(self):
+        self.assert_queries(0, "get", "/")
+
+    def test_login_by_username(self):
+        response = self.assert_queries(
+            1, "post", "/api/auth/login/", data={"username": "qc_provider", "password": "testpass123"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_login_by_email(self):
+        response = self.assert_queries(
+            1, "post", "/api/auth/login/", data={"email": "QC_Patient_0@test.example", "password": "testpass123"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_login_by_medical_license(self):
+        response = self.assert_queries(
+            1, "post", "/api/auth/login/", data={"username": "lic-qc-1", "password": "testpass123"}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_login_wrong_password(self):
+        response = self.assert_queries(
+            1, "post", "/api/auth/login/", data={"username": "qc_provider", "password": "wrong-pass"}
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_current_user(self):
+        self.assert_queries(0, "get", "/api/auth/me/", user=self.provider)
+
+    def test_logout(self):
+        self.assert_queries(0, "post", "/api/auth/logout/", user=self.provider)
+
+    def test_register_patient(self):
+        response = self.assert_queries(
+            6,
+            "post",
+            "/api/auth/register/",
+            data={"username": "qc_new", "email": "qc_new@test.example", "password": "testpass123", "role": "patient"},
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_admin_stats(self):
+        response = self.assert_queries(5, "get", "/api/admin/stats/", user=self.admin)
+        self.assertEqual(response.json()["total_predictions"], 12)
+
+    def test_admin_users(self):
+        response = self.assert_queries(1, "get", "/api/admin/users/", user=self.admin)
+        self.assertEqual(len(response.json()["results"]), 6)
+
+    def test_admin_users_count(self):
+        cache.clear()
+        response = self.assert_queries(1, "get", "/api/admin/users/count/?role=patient", user=self.admin)
+        self.assertEqual(response.json(), {"count": 4, "estimated": False})
+        # Served from the cache
+        self.assert_queries(0, "get", "/api/admin/users/count/?role=patient", user=self.admin)
+
+    # --- patients ---------------------------------------------------------
+
+    def test_patient_by_id(self):
+        response = self.assert_queries(
+            1, "get", f"/api/patients/?patient_id={self.patients[0].id}", user=self.provider
+        )
+        self.assertEqual(response.json()["total_predictions"], 4)
+
+    def test_patient_me(self):
+        self.assert_queries(1, "get", "/api/patients/me/", user=self.patients[0].user)
+
+    def test_patient_lookup(self):
+        self.assert_queries(1, "get", f"/api/patients/{self.patients[1].id}/", user=self.provider)
+
+    # --- predictions ------------------------------------------------------
+
+    # predict = patient lookup (unless cached) + INSERT + rollup upsert (after commit)
+    def test_predict_as_patient(self):
+        response = self.assert_queries(
+            3, "post", "/api/predict/heart/", user=self.patients[0].user, data={"features": HEART_FEATURES}
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_predict_as_patient_cached(self):
+        # The user -> patient lookup is served by apps.patients.cache after the first request
+        self.assert_queries(1, "get", "/api/predictions/", user=self.patients[0].user)
+        response = self.assert_queries(
+            2, "post", "/api/predict/heart/", user=self.patients[0].user, data={"features": HEART_FEATURES}
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_predict_as_provider(self):
+        response = self.assert_queries(
+            3,
+            "post",
+            "/api/predict/heart/",
+            user=self.provider,
+            data={"features": HEART_FEATURES, "patient_id": self.patients[0].id},
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_prediction_list_as_patient(self):
+        response = self.assert_queries(1, "get", "/api/predictions/", user=self.patients[0].user)
+        self.assertEqual(len(response.json()), 4)
+
+    def test_prediction_history_as_provider(self):
+        response = self.assert_queries(
+            1, "get", f"/api/predictions/history/?patient_id={self.patients[2].id}", user=self.provider
+        )
+        self.assertEqual(len(response.json()), 4)
+
+    def test_prediction_list_as_provider_empty_history(self):
+        response = self.assert_queries(
+            2, "get", f"/api/predictions/?patient_id={self.empty_patient.id}", user=self.provider
+        )
+        self.assertEqual(response.json(), [])
+
+    def test_prediction_list_as_provider_unknown_patient(self):
+        response = self.assert_queries(2, "get", "/api/predictions/?patient_id=999999", user=self.provider)
+        self.assertEqual(response.status_code, 404)
+
+    def test_prediction_detail(self):
+        pk = self.patients[0].predictions.first().pk
+        self.assert_queries(1, "get", f"/api/predictions/{pk}/", user=self.patients[0].user)
+        response = self.assert_queries(1, "get", f"/api/predictions/{pk}/", user=self.patients[1].user)
+        self.assertEqual(response.status_code, 404)
+
+    # --- monitoring -------------------------------------------------------
+
+    @override_settings(METRICS_PUBLIC=True)
+    def test_metrics(self):
+        self.assert_queries(0, "get", "/metrics")
+
+    def test_monitoring_timing(self):
+        self.assert_queries(0, "get", "/api/monitoring/timing/", user=self.admin)
+
+    def test_monitoring_profiles(self):
+        self.assert_queries(0, "get", "/api/monitoring/profiles/", user=self.admin)
+
+
+class PatientCacheTests(TestCase):
+    def setUp(self):
+        patient_cache.clear()
+
+    def test_invalidated_on_patient_delete(self):
+        user = User.objects.create_user(username="pc_patient", password="testpass123", role=User.Role.PATIENT)
+        patient = Patient.objects.create(user=user)
+        self.assertEqual(patient_cache.patient_id_for_user(user), patient.pk)
+        self.assertEqual(patient_cache.lookup(user.id), patient.pk)
+        patient.delete()
+        self.assertIsNone(patient_cache.lookup(user.id))
+        self.assertIsNone(patient_cache.patient_id_for_user(user))
+
+    @override_settings(PATIENT_CACHE_SIZE=2)
+    def test_bounded_lru(self):
+        for user_id in (1, 2, 3):
+            patient_cache.remember(user_id, user_id * 10)
+        self.assertIsNone(patient_cache.lookup(1))
+        self.assertEqual(patient_cache.lookup(3), 30)
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class StalePatientCacheTests(TransactionTestCase):
+    """Another worker deleted the profile: the foreign key fails at commit, not with a 500."""
+
+    def setUp(self):
+        patient_cache.clear()
+        self.user = User.objects.create_user(username="stale_patient", password="testpass123", role=User.Role.PATIENT)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def stale_entry(self):
+        patient = Patient.objects.create(user=self.user)
+        stale_id = patient.pk
+        patient.delete()
+        patient_cache.remember(self.user.id, stale_id)
+        return stale_id
+
+    def predict(self, path="/api/predict/heart/", **body):
+        return self.client.post(path, {"features": HEART_FEATURES, **body}, format="json")
+
+    def test_recreated_profile_is_looked_up_again(self):
+        stale_id = self.stale_entry()
+        patient = Patient.objects.create(user=self.user)
+        patient_cache.remember(self.user.id, stale_id)
+        self.assertEqual(self.predict().status_code, 201)
+        self.assertEqual(Prediction.objects.get().patient_id, patient.pk)
+        self.assertEqual(patient_cache.lookup(self.user.id), patient.pk)
+
+        patient_cache.remember(self.user.id, stale_id)
+        self.assertEqual(self.predict("/api/predict/panel/", diseases=["heart"]).status_code, 201)
+        self.assertEqual(Prediction.objects.filter(patient_id=patient.pk).count(), 2)
+
+    def test_deleted_profile_is_a_400(self):
+        self.stale_entry()
+        response = self.predict()
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Prediction.objects.exists())
+        self.assertIsNone(patient_cache.lookup(self.user.id))
@@ -0,0 +1,71 @@
+"""
+Django test: the orjson renderer/parser (config/renderers.py) produce the same
+JSON as DRF's stdlib JSONRenderer / JSONParser, except for the text of
+exponent-form floats.
+Run from backend: python manage.py test tests.test_renderers
+"""
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from config.renderers import ORJSONParser, ORJSONRenderer
+
+PAYLOAD = {
+    "utc": datetime(2026, 3, 1, 8, 30, tzinfo=dt_timezone.utc),
+    "utc_micro": datetime(2026, 3, 1, 8, 30, 5, 120000, tzinfo=dt_timezone.utc),
+    "offset": datetime(2026, 3, 1, 8, 30, tzinfo=dt_timezone(timedelta(hours=2))),
+    "naive": datetime(2026, 3, 1, 8, 30),
+    "day": date(2026, 3, 1),
+    "at": time(8, 30, 15),
+    "decimal": Decimal("12.50"),
+    "duration": timedelta(minutes=90),
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "lazy": gettext_lazy("Not found."),
+    "text": "line\u2028separator\u2029 \u00e9",
+    "rows": [{"probability": 0.8123, "prediction": 1, "risk_level": None}],
+    1: "int key",
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_drf_json_renderer(self):
+        self.assertEqual(ORJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_non_finite_floats_raise_like_drf(self):
+        for value in (float("nan"), float("inf"), float("-inf")):
+            payload = {"rows": [{"probability": value, "risk_level": None}]}
+            with self.assertRaises(ValueError):
+                JSONRenderer().render(payload)
+            with self.assertRaises(ValueError):
+                ORJSONRenderer().render(payload)
+
+    def test_wide_integers_fall_back(self):
+        payload = {"big": 2 ** 64, "negative": -(2 ** 70)}
+        self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+
+    def test_exponent_floats_differ_only_in_text(self):
+        payload = {"large": 1e16, "small": 1e-05}
+        ours, drf = ORJSONRenderer().render(payload), JSONRenderer().render(payload)
+        self.assertEqual(ours, b'{"large":1e16,"small":0.00001}')
+        self.assertEqual(drf, b'{"large":1e+16,"small":1e-05}')
+        self.assertEqual(json.loads(ours), json.loads(drf))
+
+    def test_indent_request_falls_back(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD, media_type), JSONRenderer().render(PAYLOAD, media_type)
+        )
+
+    def test_parser(self):
+        body = b'{"features": {"age": 55, "oldpeak": 1.5}, "note": "\\u00e9"}'
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"features": '))
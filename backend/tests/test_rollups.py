@@ -0,0 +1,94 @@
+"""
+Django test: incremental prediction rollups, the backfill command and /api/admin/analytics/.
+Run from backend: python manage.py test tests.test_rollups
+"""
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.patients.models import Patient
+from apps.predictions.models import Prediction, PredictionDailyRollup
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+
+class RollupTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username="ru_admin", password="testpass123", role=User.Role.ADMIN)
+        cls.provider = User.objects.create_user(username="ru_provider", password="testpass123", role=User.Role.PROVIDER)
+        cls.patient_user = User.objects.create_user(username="ru_patient", password="testpass123", role=User.Role.PATIENT)
+        cls.patient = Patient.objects.create(user=cls.patient_user)
+
+    def predict(self, user, **extra):
+        client = APIClient()
+        client.force_authenticate(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post("/api/predict/heart/", {"features": HEART_FEATURES, **extra}, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def rollup_snapshot(self):
+        return sorted(
+            PredictionDailyRollup.objects.values_list(
+                "date", "disease_type", "risk_level", "provider_id", "count", "positive_count"
+            )
+        )
+
+    def test_predict_updates_rollups_and_backfill_matches(self):
+        self.predict(self.patient_user)
+        self.predict(self.patient_user)
+        self.predict(self.provider, patient_id=self.patient.id)
+        rows = PredictionDailyRollup.objects.all()
+        self.assertEqual(sum(r.count for r in rows), 3)
+        self.assertEqual(sum(r.count for r in rows if r.provider_id == self.provider.id), 1)
+        self.assertAlmostEqual(
+            sum(r.sum_probability for r in rows), sum(Prediction.objects.values_list("probability", flat=True))
+        )
+
+        incremental = self.rollup_snapshot()
+        PredictionDailyRollup.objects.all().delete()
+        call_command("backfill_prediction_rollups", "--chunk-days", "1", stdout=StringIO())
+        self.assertEqual(self.rollup_snapshot(), incremental)
+
+    def test_upsert_waits_for_commit(self):
+        client = APIClient()
+        client.force_authenticate(self.patient_user)
+        with self.captureOnCommitCallbacks() as callbacks:
+            client.post("/api/predict/heart/", {"features": HEART_FEATURES}, format="json")
+        self.assertFalse(PredictionDailyRollup.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(PredictionDailyRollup.objects.get().count, 1)
+
+    def test_analytics_reads_rollups(self):
+        self.predict(self.patient_user)
+        self.predict(self.provider, patient_id=self.patient.id)
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        # totals, series, disease, risk level, provider breakdowns + provider usernames
+        with self.assertNumQueries(6):
+            response = client.get("/api/admin/analytics/?days=7")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["totals"]["count"], 2)
+        self.assertEqual(len(data["series"]), 7)
+        self.assertEqual(data["series"][-1]["period"], timezone.localdate().isoformat())
+        self.assertEqual(data["by_disease"]["heart"]["count"], 2)
+        self.assertEqual(data["by_provider"], [
+            {**data["by_provider"][0], "provider_id": self.provider.id, "username": "ru_provider", "count": 1}
+        ])
+        weekly = client.get("/api/admin/analytics/?days=30&granularity=week").json()
+        self.assertEqual(sum(p["count"] for p in weekly["series"]), 2)
+
+    def test_analytics_admin_only(self):
+        client = APIClient()
+        client.force_authenticate(self.provider)
+        self.assertEqual(client.get("/api/admin/analytics/").status_code, 403)
+        client.force_authenticate(self.admin)
+        self.assertEqual(client.get("/api/admin/analytics/?days=0").status_code, 400)
@@ -0,0 +1,38 @@
+"""
+Django test: booting Django and loading the URLconf (manage.py commands, WSGI
+workers before preload) does not import the ML stack; ml_models names resolve lazily.
+Run from backend: python manage.py test tests.test_startup
+"""
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+import ml_models
+
+PROBE = """
+import sys
+import django
+django.setup()
+import config.urls, ml_models.model_loader
+print(",".join(m for m in ("pandas", "sklearn", "joblib", "scipy") if m in sys.modules))
+"""
+
+
+class LazyImportTests(SimpleTestCase):
+    def test_django_setup_does_not_import_ml_stack(self):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "config.settings"}
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True
+        )
+        self.assertEqual(proc.stdout.strip(), "")
+
+    def test_package_exports_resolve_on_access(self):
+        from ml_models.predictor import predict_disease
+
+        self.assertIs(ml_models.predict_disease, predict_disease)
+        self.assertIn("SUPPORTED_DISEASES", dir(ml_models))
+        with self.assertRaises(AttributeError):
+            ml_models.not_a_name
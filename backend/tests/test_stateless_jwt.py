@@ -0,0 +1,81 @@
+"""
+Django test: JWT claims, stateless authentication and token revocation.
+Run from backend: python manage.py test tests.test_stateless_jwt
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.patients.models import Patient
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class StatelessJWTTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="jwt_patient", password="testpass123", role=User.Role.PATIENT)
+        cls.patient = Patient.objects.create(user=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def login(self):
+        response = APIClient().post(
+            "/api/auth/login/", {"username": "jwt_patient", "password": "testpass123"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()["access"]
+
+    def client_with(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        return client
+
+    def test_login_token_carries_claims(self):
+        token = AccessToken(self.login())
+        self.assertEqual(token["role"], "patient")
+        self.assertEqual(token["username"], "jwt_patient")
+        self.assertEqual(token["patient_id"], self.patient.pk)
+
+    @override_settings(JWT_STATELESS=True)
+    def test_stateless_request_skips_user_query(self):
+        client = self.client_with(self.login())
+        # Only the prediction list itself; no User lookup for authentication
+        with self.assertNumQueries(1):
+            response = client.get("/api/predictions/")
+        self.assertEqual(response.status_code, 200)
+        response = client.post("/api/predict/heart/", {"features": HEART_FEATURES}, format="json")
+        self.assertEqual(response.status_code, 201, response.content)
+
+    @override_settings(JWT_STATELESS=True)
+    def test_me_returns_full_user(self):
+        response = self.client_with(self.login()).get("/api/auth/me/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["username"], "jwt_patient")
+        self.assertIn("email", response.json())
+
+    def test_logout_revokes_token(self):
+        client = self.client_with(self.login())
+        self.assertEqual(client.post("/api/auth/logout/").status_code, 204)
+        self.assertEqual(client.get("/api/predictions/").status_code, 401)
+
+    @override_settings(JWT_STATELESS=True)
+    def test_role_change_revokes_token(self):
+        client = self.client_with(self.login())
+        self.user.role = User.Role.PROVIDER
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(client.get("/api/predictions/").status_code, 401)
+
+    @override_settings(JWT_STATELESS=True)
+    def test_unrelated_update_keeps_token(self):
+        client = self.client_with(self.login())
+        self.user.full_name = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(client.get("/api/predictions/").status_code, 200)
@@ -0,0 +1,50 @@
+"""
+Django test: per-stage timing of the predict path.
+- PREDICT_TIMING on: predict response carries a Server-Timing header with every stage, histograms fill up.
+- PREDICT_TIMING off: no header.
+Run from backend: python manage.py test tests.test_timing
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.monitoring import timing
+from apps.patients.models import Patient
+from tests.test_provider_predict import HEART_FEATURES
+
+User = get_user_model()
+
+PREDICT_STAGES = (
+    "auth", "patient_lookup", "validate_features",
+    "dataframe", "model_load", "predict_proba", "db_insert", "total",
+)
+
+
+class PredictTimingTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="timed_patient", password="testpass123", role=User.Role.PATIENT)
+        Patient.objects.create(user=user)
+        self.user = user
+        timing.reset()
+
+    @override_settings(PREDICT_TIMING=True)
+    def test_server_timing_header_and_histograms(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post("/api/predict/heart/", {"features": HEART_FEATURES}, format="json")
+        self.assertEqual(response.status_code, 201)
+        header = response["Server-Timing"]
+        names = [part.split(";")[0].strip() for part in header.split(",")]
+        self.assertEqual(sorted(names), sorted(PREDICT_STAGES))
+        stages = timing.snapshot()
+        for name in PREDICT_STAGES:
+            self.assertEqual(stages[name]["count"], 1, name)
+
+    @override_settings(PREDICT_TIMING=False)
+    def test_disabled_adds_no_header(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post("/api/predict/heart/", {"features": HEART_FEATURES}, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(timing.snapshot(), {})
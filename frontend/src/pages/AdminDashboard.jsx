@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useCallback } from 'react';
 import {
   PieChart,
   Pie,
@@ -26,23 +26,53 @@ const CHART_COLORS = {
 
 const DISEASE_COLORS = [CHART_COLORS.primary, CHART_COLORS.secondary, '#DC2626', '#F87171'];
 
+const USER_PAGE_SIZE = 50;
+
 export default function AdminDashboard() {
   const [stats, setStats] = useState(null);
   const [users, setUsers] = useState([]);
+  const [usersCursor, setUsersCursor] = useState(null);
+  const [usersCount, setUsersCount] = useState(null);
+  const [usersLoading, setUsersLoading] = useState(false);
+  const [roleFilter, setRoleFilter] = useState('');
+  const [search, setSearch] = useState('');
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
+  // One keyset page of users; without a cursor the list (and its count) start over
+  const loadUsers = useCallback(async (cursor = null) => {
+    const params = { limit: USER_PAGE_SIZE };
+    if (roleFilter) params.role = roleFilter;
+    if (search.trim()) params.q = search.trim();
+    setUsersLoading(true);
+    try {
+      const [pageRes, countRes] = await Promise.all([
+        api.get('/api/admin/users/', { params: cursor ? { ...params, cursor } : params }),
+        cursor ? null : api.get('/api/admin/users/count/', { params: { role: params.role, q: params.q } }).catch(() => null),
+      ]);
+      const page = pageRes.data?.results || [];
+      setUsers((prev) => (cursor ? [...prev, ...page] : page));
+      setUsersCursor(pageRes.data?.next_cursor || null);
+      if (!cursor) setUsersCount(countRes?.data || null);
+    } catch {
+      if (!cursor) setUsers([]);
+    } finally {
+      setUsersLoading(false);
+    }
+  }, [roleFilter, search]);
+
+  useEffect(() => {
+    const timer = setTimeout(() => loadUsers(), 300);
+    return () => clearTimeout(timer);
+  }, [loadUsers]);
+
   useEffect(() => {
     let cancelled = false;
     (async () => {
       try {
-        const [statsRes, usersRes] = await Promise.all([
-          api.get('/api/admin/stats/'),
-          api.get('/api/admin/users/').catch(() => ({ data: [] })),
-        ]);
+        const statsRes = await api.get('/api/admin/stats/');
         if (!cancelled) {
           setStats(statsRes.data);
-          setUsers(Array.isArray(usersRes.data) ? usersRes.data : []);
         }
       } catch (err) {
         if (!cancelled) {
@@ -213,7 +243,29 @@ export default function AdminDashboard() {
         {/* All registered users (patients, health providers, admins) */}
         <div className="bg-white rounded-2xl shadow-card border border-gray-100 overflow-hidden mb-8">
           <h2 className="font-heading font-semibold text-content p-6 pb-0 mb-3">All registered users</h2>
-          <p className="text-gray-500 text-sm px-6 mb-3">Patients, health providers, and admins in the system</p>
+          <p className="text-gray-500 text-sm px-6 mb-3">
+            Patients, health providers, and admins in the system
+            {usersCount && ` · ${usersCount.estimated ? '~' : ''}${usersCount.count.toLocaleString()} matching`}
+          </p>
+          <div className="flex flex-wrap gap-3 px-6 mb-4">
+            <select
+              value={roleFilter}
+              onChange={(e) => setRoleFilter(e.target.value)}
+              className="border border-gray-200 rounded-lg px-3 py-2 text-sm text-content"
+            >
+              <option value="">All roles</option>
+              <option value="patient">Patients</option>
+              <option value="provider">Health providers</option>
+              <option value="admin">Admins</option>
+            </select>
+            <input
+              type="search"
+              value={search}
+              onChange={(e) => setSearch(e.target.value)}
+              placeholder="Username, email or name starts with…"
+              className="border border-gray-200 rounded-lg px-3 py-2 text-sm text-content flex-1 min-w-[12rem]"
+            />
+          </div>
           <div className="overflow-x-auto">
             <table className="w-full">
               <thead>
@@ -229,7 +281,7 @@ export default function AdminDashboard() {
                 {users.length === 0 ? (
                   <tr>
                     <td colSpan={5} className="py-8 text-center text-gray-500 text-sm">
-                      No users yet
+                      {usersLoading ? 'Loading…' : 'No users found'}
                     </td>
                   </tr>
                 ) : (
@@ -248,6 +300,18 @@ export default function AdminDashboard() {
               </tbody>
             </table>
           </div>
+          {usersCursor && (
+            <div className="p-4 text-center">
+              <button
+                type="button"
+                onClick={() => loadUsers(usersCursor)}
+                disabled={usersLoading}
+                className="text-sm font-medium text-primary hover:underline disabled:opacity-50"
+              >
+                {usersLoading ? 'Loading…' : 'Load more'}
+              </button>
+            </div>
+          )}
         </div>
 
         {/* Recent registrations (last 10) */}